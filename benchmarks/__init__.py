@@ -0,0 +1,3 @@
+"""
+Framework benchmarks against a local stand-in portal
+"""
@@ -0,0 +1,139 @@
+"""
+Startup time and memory per Chrome launch profile
+
+For every profile in LAUNCH_PROFILES (or the ones given), launches Chrome
+through a DriverPool a few times, loads the stand-in portal dashboard and
+reports the time to the first usable session and the resident memory (RSS)
+of the whole Chrome process tree.
+
+RSS comes from psutil when it is installed, otherwise from /proc (Linux); on
+other systems without psutil only startup times are reported.
+
+Usage:
+    python benchmarks/launch_profiles.py
+    python benchmarks/launch_profiles.py --launches 5 ci-headless low-memory
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import psutil
+except ImportError:  # psutil is optional
+    psutil = None
+
+from benchmarks.standin_portal import StandinPortal
+from config.config import LAUNCH_PROFILES
+
+
+def process_tree_rss(pid):
+    """
+    Resident memory of a process's descendants
+
+    Args:
+        pid: Parent process id (chromedriver)
+
+    Returns:
+        int: Bytes, or None if it cannot be measured here
+    """
+    if psutil is not None:
+        try:
+            return sum(child.memory_info().rss for child in psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir('/proc'):
+        return None
+    parents = {}
+    rss = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/status', 'r', encoding='utf-8') as status_file:
+                for line in status_file:
+                    if line.startswith('PPid:'):
+                        parents[int(entry)] = int(line.split()[1])
+                    elif line.startswith('VmRSS:'):
+                        rss[int(entry)] = int(line.split()[1]) * 1024
+        except OSError:
+            continue  # Exited while we were looking
+
+    tree = {pid}
+    changed = True
+    while changed:
+        changed = False
+        for child, parent in parents.items():
+            if parent in tree and child not in tree:
+                tree.add(child)
+                changed = True
+    return sum(rss.get(child, 0) for child in tree - {pid})
+
+
+def measure_profile(name, portal, launches):
+    """
+    Launch one profile repeatedly
+
+    Returns:
+        dict: median startup seconds and median RSS bytes (None if unknown)
+    """
+    from utils.driver_pool import DriverPool
+
+    startups = []
+    memory = []
+    for _ in range(launches):
+        pool = DriverPool(size=0, launch=name)
+        start = time.perf_counter()
+        driver = pool.acquire()
+        startups.append(time.perf_counter() - start)
+        try:
+            driver.get(portal.url('/Dashboard'))
+            rss = process_tree_rss(driver.service.process.pid)
+            if rss is not None:
+                memory.append(rss)
+        finally:
+            pool.release(driver)  # size=0: the browser quits straight away
+            pool.shutdown()
+
+    return {
+        'startup': statistics.median(startups),
+        'rss': statistics.median(memory) if memory else None
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare startup time and memory of the launch profiles')
+    parser.add_argument('profiles', nargs='*', help='profiles to compare (defaults to all)')
+    parser.add_argument('--launches', type=int, default=3, help='launches per profile')
+    args = parser.parse_args(argv)
+
+    names = args.profiles or list(LAUNCH_PROFILES['profiles'])
+    unknown = [name for name in names if name not in LAUNCH_PROFILES['profiles']]
+    if unknown:
+        parser.error(f"unknown profile(s): {', '.join(unknown)}")
+
+    # Keep benchmark artifacts out of the real ones
+    scratch_dir = tempfile.mkdtemp(prefix='hope-bench-')
+    os.environ['HOPE_SCREENSHOT_DIR'] = os.path.join(scratch_dir, 'screenshots')
+    os.environ['HOPE_CLICK_STATS'] = os.path.join(scratch_dir, 'click-stats.json')
+
+    if psutil is None and not os.path.isdir('/proc'):
+        print('⚠️  Install psutil to measure memory; reporting startup times only')
+
+    with StandinPortal() as portal:
+        print(f'🧪 Launching each profile {args.launches} time(s)')
+        for name in names:
+            stats = measure_profile(name, portal, args.launches)
+            rss = f"{stats['rss'] / 1024 / 1024:8.1f} MB" if stats['rss'] is not None else '       n/a'
+            print(f"   {name:<14} startup {stats['startup']:6.2f}s  RSS {rss}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
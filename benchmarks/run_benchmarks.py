@@ -0,0 +1,337 @@
+"""
+Framework-overhead benchmarks
+
+Runs the real helpers (TestHelpers, WaitEngine, ClickEngine, the screenshot
+pipeline) and two flows modelled on support_ticket_test and
+workshop_location_test against the local stand-in portal, so the numbers
+only depend on the framework and the configured artificial latency.
+
+Reports per-helper latency (mean/p50/p95) and WebDriver round trips per
+call, plus flow throughput (flows/minute). Results are saved as JSON tagged
+with the current git commit; pass --compare to diff against an earlier run.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --iterations 50 --flows 10 --latency 0.1
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<earlier>.json
+    python benchmarks/run_benchmarks.py --check-tracing   # no browser needed
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from benchmarks.standin_portal import StandinPortal
+from config.config import BENCHMARKS
+from utils.command_trace import CommandTracer, percentile
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+TOAST_SELECTORS = [
+    '.new-dashboard-toast-success',
+    '.toast-success',
+    '.success-message',
+    '[class*="toast"][class*="success"]',
+    '[class*="success"][class*="toast"]',
+    '.new-dashboard-toast-error',
+    '.toast-error',
+    '.error-message',
+    '[class*="toast"][class*="error"]',
+    '[class*="error"][class*="toast"]'
+]
+
+TICKET_FIELDS = {
+    (By.ID, 'supportName'): 'Benchmark User',
+    (By.ID, 'supportEmail'): 'benchmark@example.com',
+    (By.ID, 'supportPhone'): '5555555555',
+    (By.ID, 'loginYes'): True,
+    (By.ID, 'issueType'): 'I need help connecting to a coach',
+    (By.ID, 'additionalInfo'): 'Submitted by the benchmark suite'
+}
+
+
+def open_ticket_form(driver, portal):
+    """Open the dashboard with the support ticket form visible"""
+    driver.get(portal.url('/Dashboard'))
+    driver.find_element(By.CSS_SELECTOR, '.new-dashboard-nav-item[data-section="support"]').click()
+    WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.CSS_SELECTOR, '.new-dashboard-submit-ticket-btn'))
+    ).click()
+    WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, 'supportName')))
+
+
+def portal_ticket_flow(driver, portal):
+    """Sign in through the stand-in B2C pages and submit a support ticket"""
+    from utils.click_engine import ClickEngine
+    from utils.helpers import TestHelpers
+    from utils.waits import WaitEngine
+
+    driver.get(portal.url('/'))
+    TestHelpers.wait_and_click(driver, (By.CSS_SELECTOR, '.sign-in-btn'))
+    TestHelpers.wait_and_click(driver, (By.CSS_SELECTOR, '.signin-page-grid-item-button'))
+    TestHelpers.wait_and_send_keys(driver, (By.ID, 'signInName'), 'benchmark@example.com')
+    TestHelpers.wait_and_send_keys(driver, (By.ID, 'password'), 'not-a-secret')
+    driver.find_element(By.ID, 'next').click()
+    WebDriverWait(driver, 10).until(EC.url_contains('/Dashboard'))
+    WaitEngine.wait_until_settled(driver, 3)
+
+    TestHelpers.wait_and_click(driver, (By.CSS_SELECTOR, '.new-dashboard-nav-item[data-section="support"]'))
+    TestHelpers.wait_and_click(driver, (By.CSS_SELECTOR, '.new-dashboard-submit-ticket-btn'))
+    TestHelpers.wait_for_element(driver, (By.ID, 'supportName'))
+    TestHelpers.fill_form(driver, TICKET_FIELDS)
+    TestHelpers.take_screenshot(driver, 'bench-ticket-filled')
+
+    ClickEngine.default().click(driver, (By.CSS_SELECTOR, '.new-dashboard-submit-btn'))
+    WebDriverWait(driver, 10).until(
+        EC.visibility_of_element_located((By.CSS_SELECTOR, '.new-dashboard-toast-success'))
+    )
+
+
+def dynamics_record_flow(driver, portal):
+    """Create a Workshop Location record on the stand-in entity pages"""
+    from utils.click_engine import ClickEngine
+    from utils.helpers import TestHelpers
+    from utils.waits import WaitEngine
+
+    driver.get(portal.url('/main.aspx?pagetype=entitylist&etn=msevtmgt_building'))
+    ClickEngine.default().click(
+        driver, (By.XPATH, "//span[contains(text(), 'Workshop Location')]/ancestor::div[@role='presentation'][1]")
+    )
+    TestHelpers.wait_and_click(driver, (By.XPATH, "//button[@aria-label='New' and contains(@data-id, 'NewRecord')]"))
+    TestHelpers.wait_and_send_keys(
+        driver, (By.XPATH, "//input[@aria-label='Name' and @data-id='msevtmgt_name.fieldControl-text-box-text']"),
+        f'Benchmark Building {time.time_ns()}'
+    )
+    TestHelpers.take_screenshot(driver, 'bench-record-filled')
+    TestHelpers.wait_and_click(driver, (By.XPATH, "//button[@aria-label='Save & Close']"))
+    WebDriverWait(driver, 10).until(EC.url_contains('pagetype=entitylist'))
+    WaitEngine.wait_until_settled(driver, 5)
+
+
+def helper_cases():
+    """
+    Helper calls to measure, each run repeatedly on the open ticket form
+
+    Returns:
+        list: (name, callable(driver)) tuples
+    """
+    from utils.click_engine import ClickEngine
+    from utils.helpers import TestHelpers
+    from utils.waits import WaitEngine
+
+    return [
+        ('wait_for_element', lambda driver: TestHelpers.wait_for_element(driver, (By.ID, 'supportName'))),
+        ('wait_and_send_keys', lambda driver: TestHelpers.wait_and_send_keys(
+            driver, (By.ID, 'supportName'), 'Benchmark User')),
+        ('fill_form', lambda driver: TestHelpers.fill_form(driver, TICKET_FIELDS)),
+        ('probe_selectors', lambda driver: TestHelpers.probe_selectors(driver, TOAST_SELECTORS)),
+        ('wait_until_settled', lambda driver: WaitEngine.wait_until_settled(driver, 2)),
+        ('wait_for_app_idle', lambda driver: WaitEngine.wait_for_app_idle(driver, 2)),
+        ('click_engine', lambda driver: ClickEngine.default().click(
+            driver, (By.CSS_SELECTOR, '.new-dashboard-nav-item[data-section="home"]'))),
+        ('take_screenshot', lambda driver: TestHelpers.take_screenshot(driver, 'bench')),
+    ]
+
+
+def measure(driver, tracer, function, iterations):
+    """
+    Time repeated calls of one function
+
+    Returns:
+        dict: mean/p50/p95 seconds and WebDriver round trips per call
+    """
+    durations = []
+    commands = 0
+    for _ in range(iterations):
+        before = len(tracer.records)
+        start = time.perf_counter()
+        function(driver)
+        durations.append(time.perf_counter() - start)
+        commands += len(tracer.records) - before
+
+    durations.sort()
+    return {
+        'iterations': iterations,
+        'mean': statistics.fmean(durations),
+        'p50': percentile(durations, 0.50),
+        'p95': percentile(durations, 0.95),
+        'round_trips': commands / iterations
+    }
+
+
+class StubExecutor:
+    """Command executor that answers every command without a browser"""
+
+    def execute(self, command, params):
+        return {'status': 0, 'value': 'Stand-in'}
+
+
+def check_call_sites():
+    """
+    Check that traced commands name the flow line when the profiler is on too
+
+    The profiler wraps WebDriver.execute and WebDriverWait.until; the tracer
+    must look past those wrappers, or every command is attributed to them.
+
+    Returns:
+        int: 0 when every command names its flow line, 1 otherwise
+    """
+    from selenium.webdriver.remote.errorhandler import ErrorHandler
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from utils.profiler import StepProfiler, _install_hooks
+
+    scratch_dir = tempfile.mkdtemp(prefix='hope-trace-check-')
+    profiler = StepProfiler(directory=scratch_dir, enabled=True)
+    StepProfiler._default = profiler  # What --profile sets up in a worker
+    _install_hooks()
+    tracer = CommandTracer(directory=scratch_dir, enabled=True)
+
+    driver = WebDriver.__new__(WebDriver)
+    driver.command_executor = StubExecutor()
+    driver.error_handler = ErrorHandler()
+    driver.session_id = 'stub'
+    tracer.attach(driver)
+
+    expected = []
+    with profiler.step('check call sites'):
+        expected.append(sys._getframe().f_lineno + 1)
+        driver.execute('getTitle')
+        expected.append(sys._getframe().f_lineno + 1)
+        WebDriverWait(driver, 1).until(EC.title_is('Stand-in'))
+
+    sites = [record.site for record in tracer.records]
+    wanted = [f'benchmarks/run_benchmarks.py:{line} check_call_sites' for line in expected]
+    if sites == wanted:
+        print(f'✅ Call sites with profiler and tracer on: {sites}')
+        return 0
+    print(f'❌ Expected call sites {wanted}, got {sites}')
+    return 1
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_comparison(previous, current):
+    """Print p50 changes against an earlier result file"""
+    print(f"\n📊 Compared with {previous.get('commit')} ({previous.get('timestamp')})")
+    for section in ('helpers', 'flows'):
+        for name, stats in current[section].items():
+            old = previous.get(section, {}).get(name)
+            if not old or not old['p50']:
+                continue
+            change = (stats['p50'] - old['p50']) / old['p50'] * 100
+            marker = '🟢' if change < -5 else '🔴' if change > 5 else '⚪'
+            print(f"   {marker} {name:<22} {old['p50'] * 1000:8.1f}ms → {stats['p50'] * 1000:8.1f}ms "
+                  f"({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the framework against the local stand-in portal')
+    parser.add_argument('--iterations', type=int, default=BENCHMARKS['iterations'],
+                        help='calls per helper benchmark')
+    parser.add_argument('--flows', type=int, default=BENCHMARKS['flows'], help='runs per flow benchmark')
+    parser.add_argument('--latency', type=float, default=None, help='seconds added to every response')
+    parser.add_argument('--api-latency', type=float, default=None, help='extra seconds for API calls')
+    parser.add_argument('--render-delay', type=float, default=None,
+                        help='seconds the pages take to render dynamic parts')
+    parser.add_argument('--headed', action='store_true', help='show the browser window')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--output', help='result file (defaults to benchmarks/results/<timestamp>-<commit>.json)')
+    parser.add_argument('--check-tracing', action='store_true',
+                        help='check command call sites with the profiler and tracer both on, then exit')
+    args = parser.parse_args(argv)
+
+    if args.check_tracing:
+        return check_call_sites()
+
+    scratch_dir = tempfile.mkdtemp(prefix='hope-bench-')
+    # Keep benchmark artifacts and learned click statistics out of the real ones
+    os.environ['HOPE_SCREENSHOT_DIR'] = os.path.join(scratch_dir, 'screenshots')
+    os.environ['HOPE_CLICK_STATS'] = os.path.join(scratch_dir, 'click-stats.json')
+    if not args.headed:
+        os.environ['HOPE_HEADLESS'] = '1'
+
+    from utils.driver_pool import DriverPool
+    from utils.helpers import TestHelpers
+
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'settings': {},
+        'helpers': {},
+        'flows': {}
+    }
+
+    pool = DriverPool(size=1)
+    tracer = CommandTracer(enabled=True)
+    with StandinPortal(args.latency, args.api_latency, args.render_delay) as portal:
+        results['settings'] = {
+            'latency': portal.latency,
+            'api_latency': portal.api_latency,
+            'render_delay': portal.render_delay,
+            'iterations': args.iterations,
+            'flows': args.flows
+        }
+        print(f"🧪 Benchmarking {commit} against {portal.base_url} "
+              f"(latency {portal.latency}s, api {portal.api_latency}s, render {portal.render_delay}s)")
+
+        driver = pool.acquire()
+        tracer.attach(driver)
+        try:
+            open_ticket_form(driver, portal)
+            for name, function in helper_cases():
+                function(driver)  # Warm up (script caches, click statistics)
+                stats = measure(driver, tracer, function, args.iterations)
+                results['helpers'][name] = stats
+                print(f"   {name:<22} p50 {stats['p50'] * 1000:8.1f}ms  p95 {stats['p95'] * 1000:8.1f}ms  "
+                      f"{stats['round_trips']:5.1f} round trips")
+
+            for name, flow in (('portal_ticket', portal_ticket_flow), ('dynamics_record', dynamics_record_flow)):
+                flow(driver, portal)  # Warm up
+                stats = measure(driver, tracer, lambda d: flow(d, portal), args.flows)
+                stats['flows_per_minute'] = 60 / stats['mean'] if stats['mean'] else 0
+                results['flows'][name] = stats
+                print(f"   {name:<22} p50 {stats['p50']:8.2f}s   {stats['flows_per_minute']:6.1f} flows/min  "
+                      f"{stats['round_trips']:5.0f} round trips")
+        finally:
+            TestHelpers.flush_screenshots()
+            pool.release(driver)
+            pool.shutdown()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as result_file:
+        json.dump(results, result_file, indent=2)
+    print(f'\n💾 Results saved to {output}')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as previous_file:
+            print_comparison(json.load(previous_file), results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Local stand-in for the live portals
+
+Serves, from a background thread of the benchmark process, just enough DOM to
+drive the flows' selectors without the network:
+
+- /                  Client portal home (.sign-in-btn)
+- /signin            Sign-in chooser (.signin-page-grid-item-button)
+- /b2c/login         B2C local account form (#localAccountForm, #signInName, #password, #next)
+- /Dashboard         Dashboard with the Support section, the ticket form,
+                     .new-dashboard-submit-btn and success/error toasts
+- /main.aspx         Dynamics-like entity list (pagetype=entitylist) with the
+                     Workshop Location sidebar and New button, and entity
+                     form (pagetype=entityrecord) with Name and Save & Close
+
+Every response is delayed by `latency` seconds, the ticket/record API calls
+by `api_latency`, and client-side rendering of dynamic parts (sections,
+forms, toasts) by `render_delay`, so waits have something realistic to wait
+for.
+
+Usage:
+    with StandinPortal(latency=0.05) as portal:
+        driver.get(portal.url('/'))
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config.config import BENCHMARKS
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+body { font-family: sans-serif; margin: 0; }
+.hidden { display: none; }
+.sidebar { float: left; width: 220px; }
+.content { margin-left: 240px; padding: 16px; }
+[class*="toast"] { position: fixed; top: 16px; right: 16px; padding: 12px; }
+</style>
+<script>
+var RENDER_DELAY = %(render_delay)d;
+function later(callback) { window.setTimeout(callback, RENDER_DELAY); }
+function show(selector) { document.querySelector(selector).classList.remove('hidden'); }
+</script>
+</head>
+<body>
+%(body)s
+</body>
+</html>
+"""
+
+HOME_BODY = """
+<h1>Client Portal (stand-in)</h1>
+<a class="sign-in-btn" href="/signin">Sign in</a>
+"""
+
+SIGNIN_BODY = """
+<h1>Choose how to sign in</h1>
+<button class="signin-page-grid-item-button" onclick="window.location = '/b2c/login'">Email</button>
+"""
+
+LOGIN_BODY = """
+<form id="localAccountForm" onsubmit="return false;">
+    <input id="signInName" type="email" placeholder="Email">
+    <input id="password" type="password" placeholder="Password">
+    <button id="next" type="submit">Sign in</button>
+</form>
+<script>
+document.getElementById('next').addEventListener('click', function () {
+    fetch('/b2c/login', {method: 'POST', body: JSON.stringify({
+        email: document.getElementById('signInName').value
+    })}).then(function () { window.location = '/Dashboard'; });
+});
+</script>
+"""
+
+DASHBOARD_BODY = """
+<nav class="sidebar">
+    <div class="new-dashboard-nav-item" data-section="home">Home</div>
+    <div class="new-dashboard-nav-item" data-section="support">Support</div>
+</nav>
+<main class="content">
+    <section id="support" class="hidden">
+        <button class="new-dashboard-submit-ticket-btn">Submit Ticket</button>
+        <form id="ticketForm" class="hidden" onsubmit="return false;">
+            <input id="supportName" type="text">
+            <input id="supportEmail" type="email">
+            <input id="supportPhone" type="tel">
+            <label><input id="loginYes" name="canLogin" type="radio" value="yes"> Yes</label>
+            <label><input id="loginNo" name="canLogin" type="radio" value="no"> No</label>
+            <select id="issueType">
+                <option value="">Select...</option>
+                <option>I need help connecting to a coach</option>
+                <option>I cannot log in</option>
+            </select>
+            <textarea id="additionalInfo"></textarea>
+            <div style="height: 1200px"></div>
+            <button class="new-dashboard-submit-btn" type="button"><span>Submit</span></button>
+        </form>
+    </section>
+    <div class="new-dashboard-toast-success hidden"></div>
+    <div class="new-dashboard-toast-error hidden"></div>
+</main>
+<script>
+document.querySelector('[data-section="support"]').addEventListener('click', function () {
+    later(function () { show('#support'); });
+});
+document.querySelector('.new-dashboard-submit-ticket-btn').addEventListener('click', function () {
+    later(function () { show('#ticketForm'); });
+});
+document.querySelector('.new-dashboard-submit-btn').addEventListener('click', function () {
+    var button = this;
+    var fields = ['supportName', 'supportEmail', 'supportPhone', 'issueType', 'additionalInfo'];
+    var ticket = {};
+    fields.forEach(function (id) { ticket[id] = document.getElementById(id).value; });
+    button.textContent = 'loading...';
+    fetch('/api/tickets', {method: 'POST', body: JSON.stringify(ticket)})
+        .then(function (response) { return response.json(); })
+        .then(function (result) {
+            button.innerHTML = '<span>Submit</span>';
+            var toast = result.ok ? '.new-dashboard-toast-success' : '.new-dashboard-toast-error';
+            later(function () {
+                document.querySelector(toast).textContent = result.message;
+                show(toast);
+            });
+        });
+});
+</script>
+"""
+
+ENTITY_LIST_BODY = """
+<nav class="sidebar">
+    <div role="presentation"><span>Events</span></div>
+    <div role="presentation"><span>Workshop Location</span></div>
+</nav>
+<main class="content">
+    <div id="grid" class="hidden">
+        <button aria-label="New" data-id="msevtmgt_building|NoRelationship|HomePageGrid|Mscrm.HomepageGrid.msevtmgt_building.NewRecord">New</button>
+        <ul id="records"></ul>
+    </div>
+</main>
+<script>
+var openGrid = function () {
+    later(function () {
+        show('#grid');
+        fetch('/api/data/buildings').then(function (response) { return response.json(); })
+            .then(function (records) {
+                document.getElementById('records').innerHTML = records.map(function (record) {
+                    return '<li>' + record.name + '</li>';
+                }).join('');
+            });
+    });
+};
+document.querySelectorAll('[role="presentation"]')[1].addEventListener('click', openGrid);
+document.querySelector('[aria-label="New"]').addEventListener('click', function () {
+    window.location = '/main.aspx?pagetype=entityrecord&etn=msevtmgt_building';
+});
+if (window.location.hash === '#grid') { openGrid(); }
+</script>
+"""
+
+ENTITY_FORM_BODY = """
+<main class="content">
+    <div id="form" class="hidden">
+        <input aria-label="Name" data-id="msevtmgt_name.fieldControl-text-box-text" type="text">
+        <button aria-label="Save &amp; Close">Save &amp; Close</button>
+    </div>
+</main>
+<script>
+later(function () { show('#form'); });
+document.querySelector('[aria-label="Save & Close"]').addEventListener('click', function () {
+    var name = document.querySelector('[aria-label="Name"]').value;
+    fetch('/api/data/buildings', {method: 'POST', body: JSON.stringify({name: name})})
+        .then(function () {
+            window.location = '/main.aspx?pagetype=entitylist&etn=msevtmgt_building#grid';
+        });
+});
+</script>
+"""
+
+
+class StandinPortal:
+    """HTTP stand-in for the client portal, B2C login and Dynamics pages"""
+
+    def __init__(self, latency=None, api_latency=None, render_delay=None, port=0):
+        """
+        Create (but do not start) the server
+
+        Args:
+            latency: Seconds added to every response
+            api_latency: Extra seconds added to the ticket/record API calls
+            render_delay: Seconds the page takes to render dynamic parts
+            port: Port to listen on (0 picks a free one)
+        """
+        self.latency = BENCHMARKS['latency'] if latency is None else latency
+        self.api_latency = BENCHMARKS['api_latency'] if api_latency is None else api_latency
+        self.render_delay = BENCHMARKS['render_delay'] if render_delay is None else render_delay
+        self.tickets = []
+        self.records = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """str: Root URL of the running server"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url(self, path):
+        """
+        Build an absolute URL on the stand-in
+
+        Args:
+            path: Path starting with '/'
+
+        Returns:
+            str: Absolute URL
+        """
+        return self.base_url + path
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='standin-portal', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _page(self, path, query):
+        if path == '/':
+            return 'Portal', HOME_BODY
+        if path == '/signin':
+            return 'Sign in', SIGNIN_BODY
+        if path == '/b2c/login':
+            return 'Sign in to your account', LOGIN_BODY
+        if path == '/Dashboard':
+            return 'Dashboard', DASHBOARD_BODY
+        if path == '/main.aspx':
+            if query.get('pagetype') == ['entityrecord']:
+                return 'New Building', ENTITY_FORM_BODY
+            return 'Buildings', ENTITY_LIST_BODY
+        return None
+
+    def _api(self, method, path, payload):
+        with self._lock:
+            if path == '/api/tickets' and method == 'POST':
+                ok = bool(payload.get('supportName') and payload.get('supportEmail'))
+                if ok:
+                    self.tickets.append(payload)
+                message = 'Your ticket has been submitted.' if ok else 'Please fill in all required fields.'
+                return {'ok': ok, 'message': message}
+            if path == '/api/data/buildings':
+                if method == 'POST':
+                    self.records.append({'id': len(self.records) + 1, 'name': payload.get('name', '')})
+                return self.records
+            if path == '/b2c/login':
+                return {'ok': True}
+        return None
+
+    def _handler_class(self):
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def _respond(self, method):
+                time.sleep(portal.latency)
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    payload = {}
+
+                if parsed.path.startswith('/api/') or method == 'POST':
+                    if parsed.path.startswith('/api/'):
+                        time.sleep(portal.api_latency)
+                    result = portal._api(method, parsed.path, payload)
+                    if result is None:
+                        return self._send(404, 'application/json', b'{}')
+                    return self._send(200, 'application/json', json.dumps(result).encode('utf-8'))
+
+                page = portal._page(parsed.path, parse_qs(parsed.query))
+                if page is None:
+                    return self._send(404, 'text/plain', b'Not found')
+                title, body = page
+                html = PAGE_TEMPLATE % {
+                    'title': title,
+                    'render_delay': int(portal.render_delay * 1000),
+                    'body': body
+                }
+                self._send(200, 'text/html; charset=utf-8', html.encode('utf-8'))
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the benchmark output readable
+
+        return Handler
@@ -2,6 +2,8 @@
 Configuration file for Selenium tests
 """
 
+import os
+
 # Browser configuration
 BROWSER = 'chrome'
 
@@ -12,28 +14,241 @@ TIMEOUTS = {
     'script': 30         # Wait for scripts to execute
 }
 
-# Base URLs for different environments
+# Settle waits (see utils/waits.py)
+WAITS = {
+    'quiet_period': 0.5,   # Seconds without DOM mutations or XHR/fetch activity
+    'min_poll': 0.05,      # Fastest poll interval (seconds)
+    'max_poll': 0.5        # Slowest poll interval while the page is busy (seconds)
+}
+
+# App readiness probes (see utils/readiness.py)
+READINESS = {
+    'poll_ms': 50,         # How often the probes run inside the page
+    'stable_ms': 200       # How long every probe must stay idle before the wait returns
+}
+
+# Environment the flows run against (HOPE_ENV or run_tests.py --env overrides; see utils/environment.py)
+ENVIRONMENT = 'dev'
+
+# App URLs per environment
 URLS = {
-    'local': 'http://localhost:3000',
-    'dev': 'https://dev.operationhope.com',
-    'qa': 'https://qa.operationhope.com',
-    'prod': 'https://www.operationhope.com'
+    'local': {
+        'site': 'http://localhost:3000'
+    },
+    'dev': {
+        'site': 'https://dev.operationhope.com',
+        'client_portal': 'https://oh-clientportal-dev.powerappsportals.com/',
+        'dynamics': 'https://oh-dev.crm.dynamics.com/main.aspx',
+        'dynamics_app': 'https://oh-dev.crm.dynamics.com/main.aspx?appid=bbe8d0d8-7b2c-ef11-840a-000d3a125a79'
+    },
+    'qa': {
+        'site': 'https://qa.operationhope.com'
+    },
+    'prod': {
+        'site': 'https://www.operationhope.com'
+    }
 }
 
 # Screenshot configuration
 SCREENSHOTS = {
     'enabled': True,
-    'path': './screenshots',
-    'on_failure': True
+    'path': './screenshots',   # Relative to the repository root ($HOPE_SCREENSHOT_DIR overrides)
+    'on_failure': True,    # Write the buffered lead-up when a test fails
+    'mode': 'always',      # 'always' writes every capture, 'buffered' keeps them in memory
+    'buffer_frames': 30,   # Ring buffer size in frames ('buffered' mode)
+    'buffer_mb': 64,       # Ring buffer size in megabytes ('buffered' mode)
+    'format': 'png',       # 'png', 'jpeg' or 'webp' (jpeg/webp need Pillow)
+    'quality': 80,         # JPEG/WebP quality
+    'max_width': None,     # Downscale wider screenshots (needs Pillow)
+    'queue_size': 32       # Pending writes before take_screenshot blocks
 }
 
 # Chrome options
 CHROME_OPTIONS = {
     'args': [
-        # '--headless',  # Uncomment to run in headless mode
+        # '--headless',  # Uncomment to run in headless mode (or use a headless LAUNCH_PROFILES entry)
         '--no-sandbox',
         '--disable-dev-shm-usage',
         '--window-size=1920,1080',
         '--disable-gpu'
+    ],
+    'capabilities': {}      # Extra capabilities (console/network capture uses utils/browser_events.py)
+}
+
+# Launch profiles applied on top of CHROME_OPTIONS (HOPE_LAUNCH_PROFILE or run_tests.py --launch-profile
+# overrides; see utils/environment.py). 'args' replace base switches of the same name, 'headless'
+# forces the mode either way, 'pool_size' overrides DRIVER_POOL['size'] and 'maximize' overrides
+# DRIVER_POOL['maximize'] (a profile with a --window-size switch keeps that size unless it says otherwise).
+LAUNCH_PROFILES = {
+    'profile': 'default',
+    'profiles': {
+        'default': {},
+        'debug-headed': {
+            'headless': False
+        },
+        'ci-headless': {
+            'headless': True,
+            'args': ['--disable-extensions', '--mute-audio', '--hide-scrollbars']
+        },
+        'low-memory': {
+            'headless': True,
+            'pool_size': 1,
+            'args': ['--renderer-process-limit=1', '--disable-site-isolation-trials',
+                     '--disable-extensions', '--window-size=1280,800']
+        }
+    }
+}
+
+# WebDriver session pool (see utils/driver_pool.py)
+DRIVER_POOL = {
+    'size': 2,           # Idle drivers kept warm between leases
+    'max_uses': 20,      # Retire a browser after this many leases
+    'maximize': True     # Maximize the window on every lease
+}
+
+# Chromedriver cache (see utils/driver_resolver.py)
+DRIVER_CACHE = {
+    'path': os.path.join(os.path.expanduser('~'), '.cache', 'hope-selenium', 'chromedriver'),
+    'offline': False,       # Never download; fail if the cache has no match (or set HOPE_OFFLINE=1)
+    'version_ttl': 86400    # Seconds before the installed Chrome version is probed again
+}
+
+# Saved login sessions (see utils/auth_state.py)
+AUTH_CACHE = {
+    'enabled': True,
+    'path': os.path.join(os.path.expanduser('~'), '.cache', 'hope-selenium', 'auth'),
+    'max_age': 8 * 3600,    # Never reuse a snapshot older than this (seconds)
+    'settle_timeout': 15,   # Seconds to let the app load before checking the session
+    'auth_cookies': [       # Cookies whose expiry bounds the snapshot lifetime
+        'ESTSAUTH*',
+        'CrmOwinAuth*',
+        '.AspNet.ApplicationCookie',
+        'x-ms-cpim-sso*'
+    ],
+    'login_hosts': [        # Landing on one of these means the session was rejected
+        'login.microsoftonline.com',
+        'login.live.com',
+        'b2clogin.com'
     ]
 }
+
+# Click strategies (see utils/click_engine.py)
+CLICK_ENGINE = {
+    'persist': True,        # Keep per-locator results across runs
+    'stats_path': os.path.join(os.path.expanduser('~'), '.cache', 'hope-selenium', 'click-stats.json'),
+    'strategies': ['native', 'js', 'actions', 'jquery', 'dispatch'],  # Default fallback order
+    'relocate_timeout': 2,  # Seconds to wait for a re-rendered (stale) element to come back
+    'stale_retries': 2,     # Re-locate and retry the same strategy this often when the element goes stale
+    'verify_timeout': 3     # Seconds request_sent() waits for the click's request
+}
+
+# Step profiler (see utils/profiler.py)
+PROFILER = {
+    'enabled': False,       # Or set HOPE_PROFILE=1
+    'path': './profiles'    # Report directory (HOPE_PROFILE_DIR overrides)
+}
+
+# WebDriver command tracing (see utils/command_trace.py)
+COMMAND_TRACE = {
+    'enabled': False,       # Or set HOPE_TRACE_COMMANDS=1
+    'path': './profiles',   # Report directory (HOPE_TRACE_DIR overrides)
+    'top_n': 10             # Costliest call sites listed in the report
+}
+
+# Benchmarks against the local stand-in portal (see benchmarks/)
+BENCHMARKS = {
+    'latency': 0.05,        # Seconds added to every stand-in response
+    'api_latency': 0.2,     # Extra seconds for the ticket/record API calls
+    'render_delay': 0.1,    # Seconds the stand-in pages take to render dynamic parts
+    'iterations': 20,       # Calls per helper benchmark
+    'flows': 5              # Runs per flow benchmark
+}
+
+# Structured logging (see utils/test_logger.py)
+LOGGING = {
+    'console': True,        # Human-readable "[timestamp] message" lines on stdout
+    'path': None            # JSON Lines file (HOPE_LOG_FILE overrides; the parallel runner sets one per worker)
+}
+
+# Console and network capture over CDP (see utils/browser_events.py)
+BROWSER_EVENTS = {
+    'min_level': 'warning',     # Lowest console level kept ('debug', 'info', 'warning', 'error')
+    'buffer_size': 1000,        # Events kept in memory (oldest dropped)
+    'channel_size': 1000,       # DevTools events queued before the collector catches up
+    'tracked_requests': 5000,   # In-flight request URLs remembered for failure reports
+    'connect_timeout': 10       # Seconds to wait for the DevTools connection
+}
+
+# Network filter profiles (see utils/network_filter.py); pick one with HOPE_NETWORK_PROFILE.
+# A profile blocks file 'extensions', 'hosts' (and their subdomains) and raw CDP URL 'patterns'.
+NETWORK_FILTERS = {
+    'profile': 'full',
+    'size_cache': os.path.join(os.path.expanduser('~'), '.cache', 'hope-selenium', 'resource-sizes.json'),
+    'profiles': {
+        'full': {},                 # Load everything
+        'no-media': {               # Images, fonts and audio/video
+            'extensions': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'ico', 'bmp',
+                           'woff', 'woff2', 'ttf', 'otf', 'eot',
+                           'mp4', 'webm', 'mp3', 'ogg', 'wav']
+        },
+        'no-third-party': {         # Telemetry, analytics and third-party fonts
+            'hosts': ['browser.events.data.microsoft.com', 'mobile.events.data.microsoft.com',
+                      'dc.services.visualstudio.com', 'js.monitor.azure.com', 'az416426.vo.msecnd.net',
+                      'www.clarity.ms', 'bat.bing.com', 'www.google-analytics.com',
+                      'www.googletagmanager.com', 'connect.facebook.net',
+                      'fonts.googleapis.com', 'fonts.gstatic.com']
+        }
+    }
+}
+
+# Persistent Chrome profiles (see utils/chrome_profile.py); only the HTTP, code and GPU caches are kept
+CHROME_PROFILE = {
+    'enabled': False,           # Or set HOPE_CHROME_PROFILE=1
+    'path': os.path.join(os.path.expanduser('~'), '.cache', 'hope-selenium', 'chrome-profile'),
+    'max_mb': 1024,             # Size limit of one profile; least recently used cache files are evicted
+    'http_cache_share': 0.75,   # Part of the limit Chrome may use for its HTTP cache (--disk-cache-size)
+    'prewarm_timeout': 30,      # Seconds to let each prewarm URL settle
+    'prewarm_apps': ['client_portal', 'dynamics_app']   # URLS of the selected environment loaded by `prewarm`
+}
+
+# Interstitials dismissed automatically while a flow runs (see utils/interstitials.py).
+# A rule fires on the first visible match of 'selector' (CSS) or 'xpath' on one of its 'hosts'
+# (and their subdomains) and clicks it, or clicks 'target' after ticking the 'check' checkbox;
+# 'action': 'remove' deletes the element instead. 'limit' caps dismissals per page (default 3)
+# and 'visible': False also matches hidden elements.
+INTERSTITIALS = {
+    'enabled': True,
+    'scan_delay_ms': 50,        # Debounce between a DOM change and the next scan
+    'rules': {
+        'b2c-popup-continue': {
+            'selector': '.b2c-popup-continue',
+            'hosts': ['powerappsportals.com', 'b2clogin.com']
+        },
+        'portal-debugger-skip': {       # Only inside the debugger dialog on the sign-in chooser
+            'xpath': "//*[@role='dialog' or @role='alertdialog']//button[normalize-space(.)='Skip']",
+            'limit': 1,
+            'hosts': ['powerappsportals.com'],
+            'paths': ['/signin']
+        },
+        'b2c-debugger-skip': {          # Every B2C page is a sign-in page
+            'xpath': "//*[@role='dialog' or @role='alertdialog']//button[normalize-space(.)='Skip']",
+            'limit': 1,
+            'hosts': ['b2clogin.com']
+        },
+        'aad-stay-signed-in': {     # "Stay signed in?": tick "Don't show this again", then Yes
+            'selector': '#KmsiCheckboxField',
+            'check': '#KmsiCheckboxField',
+            'target': '#idSIButton9',
+            'visible': False,
+            'limit': 1,
+            'hosts': ['login.microsoftonline.com']
+        },
+        'dynamics-debugger-play': {     # Only inside the debugger dialog the app page opens on load
+            'xpath': "//*[@role='dialog' or @role='alertdialog']//button[normalize-space(.)='Play' "
+                     "or normalize-space(.)='Skip' or @aria-label='Play' or @aria-label='Skip']",
+            'limit': 1,
+            'hosts': ['dynamics.com'],
+            'paths': ['/main.aspx']
+        }
+    }
+}
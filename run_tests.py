@@ -0,0 +1,265 @@
+"""
+Parallel Test Runner
+
+Discovers the flow functions in tests/client_portal, tests/dynamics and
+tests/volunteer_portal and runs them on a process pool of headless Chrome
+workers. Every worker gets its own screenshot directory and log file, and
+keeps its own warm DriverPool so consecutive flows reuse the browser.
+
+A flow lives in `<name>_test.py` and is the function `<name>_test()` in that
+module. It passes unless it raises or returns False, which mirrors the exit
+codes the scripts return via sys.exit when run on their own.
+
+Usage:
+    python run_tests.py                  # all flows, one worker per CPU (max 4)
+    python run_tests.py -n 8             # 8 workers
+    python run_tests.py -k dynamics      # only flows whose path contains "dynamics"
+    python run_tests.py --headed         # visible browsers (debugging)
+    python run_tests.py --keep-screenshots  # write screenshots of passing flows too
+    python run_tests.py --profile        # write per-step timing profiles
+    python run_tests.py --trace-commands # write WebDriver command traces
+    python run_tests.py --chrome-profile # reuse Chrome's HTTP/code cache across runs
+    python run_tests.py --env dev --launch-profile low-memory
+    python run_tests.py --network-profile no-media   # block images/fonts/media
+    python run_tests.py --list           # show discovered flows and exit
+"""
+
+import argparse
+import ast
+import importlib.util
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+ROOT_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, ROOT_DIR)
+
+from config.config import LAUNCH_PROFILES, NETWORK_FILTERS
+from utils.environment import runnable_environments
+
+TEST_DIRS = ['tests/client_portal', 'tests/dynamics', 'tests/volunteer_portal']
+RUNS_DIR = os.path.join(ROOT_DIR, 'test-runs')
+
+# Set by _init_worker from the runner's shared counter (0 outside a worker)
+_WORKER_ID = 0
+
+
+def discover_flows(pattern=None):
+    """
+    Find flow functions without importing the test modules
+
+    Args:
+        pattern: Optional substring the flow path must contain
+
+    Returns:
+        list: (relative path, function name) tuples, sorted by path
+    """
+    flows = []
+    for test_dir in TEST_DIRS:
+        absolute_dir = os.path.join(ROOT_DIR, test_dir)
+        if not os.path.isdir(absolute_dir):
+            continue
+
+        for filename in sorted(os.listdir(absolute_dir)):
+            if not filename.endswith('_test.py'):
+                continue
+
+            relative_path = f'{test_dir}/{filename}'
+            if pattern and pattern not in relative_path:
+                continue
+
+            function_name = filename[:-3]
+            with open(os.path.join(absolute_dir, filename), 'r', encoding='utf-8') as source:
+                tree = ast.parse(source.read(), filename=filename)
+            defined = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+            if function_name in defined:
+                flows.append((relative_path, function_name))
+    return flows
+
+
+def _worker_id():
+    return _WORKER_ID
+
+
+def _shutdown_worker():
+    from utils.click_engine import ClickEngine
+    from utils.driver_pool import DriverPool
+    from utils.screenshots import ScreenshotPipeline
+    from utils.test_logger import TestLogger
+    if ClickEngine._default is not None:
+        ClickEngine._default.save()
+    if ScreenshotPipeline._default is not None:
+        ScreenshotPipeline._default.flush()
+    if DriverPool._default is not None:
+        DriverPool._default.shutdown()
+    if TestLogger._default is not None:
+        TestLogger._default.shutdown()
+
+
+def _init_worker(worker_counter, run_dir, headless, keep_screenshots, profile, trace_commands, network_profile,
+                 chrome_profile, environment, launch):
+    """Give the worker an id, an isolated screenshot directory and log stream"""
+    global _WORKER_ID
+    with worker_counter.get_lock():
+        worker_counter.value += 1
+        _WORKER_ID = worker_counter.value
+
+    worker_dir = os.path.join(run_dir, f'worker-{_worker_id()}')
+    screenshot_dir = os.path.join(worker_dir, 'screenshots')
+    os.makedirs(screenshot_dir, exist_ok=True)
+
+    os.environ['HOPE_SCREENSHOT_DIR'] = screenshot_dir
+    os.environ['HOPE_WORKER_ID'] = str(_worker_id())
+    os.environ['HOPE_LOG_FILE'] = os.path.join(worker_dir, 'log.jsonl')
+    # Step screenshots stay in memory and are only written for failing flows
+    os.environ.setdefault('HOPE_SCREENSHOT_MODE', 'buffered')
+    if keep_screenshots:
+        os.environ['HOPE_RETAIN_SCREENSHOTS'] = '1'
+    if headless:
+        os.environ['HOPE_HEADLESS'] = '1'
+    if profile:
+        os.environ['HOPE_PROFILE'] = '1'
+        os.environ['HOPE_PROFILE_DIR'] = os.path.join(worker_dir, 'profiles')
+    if network_profile:
+        os.environ['HOPE_NETWORK_PROFILE'] = network_profile
+    if chrome_profile:
+        # Workers lock separate profile slots, so their caches never collide
+        os.environ['HOPE_CHROME_PROFILE'] = '1'
+    if environment:
+        os.environ['HOPE_ENV'] = environment
+    if launch:
+        os.environ['HOPE_LAUNCH_PROFILE'] = launch
+    if trace_commands:
+        os.environ['HOPE_TRACE_COMMANDS'] = '1'
+        os.environ['HOPE_TRACE_DIR'] = os.path.join(worker_dir, 'profiles')
+
+    log_stream = open(os.path.join(worker_dir, 'worker.log'), 'a', buffering=1, encoding='utf-8')
+    sys.stdout = log_stream
+    sys.stderr = log_stream
+
+    # Pool workers leave through os._exit, so atexit never runs; use a finalizer
+    multiprocessing.util.Finalize(None, _shutdown_worker, exitpriority=10)
+
+
+def run_flow(relative_path, function_name):
+    """
+    Import and run one flow inside a worker
+
+    Returns:
+        dict: Flow result (path, worker, passed, exit code, duration, error)
+    """
+    from utils.test_logger import TestLogger
+    print(f'\n{"=" * 60}\n▶️  {relative_path}::{function_name}\n{"=" * 60}')
+    TestLogger.default().start_test(f'{relative_path}::{function_name}')
+    start = time.monotonic()
+    error = None
+
+    try:
+        spec = importlib.util.spec_from_file_location(
+            function_name, os.path.join(ROOT_DIR, relative_path)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        passed = getattr(module, function_name)() is not False
+    except Exception:
+        passed = False
+        error = traceback.format_exc(limit=3)
+        print(error)
+    finally:
+        # Keep the worker log in order with the runner's own prints
+        TestLogger.default().flush()
+
+    return {
+        'path': relative_path,
+        'worker': _worker_id(),
+        'passed': passed,
+        'exit_code': 0 if passed else 1,
+        'duration': time.monotonic() - start,
+        'error': error
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the Selenium flows in parallel')
+    parser.add_argument('-n', '--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='number of parallel Chrome workers')
+    parser.add_argument('-k', '--pattern', help='only run flows whose path contains this text')
+    parser.add_argument('--headed', action='store_true', help='show the browser windows')
+    parser.add_argument('--keep-screenshots', action='store_true',
+                        help='write screenshots of passing flows too')
+    parser.add_argument('--profile', action='store_true',
+                        help='write per-step timing profiles (JSON + flame graph stacks)')
+    parser.add_argument('--trace-commands', action='store_true',
+                        help='record every WebDriver command (counts, p50/p95, call sites)')
+    parser.add_argument('--network-profile', choices=sorted(NETWORK_FILTERS['profiles']),
+                        help='block requests with a NETWORK_FILTERS profile from config/config.py')
+    parser.add_argument('--chrome-profile', action='store_true',
+                        help="keep Chrome's HTTP/code cache between runs (see utils/chrome_profile.py)")
+    parser.add_argument('--env', choices=runnable_environments(),
+                        help='environment whose URLS the flows use (only those defining every app the flows need)')
+    parser.add_argument('--launch-profile', choices=sorted(LAUNCH_PROFILES['profiles']),
+                        help='Chrome launch profile from LAUNCH_PROFILES in config/config.py')
+    parser.add_argument('--list', action='store_true', help='list discovered flows and exit')
+    args = parser.parse_args(argv)
+
+    flows = discover_flows(args.pattern)
+    if args.list or not flows:
+        for relative_path, function_name in flows:
+            print(f'{relative_path}::{function_name}')
+        if not flows:
+            print('No flows found.')
+        return 0 if flows else 1
+
+    run_dir = os.path.join(RUNS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S'))
+    os.makedirs(run_dir, exist_ok=True)
+    workers = max(1, min(args.workers, len(flows)))
+    print(f'🚀 Running {len(flows)} flow(s) on {workers} worker(s) → {run_dir}')
+
+    start = time.monotonic()
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(context.Value('i', 0), run_dir, not args.headed, args.keep_screenshots, args.profile,
+                  args.trace_commands, args.network_profile, args.chrome_profile, args.env, args.launch_profile)
+    ) as executor:
+        futures = {executor.submit(run_flow, *flow): flow for flow in flows}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                # The worker died (Chrome OOM, segfault, BrokenProcessPool): fail this flow, keep the rest
+                result = {
+                    'path': futures[future][0],
+                    'worker': None,
+                    'passed': False,
+                    'exit_code': 1,
+                    'duration': time.monotonic() - start,
+                    'error': f'{type(error).__name__}: {error}'
+                }
+            results.append(result)
+            status = '✅ PASS' if result['passed'] else '❌ FAIL'
+            worker = f"worker {result['worker']}" if result['worker'] is not None else 'worker crashed'
+            print(f"{status}  {result['path']}  ({result['duration']:.1f}s, {worker})")
+
+    failed = [result for result in results if not result['passed']]
+    elapsed = time.monotonic() - start
+    print(f'\n{len(results) - len(failed)} passed, {len(failed)} failed in {elapsed:.1f}s')
+    for result in failed:
+        if result['worker'] is None:
+            print(f"   ❌ {result['path']} ({result['error']})")
+        else:
+            print(f"   ❌ {result['path']} (see worker-{result['worker']}/worker.log)")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,40 +2,48 @@
 Support Ticket Submission Test
 Tests the complete flow: Login -> Navigate to Dashboard -> Submit Support Ticket
 
+Steps 1-4 are skipped when a saved session for the account is still valid
+(see utils/auth_state.py). The B2C continue popups and the debugger Skip
+buttons are dismissed in the background whenever they show up (see
+utils/interstitials.py).
+
 Flow:
 1. Navigate to portal home
 2. Click sign-in button
-3. Handle debugger popups (skip)
-4. Click signin-page-grid-item-button
-5. Fill login form and submit
-6. Navigate to dashboard
-7. Click Support sidebar
-8. Click Submit Ticket button
-9. Fill support ticket form
-10. Submit and verify success/error
+3. Click signin-page-grid-item-button
+4. Fill login form and submit
+5. Navigate to dashboard
+6. Click Support sidebar
+7. Click Submit Ticket button
+8. Fill support ticket form
+9. Submit the form
+10. Verify success or error
 """
 
 import sys
 import os
-import time
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
 
-from config.config import BROWSER, TIMEOUTS, CHROME_OPTIONS
+from utils.auth_state import AuthStateCache
+from utils.browser_events import BrowserEventStream
+from utils.click_engine import ClickEngine
+from utils.driver_pool import DriverPool
+from utils.element_actions import ElementActions
+from utils.environment import environment_url
 from utils.helpers import TestHelpers
+from utils.interstitials import Interstitials
+from utils.network_filter import NetworkFilter
+from utils.waits import WaitEngine
 
 
 # Test configuration
 TEST_CONFIG = {
-    'base_url': 'https://oh-clientportal-dev.powerappsportals.com/',
+    'base_url': environment_url('client_portal'),
     'credentials': {
         'email': 'cuqumyky@cyclelove.cc',
         'password': 'Hope2025'
@@ -51,184 +59,123 @@ TEST_CONFIG = {
 }
 
 
-def support_ticket_test():
-    """Main test function"""
-    
-    # Create Chrome options
-    chrome_options = Options()
-    for arg in CHROME_OPTIONS['args']:
-        chrome_options.add_argument(arg)
-    
-    # Enable browser logging
-    chrome_options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+def is_signed_in(driver):
+    """Check the portal treats the session as signed in (no sign-in button, not on B2C)"""
+    return driver.execute_script("""
+        return !document.querySelector('.sign-in-btn')
+            && window.location.hostname.indexOf('b2clogin.com') === -1;
+    """)
 
-    # Create WebDriver instance
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
 
-    try:
-        TestHelpers.log('🚀 Starting Support Ticket Submission Test...')
+def interactive_login(driver):
+    """Sign in through the portal B2C pages (steps 1-4)"""
 
-        # Set timeouts
-        driver.implicitly_wait(TIMEOUTS['implicit'])
-        driver.set_page_load_timeout(TIMEOUTS['page_load'])
-        driver.set_script_timeout(TIMEOUTS['script'])
+    # ============================================================
+    # STEP 1: Navigate to portal home page
+    # ============================================================
+    TestHelpers.log_step('📍 Step 1: Navigating to portal home page...')
+    driver.get(TEST_CONFIG['base_url'])
+    TestHelpers.wait_for_page_load(driver)
+    TestHelpers.take_screenshot(driver, '01-homepage')
 
-        # Maximize window for better visibility
-        driver.maximize_window()
+    # ============================================================
+    # STEP 2: Click sign-in button
+    # ============================================================
+    TestHelpers.log_step('🔘 Step 2: Clicking sign-in button...')
+    WaitEngine.wait_until_settled(driver, 2)  # Wait for page to fully load
+    
+    sign_in_btn = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.CSS_SELECTOR, '.sign-in-btn'))
+    )
+    sign_in_btn.click()
+    WaitEngine.wait_until_settled(driver, 2)
+    TestHelpers.take_screenshot(driver, '02-clicked-signin')
 
-        # ============================================================
-        # STEP 1: Navigate to portal home page
-        # ============================================================
-        TestHelpers.log('📍 Step 1: Navigating to portal home page...')
-        driver.get(TEST_CONFIG['base_url'])
-        TestHelpers.wait_for_page_load(driver)
-        TestHelpers.take_screenshot(driver, '01-homepage')
+    # ============================================================
+    # STEP 3: Click signin-page-grid-item-button
+    # ============================================================
+    TestHelpers.log_step('🔘 Step 3: Clicking signin-page-grid-item-button...')
+    
+    signin_grid_btn = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.CSS_SELECTOR, '.signin-page-grid-item-button'))
+    )
+    signin_grid_btn.click()
+    WaitEngine.wait_until_settled(driver, 2)
+    TestHelpers.take_screenshot(driver, '04-clicked-grid-button')
 
-        # ============================================================
-        # STEP 1.5: Click .b2c-popup-continue button (first popup)
-        # ============================================================
-        TestHelpers.log('🔘 Step 1.5: Clicking .b2c-popup-continue button (first popup)...')
-        time.sleep(2)
-        
-        try:
-            b2c_popup_continue = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, '.b2c-popup-continue'))
-            )
-            b2c_popup_continue.click()
-            TestHelpers.log('✅ Clicked .b2c-popup-continue button')
-            time.sleep(1)
-            TestHelpers.take_screenshot(driver, '01b-after-b2c-popup')
-        except (NoSuchElementException, TimeoutException):
-            TestHelpers.log('⚠️  .b2c-popup-continue button not found, continuing...')
+    # ============================================================
+    # STEP 4: Fill login form and submit
+    # ============================================================
+    TestHelpers.log_step('📝 Step 4: Filling login form...')
+    
+    # Wait for login form to be visible
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.ID, 'localAccountForm'))
+    )
+    
+    # Fill email
+    email_input = driver.find_element(By.ID, 'signInName')
+    email_input.clear()
+    email_input.send_keys(TEST_CONFIG['credentials']['email'])
+    TestHelpers.log(f"📧 Entered email: {TEST_CONFIG['credentials']['email']}")
+    
+    # Fill password
+    password_input = driver.find_element(By.ID, 'password')
+    password_input.clear()
+    password_input.send_keys(TEST_CONFIG['credentials']['password'])
+    TestHelpers.log('🔒 Entered password')
+    
+    TestHelpers.take_screenshot(driver, '06-login-form-filled')
+    
+    # Click sign in button
+    sign_in_submit_btn = driver.find_element(By.ID, 'next')
+    sign_in_submit_btn.click()
+    TestHelpers.log('✅ Clicked Sign In button')
+    
+    # Wait for redirect
+    WaitEngine.wait_until_settled(driver, 5)
+    TestHelpers.take_screenshot(driver, '07-after-login')
 
-        # ============================================================
-        # STEP 2: Click sign-in button
-        # ============================================================
-        TestHelpers.log('🔘 Step 2: Clicking sign-in button...')
-        time.sleep(2)  # Wait for page to fully load
-        
-        sign_in_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, '.sign-in-btn'))
-        )
-        sign_in_btn.click()
-        time.sleep(2)
-        TestHelpers.take_screenshot(driver, '02-clicked-signin')
 
-        # ============================================================
-        # STEP 3: Handle first debugger/popup - Try to skip
-        # ============================================================
-        TestHelpers.log('⏭️  Step 3: Handling first debugger popup...')
-        time.sleep(2)
-        
-        try:
-            skip_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Skip')]")
-            skip_button.click()
-            TestHelpers.log('✅ Clicked Skip button')
-        except NoSuchElementException:
-            TestHelpers.log('⚠️  Skip button not found, continuing...')
-        
-        time.sleep(1)
-        TestHelpers.take_screenshot(driver, '03-after-first-debugger')
+def support_ticket_test():
+    """Main test function"""
+    
+    # Lease a warm WebDriver instance (timeouts and window state already applied)
+    driver = DriverPool.default().acquire()
 
-        # ============================================================
-        # STEP 4: Click signin-page-grid-item-button
-        # ============================================================
-        TestHelpers.log('🔘 Step 4: Clicking signin-page-grid-item-button...')
-        
-        signin_grid_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, '.signin-page-grid-item-button'))
-        )
-        signin_grid_btn.click()
-        time.sleep(2)
-        TestHelpers.take_screenshot(driver, '04-clicked-grid-button')
+    # Collect console errors and failed portal requests as they happen
+    browser_events = BrowserEventStream(driver, url_filter=TEST_CONFIG['base_url']).start()
 
-        # ============================================================
-        # STEP 5: Handle second debugger/popup
-        # ============================================================
-        TestHelpers.log('⏭️  Step 5: Handling second debugger popup...')
-        time.sleep(2)
-        
-        try:
-            skip_button2 = driver.find_element(By.XPATH, "//button[contains(text(), 'Skip')]")
-            skip_button2.click()
-            TestHelpers.log('✅ Clicked second Skip button')
-        except NoSuchElementException:
-            TestHelpers.log('⚠️  Second skip button not found, continuing...')
-        
-        time.sleep(1)
-        TestHelpers.take_screenshot(driver, '05-after-second-debugger')
-
-        # ============================================================
-        # STEP 5.5: Click .b2c-popup-continue button (second popup)
-        # ============================================================
-        TestHelpers.log('🔘 Step 5.5: Clicking .b2c-popup-continue button (second popup)...')
-        time.sleep(2)
-        
-        try:
-            b2c_popup_continue2 = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, '.b2c-popup-continue'))
-            )
-            b2c_popup_continue2.click()
-            TestHelpers.log('✅ Clicked .b2c-popup-continue button')
-            time.sleep(1)
-            TestHelpers.take_screenshot(driver, '05b-after-second-b2c-popup')
-        except (NoSuchElementException, TimeoutException):
-            TestHelpers.log('⚠️  .b2c-popup-continue button not found, continuing...')
+    try:
+        TestHelpers.log('🚀 Starting Support Ticket Submission Test...')
 
         # ============================================================
-        # STEP 6: Fill login form and submit
+        # STEPS 1-4: Sign in (restore a saved session or log in interactively)
         # ============================================================
-        TestHelpers.log('📝 Step 6: Filling login form...')
-        
-        # Wait for login form to be visible
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, 'localAccountForm'))
+        auth_cache = AuthStateCache(TEST_CONFIG['base_url'], TEST_CONFIG['credentials']['email'])
+        session_restored = auth_cache.restore(
+            driver, TEST_CONFIG['base_url'] + 'Dashboard', is_authenticated=is_signed_in
         )
-        
-        # Fill email
-        email_input = driver.find_element(By.ID, 'signInName')
-        email_input.clear()
-        email_input.send_keys(TEST_CONFIG['credentials']['email'])
-        TestHelpers.log(f"📧 Entered email: {TEST_CONFIG['credentials']['email']}")
-        
-        # Fill password
-        password_input = driver.find_element(By.ID, 'password')
-        password_input.clear()
-        password_input.send_keys(TEST_CONFIG['credentials']['password'])
-        TestHelpers.log('🔒 Entered password')
-        
-        TestHelpers.take_screenshot(driver, '06-login-form-filled')
-        
-        # Click sign in button
-        sign_in_submit_btn = driver.find_element(By.ID, 'next')
-        sign_in_submit_btn.click()
-        TestHelpers.log('✅ Clicked Sign In button')
-        
-        # Wait for redirect
-        time.sleep(5)
-        TestHelpers.take_screenshot(driver, '07-after-login')
+        if not session_restored:
+            interactive_login(driver)
+            auth_cache.save(driver)
 
         # ============================================================
-        # STEP 7: Navigate to dashboard
+        # STEP 5: Navigate to dashboard
         # ============================================================
-        TestHelpers.log('🏠 Step 7: Navigating to dashboard...')
-        driver.get(TEST_CONFIG['base_url'] + 'Dashboard')
+        TestHelpers.log_step('🏠 Step 5: Navigating to dashboard...')
+        if not session_restored:
+            driver.get(TEST_CONFIG['base_url'] + 'Dashboard')
         TestHelpers.wait_for_page_load(driver)
         
-        # Wait for jQuery to be loaded (the page uses jQuery)
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script('return typeof jQuery !== "undefined"')
-        )
-        TestHelpers.log('✅ jQuery loaded')
-        
-        time.sleep(3)  # Wait for dashboard to fully load
+        # The dashboard is a jQuery page: wait until jQuery is loaded and has no requests pending
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['jquery'], label='dashboard')
         TestHelpers.take_screenshot(driver, '08-dashboard-loaded')
 
         # ============================================================
-        # STEP 8: Click Support sidebar item
+        # STEP 6: Click Support sidebar item
         # ============================================================
-        TestHelpers.log('🆘 Step 8: Clicking Support sidebar item...')
+        TestHelpers.log_step('🆘 Step 6: Clicking Support sidebar item...')
         
         support_nav_item = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, '.new-dashboard-nav-item[data-section="support"]'))
@@ -236,13 +183,13 @@ def support_ticket_test():
         support_nav_item.click()
         TestHelpers.log('✅ Clicked Support menu item')
         
-        time.sleep(2)
+        WaitEngine.wait_for_app_idle(driver, 10, apps=['jquery'])
         TestHelpers.take_screenshot(driver, '09-support-section')
 
         # ============================================================
-        # STEP 9: Click Submit Ticket button
+        # STEP 7: Click Submit Ticket button
         # ============================================================
-        TestHelpers.log('🎫 Step 9: Clicking Submit Ticket button...')
+        TestHelpers.log_step('🎫 Step 7: Clicking Submit Ticket button...')
         
         submit_ticket_btn = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, '.new-dashboard-submit-ticket-btn'))
@@ -250,72 +197,41 @@ def support_ticket_test():
         submit_ticket_btn.click()
         TestHelpers.log('✅ Clicked Submit Ticket button')
         
-        time.sleep(2)
+        WaitEngine.wait_for_app_idle(driver, 10, apps=['jquery'])
         TestHelpers.take_screenshot(driver, '10-support-ticket-form')
 
         # ============================================================
-        # STEP 10: Fill support ticket form
+        # STEP 8: Fill support ticket form
         # ============================================================
-        TestHelpers.log('📋 Step 10: Filling support ticket form...')
-        
-        # Fill Name
-        name_input = driver.find_element(By.ID, 'supportName')
-        name_input.clear()
-        name_input.send_keys(TEST_CONFIG['support_ticket']['name'])
+        TestHelpers.log_step('📋 Step 8: Filling support ticket form...')
+        
+        # Fill every field in one round trip (the "Can Login" radio is set to Yes)
+        TestHelpers.fill_form(driver, {
+            (By.ID, 'supportName'): TEST_CONFIG['support_ticket']['name'],
+            (By.ID, 'supportEmail'): TEST_CONFIG['support_ticket']['email'],
+            (By.ID, 'supportPhone'): TEST_CONFIG['support_ticket']['phone'],
+            (By.ID, 'loginYes'): True,
+            (By.ID, 'issueType'): TEST_CONFIG['support_ticket']['issue_type'],
+            (By.ID, 'additionalInfo'): TEST_CONFIG['support_ticket']['additional_info']
+        })
         TestHelpers.log(f"✍️  Name: {TEST_CONFIG['support_ticket']['name']}")
-        
-        # Fill Email
-        email_ticket_input = driver.find_element(By.ID, 'supportEmail')
-        email_ticket_input.clear()
-        email_ticket_input.send_keys(TEST_CONFIG['support_ticket']['email'])
         TestHelpers.log(f"📧 Email: {TEST_CONFIG['support_ticket']['email']}")
-        
-        # Fill Phone
-        phone_input = driver.find_element(By.ID, 'supportPhone')
-        phone_input.clear()
-        phone_input.send_keys(TEST_CONFIG['support_ticket']['phone'])
         TestHelpers.log(f"📱 Phone: {TEST_CONFIG['support_ticket']['phone']}")
-        
-        # Select "Can Login" radio button
-        login_yes_radio = driver.find_element(By.ID, 'loginYes')
-        login_yes_radio.click()
-        TestHelpers.log('✅ Selected "Can Login: Yes"')
-        
-        # Select Issue Type
-        issue_type_select = driver.find_element(By.ID, 'issueType')
-        issue_type_select.click()
-        time.sleep(0.5)
-        
-        # Find and select the specific issue type option
-        issue_option = driver.find_element(
-            By.XPATH, f"//option[@value=\"{TEST_CONFIG['support_ticket']['issue_type']}\"]"
-        )
-        issue_option.click()
         TestHelpers.log(f"📝 Issue Type: {TEST_CONFIG['support_ticket']['issue_type']}")
         
-        # Fill Additional Info
-        additional_info_textarea = driver.find_element(By.ID, 'additionalInfo')
-        additional_info_textarea.clear()
-        additional_info_textarea.send_keys(TEST_CONFIG['support_ticket']['additional_info'])
-        TestHelpers.log('💬 Additional Info filled')
-        
-        time.sleep(1)
+        WaitEngine.wait_until_settled(driver, 1)
         TestHelpers.take_screenshot(driver, '11-form-filled')
 
         # ============================================================
-        # STEP 11: Submit form and verify
+        # STEP 9: Submit form and verify
         # ============================================================
-        TestHelpers.log('🚀 Step 11: Submitting form...')
+        TestHelpers.log_step('🚀 Step 9: Submitting form...')
         
-        # Wait for submit button to be clickable and scroll to it
-        submit_btn = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, '.new-dashboard-submit-btn'))
+        # Wait for the submit button; it is scrolled into view only if it is off-screen
+        submit_btn = ElementActions.actionable(
+            driver, (By.CSS_SELECTOR, '.new-dashboard-submit-btn'), timeout=10, hit_test=False
         )
         
-        # Scroll to submit button to ensure it's in view
-        TestHelpers.scroll_to_element(driver, submit_btn)
-        time.sleep(1)
-        
         # Debug: Check button properties
         is_displayed = submit_btn.is_displayed()
         is_enabled = submit_btn.is_enabled()
@@ -324,110 +240,50 @@ def support_ticket_test():
         # Take screenshot before clicking
         TestHelpers.take_screenshot(driver, '11b-before-clicking-submit')
         
-        # Try multiple methods to click the button
-        button_clicked = False
-        
-        # Method 1: Trigger jQuery click event (BEST for this page since it uses jQuery)
+        # The page binds its submit handler through jQuery, so that is the first
+        # fallback; the click engine moves whichever method worked last time to the front.
+        # A method only counts as working if the click sent the submission request
+        browser_events.mark('submit')
         try:
-            clicked = driver.execute_script("""
-                if (typeof jQuery !== 'undefined') {
-                    jQuery('.new-dashboard-submit-btn').trigger('click');
-                    console.log('jQuery click triggered');
-                    return true;
-                }
-                return false;
-            """)
-            if clicked:
-                TestHelpers.log('✅ Method 1: jQuery trigger click successful')
-                button_clicked = True
-            else:
-                raise Exception('jQuery not available')
-        except Exception as jquery_error:
-            TestHelpers.log('⚠️  Method 1: jQuery trigger failed, trying regular click...')
-            
-            # Method 2: Regular Selenium click
-            try:
-                submit_btn.click()
-                TestHelpers.log('✅ Method 2: Regular click successful')
-                button_clicked = True
-            except Exception as click_error:
-                TestHelpers.log('⚠️  Method 2: Regular click failed, trying JavaScript click...')
-                
-                # Method 3: JavaScript click
-                try:
-                    driver.execute_script('arguments[0].click();', submit_btn)
-                    TestHelpers.log('✅ Method 3: JavaScript click successful')
-                    button_clicked = True
-                except Exception as js_click_error:
-                    TestHelpers.log('⚠️  Method 3: JavaScript click failed, trying by text...')
-                    
-                    # Method 4: Find by button text and click
-                    try:
-                        submit_btn_by_text = driver.find_element(
-                            By.XPATH, "//button[contains(@class, 'new-dashboard-submit-btn')]//span[text()='Submit']"
-                        )
-                        driver.execute_script('arguments[0].click();', submit_btn_by_text)
-                        TestHelpers.log('✅ Method 4: Click by text successful')
-                        button_clicked = True
-                    except Exception as text_click_error:
-                        TestHelpers.log('⚠️  Method 4: Click by text failed, trying Actions click...')
-                        
-                        # Method 5: Use Actions to move and click
-                        try:
-                            from selenium.webdriver.common.action_chains import ActionChains
-                            actions = ActionChains(driver)
-                            actions.move_to_element(submit_btn).click().perform()
-                            TestHelpers.log('✅ Method 5: Actions click successful')
-                            button_clicked = True
-                        except Exception as actions_click_error:
-                            TestHelpers.log('⚠️  Method 5: Actions click failed, trying direct DOM click...')
-                            
-                            # Method 6: Direct DOM manipulation
-                            try:
-                                driver.execute_script("""
-                                    const btn = document.querySelector('.new-dashboard-submit-btn');
-                                    if (btn) {
-                                        btn.click();
-                                        return true;
-                                    }
-                                    return false;
-                                """)
-                                TestHelpers.log('✅ Method 6: Direct DOM click successful')
-                                button_clicked = True
-                            except Exception as dom_click_error:
-                                TestHelpers.log('❌ All 6 click methods failed!')
-        
-        if button_clicked:
+            ClickEngine.default().click(
+                driver, (By.CSS_SELECTOR, '.new-dashboard-submit-btn'),
+                strategies=['jquery', 'native', 'js', 'actions', 'dispatch'],
+                verify=ClickEngine.request_sent(driver)
+            )
             TestHelpers.log('✅ .new-dashboard-submit-btn button clicked - Form submitted!')
-        else:
-            TestHelpers.log('❌ WARNING: Submit button may not have been clicked!')
+        except WebDriverException as click_error:
+            TestHelpers.log(f'❌ WARNING: Submit button may not have been clicked! ({click_error.msg})')
         
         # Wait for response
-        time.sleep(5)  # Increased wait time for AJAX response
+        WaitEngine.wait_for_app_idle(driver, 15, apps=['jquery'], label='submit')  # Wait for AJAX response
         
-        # Check browser console for any errors or validation messages
-        try:
-            logs = driver.get_log('browser')
-            if logs:
-                TestHelpers.log('📋 Browser console logs:')
-                for entry in logs:
-                    print(f"  {entry['level']}: {entry['message']}")
-        except Exception as log_error:
-            TestHelpers.log('⚠️  Could not retrieve browser logs')
+        # Console errors, JS exceptions and failed requests since the click
+        if browser_events.errors(since='submit'):
+            TestHelpers.log('📋 Browser errors since submit:')
+            browser_events.log_events(since='submit', min_level='error')
         
         TestHelpers.take_screenshot(driver, '12-after-submit')
 
         # ============================================================
-        # STEP 12: Verify success or error
+        # STEP 10: Verify success or error
         # ============================================================
-        TestHelpers.log('🔍 Step 12: Verifying submission result...')
+        TestHelpers.log_step('🔍 Step 10: Verifying submission result...')
+        
+        # A failed submit call means there is no point waiting for a toast; only
+        # XHR/fetch requests sent after the click count (not favicons or beacons)
+        failed_requests = browser_events.http_errors(since='submit', resource_types=('XHR', 'Fetch'))
+        if failed_requests:
+            TestHelpers.take_screenshot(driver, '13-request-failed')
+            raise AssertionError(
+                f'Submission request failed: {failed_requests[0].text} {failed_requests[0].url}'
+            )
         
         # Wait a bit more for toast to appear
-        time.sleep(2)
+        WaitEngine.wait_until_settled(driver, 2)
         
         found_message = False
         
-        # Check for success toast with multiple possible selectors
+        # Check for success and error toasts with multiple possible selectors
         success_selectors = [
             '.new-dashboard-toast-success',
             '.toast-success',
@@ -435,42 +291,27 @@ def support_ticket_test():
             '[class*="toast"][class*="success"]',
             '[class*="success"][class*="toast"]'
         ]
+        error_selectors = [
+            '.new-dashboard-toast-error',
+            '.toast-error',
+            '.error-message',
+            '[class*="toast"][class*="error"]',
+            '[class*="error"][class*="toast"]'
+        ]
         
-        for selector in success_selectors:
-            try:
-                success_toast = driver.find_element(By.CSS_SELECTOR, selector)
-                if success_toast and success_toast.is_displayed():
-                    success_text = success_toast.text
-                    TestHelpers.log(f"✅ SUCCESS: {success_text}")
-                    TestHelpers.take_screenshot(driver, '13-success')
-                    found_message = True
-                    break
-            except (NoSuchElementException, TimeoutException):
-                # Try next selector
-                pass
+        # One round trip for all ten selectors
+        probes = TestHelpers.probe_selectors(driver, success_selectors + error_selectors)
+        success_toast = next((probe for probe in probes[:len(success_selectors)] if probe['visible']), None)
+        error_toast = next((probe for probe in probes[len(success_selectors):] if probe['visible']), None)
         
-        # Check for error toast if no success found
-        if not found_message:
-            error_selectors = [
-                '.new-dashboard-toast-error',
-                '.toast-error',
-                '.error-message',
-                '[class*="toast"][class*="error"]',
-                '[class*="error"][class*="toast"]'
-            ]
-            
-            for selector in error_selectors:
-                try:
-                    error_toast = driver.find_element(By.CSS_SELECTOR, selector)
-                    if error_toast and error_toast.is_displayed():
-                        error_text = error_toast.text
-                        TestHelpers.log(f"❌ ERROR: {error_text}")
-                        TestHelpers.take_screenshot(driver, '13-error')
-                        found_message = True
-                        break
-                except (NoSuchElementException, TimeoutException):
-                    # Try next selector
-                    pass
+        if success_toast:
+            TestHelpers.log(f"✅ SUCCESS: {success_toast['text']}")
+            TestHelpers.take_screenshot(driver, '13-success')
+            found_message = True
+        elif error_toast:
+            TestHelpers.log(f"❌ ERROR: {error_toast['text']}")
+            TestHelpers.take_screenshot(driver, '13-error')
+            found_message = True
         
         # If still no message found, check the page content and button state
         if not found_message:
@@ -497,7 +338,7 @@ def support_ticket_test():
             TestHelpers.take_screenshot(driver, '13-unknown-state')
 
         # Wait a bit to see final state
-        time.sleep(2)
+        WaitEngine.wait_until_settled(driver, 2)
 
         if found_message:
             TestHelpers.log('✅ Test completed with verified result!')
@@ -511,6 +352,7 @@ def support_ticket_test():
         print(f'Error message: {str(error)}')
         
         TestHelpers.log_error(error)
+        TestHelpers.mark_test_failed()
         
         # Take screenshot on error
         try:
@@ -526,12 +368,20 @@ def support_ticket_test():
             print('\n⚠️  Non-critical error - test will continue')
     finally:
         # Keep browser open for 5 seconds to see final state
-        TestHelpers.log('⏰ Waiting 5 seconds before closing browser...')
-        time.sleep(5)
+        TestHelpers.log_step('⏰ Teardown: letting the page settle before releasing browser...')
+        WaitEngine.wait_until_settled(driver, 5)
         
-        # Close the browser
-        TestHelpers.log('🔚 Closing browser...')
-        driver.quit()
+        # Make sure queued screenshots are on disk
+        TestHelpers.flush_screenshots()
+        TestHelpers.write_profile('support_ticket_test')
+
+        NetworkFilter.default().report(browser_events)
+        Interstitials.default().report(browser_events)
+        browser_events.stop()
+
+        # Hand the browser back to the pool
+        TestHelpers.log('🔚 Releasing browser...')
+        DriverPool.default().release(driver)
 
 
 if __name__ == '__main__':
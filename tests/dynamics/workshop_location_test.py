@@ -2,49 +2,88 @@
 Workshop Location Creation Test (Dynamics 365)
 Tests the complete flow: Login -> Select App -> Create Building Record
 
+Steps 1-4 are skipped when a saved session for the account is still valid
+(see utils/auth_state.py). The "Stay signed in" prompt and the debugger
+popup are answered in the background (see utils/interstitials.py).
+
 Flow:
 1. Navigate to Dynamics login page
 2. Enter email and click Next
 3. Enter password and click Sign in
-4. Check "Don't show this again" and click Yes
+4. Wait for sign-in to complete
 5. Wait for app selection page
 6. Click HOPE Coach app
-7. Handle debugger popup (click play)
+7. Let the app finish loading
 8. Click Workshop Location sidebar
 9. Click New button
 10. Fill mandatory fields (Name)
 11. Click Save & Close
 12. Verify redirect to list view
+
+Steps 10-12 go through the Xrm client API when the page has it (see
+utils/dynamics_form.py): the name is set and saved in one script call, and
+the new record is read back by id instead of inferring success from the URL.
+Pass --ui to click through the form instead.
+
+Bulk mode signs in once and creates N buildings, reporting records/minute
+and per-record latency percentiles:
+
+    python tests/dynamics/workshop_location_test.py --count 50
+    python tests/dynamics/workshop_location_test.py --count 50 --save-mode new   # Save & New
 """
 
+import argparse
 import sys
 import os
 import time
+import uuid
+from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
 
-from config.config import BROWSER, TIMEOUTS, CHROME_OPTIONS
+from utils.auth_state import AuthStateCache
+from utils.browser_events import BrowserEventStream
+from utils.click_engine import ClickEngine
+from utils.command_trace import percentile
+from utils.driver_pool import DriverPool
+from utils.dynamics_form import DynamicsForm
+from utils.element_actions import ElementActions
+from utils.environment import environment_url
 from utils.helpers import TestHelpers
+from utils.interstitials import Interstitials
+from utils.network_filter import NetworkFilter
+from utils.waits import WaitEngine
+
 
+# Identifies this run in generated record names (timestamp + random part, so
+# parallel workers starting in the same second never collide)
+RUN_ID = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+BUILDING_ENTITY = 'msevtmgt_building'
+
+NAME_INPUT_XPATH = "//input[@aria-label='Name' and @data-id='msevtmgt_name.fieldControl-text-box-text']"
+
+# Bulk mode (--count N)
+BULK = {
+    'progress_every': 10,           # Log progress every N records
+    'max_consecutive_failures': 3   # Give up after this many failed records in a row
+}
 
 # Test configuration
 TEST_CONFIG = {
-    'base_url': 'https://oh-dev.crm.dynamics.com/main.aspx',
+    'base_url': environment_url('dynamics'),
     'credentials': {
         'email': 'hopecoacha@operationhope.org',
         'password': 'A%e&T$N#@hcc'
     },
-    'app_url': 'https://oh-dev.crm.dynamics.com/main.aspx?appid=bbe8d0d8-7b2c-ef11-840a-000d3a125a79',
+    'app_url': environment_url('dynamics_app'),
+    'xrm_fast_path': True,  # Fill and save through the Xrm client API (--ui to click through the form)
     'building': {
-        'name': f'Test Building {int(time.time())}',  # Unique name with timestamp
+        'name': f'Test Building {RUN_ID}',  # Unique per run and worker
         'estimated_capacity': '100',
         'cost': '5000',
         'description': 'Automated test building created by Selenium'
@@ -56,283 +95,462 @@ TEST_CONFIG = {
 }
 
 
-def workshop_location_test():
-    """Main test function"""
+def interactive_login(driver):
+    """Sign in through the AAD login pages (steps 1-4)"""
+
+    # ============================================================
+    # STEP 1: Navigate to Dynamics login page
+    # ============================================================
+    TestHelpers.log_step('📍 Step 1: Navigating to Dynamics login page...')
+    driver.get(TEST_CONFIG['base_url'])
+    TestHelpers.wait_for_page_load(driver)
+    WaitEngine.wait_until_settled(driver, 2)
+    TestHelpers.take_screenshot(driver, '01-login-page')
+
+    # ============================================================
+    # STEP 2: Enter email and click Next
+    # ============================================================
+    TestHelpers.log_step('📧 Step 2: Entering email...')
+    
+    email_input = WebDriverWait(driver, 60).until(
+        EC.presence_of_element_located((By.NAME, 'loginfmt'))
+    )
+    email_input.clear()
+    email_input.send_keys(TEST_CONFIG['credentials']['email'])
+    TestHelpers.log(f"✅ Entered email: {TEST_CONFIG['credentials']['email']}")
+    
+    WaitEngine.wait_until_settled(driver, 1)
+    TestHelpers.take_screenshot(driver, '02-email-entered')
     
-    # Create Chrome options
-    chrome_options = Options()
-    for arg in CHROME_OPTIONS['args']:
-        chrome_options.add_argument(arg)
+    # Click Next button
+    next_button = WebDriverWait(driver, 60).until(
+        EC.element_to_be_clickable((By.ID, 'idSIButton9'))
+    )
+    next_button.click()
+    TestHelpers.log('✅ Clicked Next button')
     
-    # Enable browser logging
-    chrome_options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+    WaitEngine.wait_until_settled(driver, 3)
+    TestHelpers.take_screenshot(driver, '03-after-next')
 
-    # Create WebDriver instance
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # ============================================================
+    # STEP 3: Enter password and click Sign in
+    # ============================================================
+    TestHelpers.log_step('🔒 Step 3: Entering password...')
+    
+    password_input = WebDriverWait(driver, 60).until(
+        EC.presence_of_element_located((By.NAME, 'passwd'))
+    )
+    password_input.clear()
+    password_input.send_keys(TEST_CONFIG['credentials']['password'])
+    TestHelpers.log('✅ Entered password')
+    
+    WaitEngine.wait_until_settled(driver, 1)
+    TestHelpers.take_screenshot(driver, '04-password-entered')
+    
+    # Click Sign in button
+    signin_button = WebDriverWait(driver, 60).until(
+        EC.element_to_be_clickable((By.ID, 'idSIButton9'))
+    )
+    signin_button.click()
+    TestHelpers.log('✅ Clicked Sign in button')
+    
+    WaitEngine.wait_until_settled(driver, 3)
+    TestHelpers.take_screenshot(driver, '05-after-signin')
 
+    # ============================================================
+    # STEP 4: Leave the login pages
+    # ============================================================
+    # The "Stay signed in" prompt ("Don't show this again" + Yes) is answered
+    # by the interstitial dismisser (utils/interstitials.py)
+    TestHelpers.log_step('✅ Step 4: Waiting for sign-in to complete...')
+    
     try:
-        TestHelpers.log('🚀 Starting Workshop Location Creation Test (Dynamics 365)...')
+        WebDriverWait(driver, 60).until(lambda d: 'login.microsoftonline.com' not in d.current_url)
+        TestHelpers.log('✅ Left the login pages')
+    except TimeoutException:
+        TestHelpers.log('⚠️  Still on the login pages, continuing...')
+    
+    WaitEngine.wait_for_app_idle(driver, 30, label='after sign-in')
+    TestHelpers.take_screenshot(driver, '07-after-stay-signed-in')
+    
+    # Log current URL to debug
+    current_url = driver.current_url
+    TestHelpers.log(f'Current URL after sign-in: {current_url}')
 
-        # Set timeouts
-        driver.implicitly_wait(TIMEOUTS['implicit'])
-        driver.set_page_load_timeout(TIMEOUTS['page_load'])
-        driver.set_script_timeout(TIMEOUTS['script'])
 
-        # Maximize window for better visibility
-        driver.maximize_window()
+def building_name(index):
+    """
+    Collision-free building name for a bulk run record
 
-        # ============================================================
-        # STEP 1: Navigate to Dynamics login page
-        # ============================================================
-        TestHelpers.log('📍 Step 1: Navigating to Dynamics login page...')
-        driver.get(TEST_CONFIG['base_url'])
-        TestHelpers.wait_for_page_load(driver)
-        time.sleep(2)
-        TestHelpers.take_screenshot(driver, '01-login-page')
+    Args:
+        index: Record number
 
-        # ============================================================
-        # STEP 2: Enter email and click Next
-        # ============================================================
-        TestHelpers.log('📧 Step 2: Entering email...')
-        
-        email_input = WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located((By.NAME, 'loginfmt'))
-        )
-        email_input.clear()
-        email_input.send_keys(TEST_CONFIG['credentials']['email'])
-        TestHelpers.log(f"✅ Entered email: {TEST_CONFIG['credentials']['email']}")
-        
-        time.sleep(1)
-        TestHelpers.take_screenshot(driver, '02-email-entered')
-        
-        # Click Next button
-        next_button = WebDriverWait(driver, 60).until(
-            EC.element_to_be_clickable((By.ID, 'idSIButton9'))
-        )
-        next_button.click()
-        TestHelpers.log('✅ Clicked Next button')
-        
-        time.sleep(3)
-        TestHelpers.take_screenshot(driver, '03-after-next')
+    Returns:
+        str: Name unique across runs, parallel workers and records
+    """
+    return f"{TEST_CONFIG['building']['name']}-{index:04d}"
 
-        # ============================================================
-        # STEP 3: Enter password and click Sign in
-        # ============================================================
-        TestHelpers.log('🔒 Step 3: Entering password...')
-        
-        password_input = WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located((By.NAME, 'passwd'))
-        )
-        password_input.clear()
-        password_input.send_keys(TEST_CONFIG['credentials']['password'])
-        TestHelpers.log('✅ Entered password')
-        
-        time.sleep(1)
-        TestHelpers.take_screenshot(driver, '04-password-entered')
-        
-        # Click Sign in button
-        signin_button = WebDriverWait(driver, 60).until(
-            EC.element_to_be_clickable((By.ID, 'idSIButton9'))
+
+def open_new_form(driver, verbose=True):
+    """Click New on the Workshop Location list and wait for the form (step 8)"""
+    if verbose:
+        TestHelpers.log_step('➕ Step 8: Clicking New button...')
+
+    # Wait for New button - using aria-label
+    new_button = WebDriverWait(driver, 60).until(
+        EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='New' and contains(@data-id, 'NewRecord')]"))
+    )
+
+    new_button.click()
+    if verbose:
+        TestHelpers.log('✅ Clicked New button')
+
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['dynamics'], label='new form')
+        TestHelpers.take_screenshot(driver, '12-new-building-form')
+
+
+def save_building_xrm(driver, name, save_mode='close', verbose=True):
+    """
+    Steps 9-11 through the Xrm client API: set the name, save, read the record back
+
+    Args:
+        driver: Selenium WebDriver instance, on a new building form
+        name: Building name
+        save_mode: 'close' (back to the list) or 'new' (a blank form is open afterwards)
+        verbose: Log every step and take screenshots
+
+    Returns:
+        bool: True if the record is stored with the name, None if the page
+              has no Xrm client API (fill the form through the UI instead)
+    """
+    form = DynamicsForm(driver)
+    if not form.ready(BUILDING_ENTITY):
+        TestHelpers.log('⚠️  Xrm client API not available, filling the form through the UI')
+        return None
+
+    if verbose:
+        TestHelpers.log_step('📝 Steps 9-10: Setting Name and saving through the Xrm client API...')
+    try:
+        record_id = form.save({'msevtmgt_name': name})
+        if verbose:
+            TestHelpers.log(f"✅ Saved '{name}' as {BUILDING_ENTITY} {record_id}")
+            TestHelpers.log_step('🔍 Step 11: Verifying the stored record...')
+        record = form.retrieve(BUILDING_ENTITY, record_id, ['msevtmgt_name'])
+    except (RuntimeError, ValueError, TimeoutException) as error:
+        # RuntimeError: rejected save; ValueError: no such attribute on the form;
+        # TimeoutException: the save or read-back script did not finish in time
+        TestHelpers.log(f"❌ FAIL: Could not save '{name}': {error}")
+        TestHelpers.take_screenshot(driver, '15-fail-save')
+        return False
+
+    if record is None or record.get('msevtmgt_name') != name:
+        TestHelpers.log(f"❌ FAIL: {BUILDING_ENTITY} {record_id} does not read back with the name '{name}'")
+        TestHelpers.take_screenshot(driver, '15-fail-verify')
+        return False
+
+    if save_mode == 'new':
+        form.open_new(BUILDING_ENTITY)
+        return True
+
+    form.close()
+    WebDriverWait(driver, 60).until(EC.url_contains(TEST_CONFIG['expected_redirect']['to']))
+    if verbose:
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['dynamics'], label='list view')
+        TestHelpers.log(f"✅ Building '{name}' created successfully!")
+        TestHelpers.take_screenshot(driver, '15-success-list-view')
+    return True
+
+
+def create_building(driver, name, save_mode='close', verbose=True, new_form_open=False):
+    """
+    Create one building from the Workshop Location list (steps 8-11)
+
+    Args:
+        driver: Selenium WebDriver instance, on the Workshop Location list
+                (or on a blank form when new_form_open is True)
+        name: Building name
+        save_mode: 'close' (Save & Close, back to the list) or 'new'
+                   (Save & New, a blank form is open afterwards)
+        verbose: Log every step and take screenshots (off in bulk runs)
+        new_form_open: Skip clicking New because a blank form is already open
+
+    With TEST_CONFIG['xrm_fast_path'] the form is filled, saved and verified
+    through the Xrm client API (see save_building_xrm), otherwise through the UI.
+
+    Returns:
+        bool: True if the record was saved
+    """
+    if not new_form_open:
+        open_new_form(driver, verbose)
+
+    if TEST_CONFIG['xrm_fast_path']:
+        saved = save_building_xrm(driver, name, save_mode, verbose)
+        if saved is not None:
+            return saved
+
+    # ============================================================
+    # STEP 9: Fill mandatory fields
+    # ============================================================
+    if verbose:
+        TestHelpers.log_step('📝 Step 9: Filling building form...')
+
+    # Fill Name (mandatory field marked with *)
+    name_input = WebDriverWait(driver, 60).until(
+        EC.presence_of_element_located((By.XPATH, NAME_INPUT_XPATH))
+    )
+    name_input.clear()
+    name_input.send_keys(name)
+    if verbose:
+        TestHelpers.log(f"✅ Entered Name: {name}")
+
+        WaitEngine.wait_until_settled(driver, 1)
+        TestHelpers.take_screenshot(driver, '13-form-filled')
+
+    # ============================================================
+    # STEP 10: Click Save & Close (or Save & New)
+    # ============================================================
+    label = 'Save & New' if save_mode == 'new' else 'Save & Close'
+    if verbose:
+        TestHelpers.log_step(f'💾 Step 10: Clicking {label}...')
+
+    save_locator = (By.XPATH, f"//button[@aria-label='{label}']")
+    WebDriverWait(driver, 60).until(EC.element_to_be_clickable(save_locator))
+
+    # A method only counts as working if the click sent the save request
+    ClickEngine.default().click(
+        driver, save_locator, strategies=['native', 'js', 'actions'], verify=ClickEngine.request_sent(driver)
+    )
+    if verbose:
+        TestHelpers.log(f'✅ Clicked {label} button')
+
+    # ============================================================
+    # STEP 11: Verify the save (redirect to list view, or a fresh form)
+    # ============================================================
+    if verbose:
+        TestHelpers.log_step('🔍 Step 11: Verifying redirect...')
+
+    form_replaced = False
+    try:
+        if save_mode == 'new':
+            # The saved form is replaced by a blank one; a rejected save leaves
+            # the filled form in place, so both waits must succeed
+            WebDriverWait(driver, 60).until(EC.staleness_of(name_input))
+            WebDriverWait(driver, 60, ignored_exceptions=(StaleElementReferenceException,)).until(
+                lambda d: d.find_element(By.XPATH, NAME_INPUT_XPATH).get_attribute('value') == ''
+            )
+            form_replaced = True
+        else:
+            WebDriverWait(driver, 60).until(EC.url_contains(TEST_CONFIG['expected_redirect']['to']))
+    except TimeoutException:
+        pass  # Reported below from the page we ended up on
+
+    if save_mode == 'new':
+        saved = form_replaced
+        if not saved:
+            TestHelpers.log(f"❌ FAIL: No blank form after Save & New for '{name}'")
+            TestHelpers.take_screenshot(driver, '15-fail-save-and-new')
+        return saved
+
+    if verbose:
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['dynamics'], label='list view')
+        TestHelpers.take_screenshot(driver, '14-after-save')
+
+    current_url = driver.current_url
+    if verbose:
+        TestHelpers.log(f"Current URL: {current_url}")
+
+    # Check if we redirected from entity record to entity list
+    if TEST_CONFIG['expected_redirect']['to'] in current_url:
+        if verbose:
+            TestHelpers.log('✅ SUCCESS: Redirected to list view!')
+            TestHelpers.log(f"✅ Building '{name}' created successfully!")
+            TestHelpers.take_screenshot(driver, '15-success-list-view')
+        return True
+    if TEST_CONFIG['expected_redirect']['from'] in current_url:
+        TestHelpers.log(f"❌ FAIL: Still on entity record page for '{name}', redirect did not occur")
+        TestHelpers.take_screenshot(driver, '15-fail-still-on-form')
+    else:
+        TestHelpers.log(f"⚠️  WARNING: Unexpected URL: {current_url}")
+        TestHelpers.take_screenshot(driver, '15-unexpected-url')
+    return False
+
+
+def create_buildings(driver, count, save_mode='close'):
+    """
+    Bulk mode: create `count` buildings in one signed-in session
+
+    Logs records/minute and per-record latency percentiles. A failed record
+    is reported and skipped (the list is reopened); the run stops after
+    BULK['max_consecutive_failures'] failures in a row.
+
+    Args:
+        driver: Selenium WebDriver instance, on the Workshop Location list
+        count: Number of records to create
+        save_mode: 'close' (Save & Close, then New) or 'new' (Save & New)
+
+    Returns:
+        bool: True if every record was saved
+
+    Raises:
+        ValueError: If count is less than 1
+    """
+    if count < 1:
+        raise ValueError(f'count must be at least 1, got {count}')
+    TestHelpers.log_step(f'🏭 Steps 8-11: Creating {count} buildings (Save & {save_mode.title()})...')
+    list_url = driver.current_url
+    latencies = []
+    failures = 0
+    consecutive_failures = 0
+    form_open = False
+    started = time.perf_counter()
+
+    for index in range(1, count + 1):
+        name = building_name(index)
+        record_started = time.perf_counter()
+        try:
+            saved = create_building(driver, name, save_mode, verbose=False, new_form_open=form_open)
+        except WebDriverException as error:
+            # Stale elements, intercepted clicks, timeouts, ...: skip this record, not the batch
+            TestHelpers.log(f"❌ Record {index} ('{name}') failed: {type(error).__name__}")
+            TestHelpers.take_screenshot(driver, f'bulk-{index:04d}-error')
+            saved = False
+
+        if saved:
+            latencies.append(time.perf_counter() - record_started)
+            consecutive_failures = 0
+            form_open = save_mode == 'new'
+            if index % BULK['progress_every'] == 0:
+                TestHelpers.log(f'   🏢 {index}/{count} created')
+            continue
+
+        failures += 1
+        consecutive_failures += 1
+        if consecutive_failures >= BULK['max_consecutive_failures']:
+            TestHelpers.log(f'❌ Stopping bulk run after {consecutive_failures} failures in a row')
+            break
+        # Start the next record from a clean list view
+        driver.get(list_url)
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['dynamics'], label='list view')
+        form_open = False
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    created = len(latencies)
+    TestHelpers.log(f'📊 Bulk run: {created}/{count} created, {failures} failed in {elapsed:.1f}s')
+    if created:
+        TestHelpers.log(
+            f'   {created / elapsed * 60:.1f} records/min; per record '
+            f'p50 {percentile(latencies, 0.50):.2f}s  p95 {percentile(latencies, 0.95):.2f}s  '
+            f'max {latencies[-1]:.2f}s'
         )
-        signin_button.click()
-        TestHelpers.log('✅ Clicked Sign in button')
-        
-        time.sleep(3)
-        TestHelpers.take_screenshot(driver, '05-after-signin')
+    TestHelpers.take_screenshot(driver, '15-bulk-finished')
+    return created == count
+
+
+def workshop_location_test(count=1, save_mode='close'):
+    """
+    Main test function
+
+    Args:
+        count: Buildings to create; more than one switches to bulk mode
+        save_mode: 'close' (Save & Close) or 'new' (Save & New between records)
+
+    Raises:
+        ValueError: If count is less than 1
+    """
+    if count < 1:
+        raise ValueError(f'count must be at least 1, got {count}')
+    
+    # Lease a warm WebDriver instance (timeouts and window state already applied)
+    driver = DriverPool.default().acquire()
+
+    # Watch console errors and network traffic (for the network filter report)
+    browser_events = BrowserEventStream(driver).start()
+
+    try:
+        TestHelpers.log('🚀 Starting Workshop Location Creation Test (Dynamics 365)...')
 
         # ============================================================
-        # STEP 4: Check "Don't show this again" and click Yes
+        # STEPS 1-4: Sign in (restore a saved session or log in interactively)
         # ============================================================
-        TestHelpers.log('✅ Step 4: Handling "Stay signed in" prompt...')
-        
-        try:
-            # Check the "Don't show this again" checkbox
-            kmsi_checkbox = WebDriverWait(driver, 60).until(
-                EC.presence_of_element_located((By.ID, 'KmsiCheckboxField'))
-            )
-            if not kmsi_checkbox.is_selected():
-                kmsi_checkbox.click()
-                TestHelpers.log('✅ Checked "Don\'t show this again"')
-            
-            time.sleep(1)
-            TestHelpers.take_screenshot(driver, '06-checkbox-checked')
-            
-            # Click Yes button
-            yes_button = WebDriverWait(driver, 60).until(
-                EC.element_to_be_clickable((By.ID, 'idSIButton9'))
-            )
-            yes_button.click()
-            TestHelpers.log('✅ Clicked Yes button')
-            
-        except (NoSuchElementException, TimeoutException):
-            TestHelpers.log('⚠️  "Stay signed in" prompt not found, continuing...')
-        
-        time.sleep(10)  # Wait for heavy loading
-        TestHelpers.take_screenshot(driver, '07-after-stay-signed-in')
-        
-        # Log current URL to debug
-        current_url = driver.current_url
-        TestHelpers.log(f'Current URL after sign-in: {current_url}')
+        auth_cache = AuthStateCache(TEST_CONFIG['base_url'], TEST_CONFIG['credentials']['email'])
+        session_restored = auth_cache.restore(driver, TEST_CONFIG['app_url'])
+        if not session_restored:
+            interactive_login(driver)
+            auth_cache.save(driver)
 
         # ============================================================
         # STEP 5: Navigate to HOPE Coach app
         # ============================================================
-        TestHelpers.log('📱 Step 5: Navigating to HOPE Coach app...')
-        time.sleep(5)
+        if session_restored:
+            TestHelpers.log_step('📱 Step 5: Already on HOPE Coach app (restored session)')
+        else:
+            TestHelpers.log_step('📱 Step 5: Navigating to HOPE Coach app...')
+            WaitEngine.wait_until_settled(driver, 5)
         
-        TestHelpers.take_screenshot(driver, '08-before-app-navigation')
+            TestHelpers.take_screenshot(driver, '08-before-app-navigation')
         
-        # Try to click the app tile, if not found, navigate directly
-        try:
+            # Try to click the app tile, if not found, navigate directly
             TestHelpers.log('🔍 Looking for HOPE Coach app tile...')
-            hope_coach_link = driver.find_element(By.ID, 'AppModuleTileSec_1_Item_1')
-            hope_coach_link.click()
-            TestHelpers.log('✅ Clicked HOPE Coach app tile')
-        except NoSuchElementException:
-            TestHelpers.log('⚠️  App tile not found, navigating directly to app URL...')
-            driver.get(TEST_CONFIG['app_url'])
-            TestHelpers.log('✅ Navigated directly to HOPE Coach app')
-        
-        time.sleep(15)  # Wait for app to load (heavy loading)
-        TestHelpers.take_screenshot(driver, '09-hope-coach-loading')
+            hope_coach_link = TestHelpers.find_optional(
+                driver, (By.ID, 'AppModuleTileSec_1_Item_1'), name='HOPE Coach app tile'
+            )
+            if hope_coach_link:
+                hope_coach_link.click()
+                TestHelpers.log('✅ Clicked HOPE Coach app tile')
+            else:
+                TestHelpers.log('⚠️  App tile not found, navigating directly to app URL...')
+                driver.get(TEST_CONFIG['app_url'])
+                TestHelpers.log('✅ Navigated directly to HOPE Coach app')
+        
+            WaitEngine.wait_for_app_idle(driver, 60, apps=['dynamics'], label='HOPE Coach app')
+            TestHelpers.take_screenshot(driver, '09-hope-coach-loading')
 
         # ============================================================
-        # STEP 6: Handle debugger popup (click play)
+        # STEP 6: Let the app finish loading
         # ============================================================
-        TestHelpers.log('⏯️  Step 6: Handling debugger popup...')
-        time.sleep(5)
+        # The debugger popup (Play/Skip) is dismissed in the background
+        TestHelpers.log_step('⏯️  Step 6: Letting the app finish loading...')
         
-        try:
-            # Look for play button or skip button with multiple attempts
-            play_button = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//button[contains(text(), 'Play') or contains(text(), 'Skip') or contains(@aria-label, 'Play') or contains(@aria-label, 'Skip')]"))
-            )
-            play_button.click()
-            TestHelpers.log('✅ Clicked Play/Skip button')
-            time.sleep(2)
-        except (NoSuchElementException, TimeoutException):
-            TestHelpers.log('⚠️  Play button not found, continuing...')
-        
-        time.sleep(5)
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['dynamics'])
         TestHelpers.take_screenshot(driver, '10-after-debugger')
 
         # ============================================================
         # STEP 7: Click Workshop Location sidebar
         # ============================================================
-        TestHelpers.log('🏢 Step 7: Clicking Workshop Location sidebar...')
+        TestHelpers.log_step('🏢 Step 7: Clicking Workshop Location sidebar...')
         
-        # Wait for the sidebar to be loaded (increased timeout)
-        workshop_location_sidebar = WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located((By.XPATH, "//span[contains(text(), 'Workshop Location')]"))
+        # Wait for the sidebar entry (scrolled into view only if it is off-screen)
+        ElementActions.actionable(
+            driver, (By.XPATH, "//span[contains(text(), 'Workshop Location')]"), timeout=60, hit_test=False
         )
         
         TestHelpers.log('✅ Found Workshop Location in sidebar')
         
-        # Scroll to element and click
-        TestHelpers.scroll_to_element(driver, workshop_location_sidebar)
-        time.sleep(3)
-        
-        # Try clicking the parent div
-        try:
-            workshop_location_div = workshop_location_sidebar.find_element(By.XPATH, "./ancestor::div[@role='presentation'][1]")
-            workshop_location_div.click()
-            TestHelpers.log('✅ Clicked Workshop Location sidebar')
-        except:
-            # Fallback to clicking the span directly
-            try:
-                workshop_location_sidebar.click()
-                TestHelpers.log('✅ Clicked Workshop Location sidebar (fallback)')
-            except:
-                # Try JavaScript click
-                driver.execute_script('arguments[0].click();', workshop_location_sidebar)
-                TestHelpers.log('✅ Clicked Workshop Location sidebar (JS)')
-        
-        time.sleep(10)  # Wait for Workshop Location view to load (increased from 5 to 10 seconds)
-        TestHelpers.take_screenshot(driver, '11-workshop-location-view')
-
-        # ============================================================
-        # STEP 8: Click New button
-        # ============================================================
-        TestHelpers.log('➕ Step 8: Clicking New button...')
-        
-        # Wait for New button - using aria-label
-        new_button = WebDriverWait(driver, 60).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='New' and contains(@data-id, 'NewRecord')]"))
+        # Click the sidebar entry's row; the engine falls back to JS/Actions clicks
+        ClickEngine.default().click(
+            driver, (By.XPATH, "//span[contains(text(), 'Workshop Location')]/ancestor::div[@role='presentation'][1]"),
+            strategies=['native', 'js', 'actions']
         )
+        TestHelpers.log('✅ Clicked Workshop Location sidebar')
         
-        new_button.click()
-        TestHelpers.log('✅ Clicked New button')
-        
-        time.sleep(5)  # Wait for form to load
-        TestHelpers.take_screenshot(driver, '12-new-building-form')
-
-        # ============================================================
-        # STEP 9: Fill mandatory fields
-        # ============================================================
-        TestHelpers.log('📝 Step 9: Filling building form...')
-        
-        # Fill Name (mandatory field marked with *)
-        name_input = WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located((By.XPATH, "//input[@aria-label='Name' and @data-id='msevtmgt_name.fieldControl-text-box-text']"))
-        )
-        name_input.clear()
-        name_input.send_keys(TEST_CONFIG['building']['name'])
-        TestHelpers.log(f"✅ Entered Name: {TEST_CONFIG['building']['name']}")
-        
-        time.sleep(1)
-        TestHelpers.take_screenshot(driver, '13-form-filled')
-
-        # ============================================================
-        # STEP 10: Click Save & Close
-        # ============================================================
-        TestHelpers.log('💾 Step 10: Clicking Save & Close...')
-        
-        # Wait for Save & Close button
-        save_close_button = WebDriverWait(driver, 60).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Save & Close']"))
-        )
-        
-        save_close_button.click()
-        TestHelpers.log('✅ Clicked Save & Close button')
-        
-        time.sleep(15)  # Wait for save and redirect (increased from 5 to 15 seconds)
-        TestHelpers.take_screenshot(driver, '14-after-save')
+        WaitEngine.wait_for_app_idle(driver, 30, apps=['dynamics'], label='Workshop Location view')
+        TestHelpers.take_screenshot(driver, '11-workshop-location-view')
 
-        # ============================================================
-        # STEP 11: Verify redirect to list view
-        # ============================================================
-        TestHelpers.log('🔍 Step 11: Verifying redirect...')
-        
-        # Wait a bit more for redirect to complete
-        time.sleep(5)
-        
-        current_url = driver.current_url
-        TestHelpers.log(f"Current URL: {current_url}")
-        
-        # Check if we redirected from entity record to entity list
-        if TEST_CONFIG['expected_redirect']['to'] in current_url:
-            TestHelpers.log('✅ SUCCESS: Redirected to list view!')
-            TestHelpers.log(f"✅ Building '{TEST_CONFIG['building']['name']}' created successfully!")
-            TestHelpers.take_screenshot(driver, '15-success-list-view')
-            test_passed = True
-        elif TEST_CONFIG['expected_redirect']['from'] in current_url:
-            TestHelpers.log('❌ FAIL: Still on entity record page, redirect did not occur')
-            TestHelpers.take_screenshot(driver, '15-fail-still-on-form')
-            test_passed = False
+        if count == 1:
+            test_passed = create_building(driver, TEST_CONFIG['building']['name'], save_mode)
         else:
-            TestHelpers.log(f"⚠️  WARNING: Unexpected URL: {current_url}")
-            TestHelpers.take_screenshot(driver, '15-unexpected-url')
-            test_passed = False
+            test_passed = create_buildings(driver, count, save_mode)
 
         # Wait to see final state
-        time.sleep(3)
+        WaitEngine.wait_until_settled(driver, 3)
 
         if test_passed:
             TestHelpers.log('✅ Test completed successfully!')
             return True
         else:
             TestHelpers.log('❌ Test failed!')
+            TestHelpers.mark_test_failed()
             return False
 
     except Exception as error:
@@ -341,6 +559,7 @@ def workshop_location_test():
         print(f'Error message: {str(error)}')
         
         TestHelpers.log_error(error)
+        TestHelpers.mark_test_failed()
         
         # Take screenshot on error
         try:
@@ -351,17 +570,37 @@ def workshop_location_test():
         raise
     finally:
         # Keep browser open for 5 seconds to see final state
-        TestHelpers.log('⏰ Waiting 5 seconds before closing browser...')
-        time.sleep(5)
+        TestHelpers.log_step('⏰ Teardown: letting the page settle before releasing browser...')
+        WaitEngine.wait_until_settled(driver, 5)
         
-        # Close the browser
-        TestHelpers.log('🔚 Closing browser...')
-        driver.quit()
+        # Make sure queued screenshots are on disk
+        TestHelpers.flush_screenshots()
+        TestHelpers.write_profile('workshop_location_test')
+
+        NetworkFilter.default().report(browser_events)
+        Interstitials.default().report(browser_events)
+        browser_events.stop()
+
+        # Hand the browser back to the pool
+        TestHelpers.log('🔚 Releasing browser...')
+        DriverPool.default().release(driver)
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Create Workshop Location records in Dynamics 365')
+    parser.add_argument('--count', type=int, default=1, help='buildings to create (more than 1 runs bulk mode)')
+    parser.add_argument('--save-mode', choices=['close', 'new'], default='close',
+                        help='Save & Close then New, or Save & New between records')
+    parser.add_argument('--ui', action='store_true',
+                        help='fill and save the form through the UI instead of the Xrm client API')
+    args = parser.parse_args()
+    if args.count < 1:
+        parser.error('--count must be at least 1')
+    if args.ui:
+        TEST_CONFIG['xrm_fast_path'] = False
+
     try:
-        result = workshop_location_test()
+        result = workshop_location_test(args.count, args.save_mode)
         if result:
             print('\n✅ Test passed!')
             print('📸 Check the screenshots folder for visual verification.')
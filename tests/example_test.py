@@ -7,38 +7,23 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
-from config.config import BROWSER, TIMEOUTS, CHROME_OPTIONS
+from utils.driver_pool import DriverPool
 from utils.helpers import TestHelpers
 
 
 def example_test():
     """Example test function"""
     
-    # Create Chrome options
-    chrome_options = Options()
-    for arg in CHROME_OPTIONS['args']:
-        chrome_options.add_argument(arg)
-
-    # Create WebDriver instance
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Lease a warm WebDriver instance (timeouts and window state already applied)
+    driver = DriverPool.default().acquire()
 
     try:
         TestHelpers.log('Starting example test...')
 
-        # Set timeouts
-        driver.implicitly_wait(TIMEOUTS['implicit'])
-        driver.set_page_load_timeout(TIMEOUTS['page_load'])
-        driver.set_script_timeout(TIMEOUTS['script'])
-
         # Navigate to a URL
         TestHelpers.log('Navigating to Google...')
         driver.get('https://www.google.com')
@@ -75,6 +60,7 @@ def example_test():
 
     except Exception as error:
         TestHelpers.log_error(error)
+        TestHelpers.mark_test_failed()
         # Take screenshot on error
         try:
             TestHelpers.take_screenshot(driver, 'error')
@@ -82,9 +68,12 @@ def example_test():
             print(f'Failed to take error screenshot: {screenshot_error}')
         raise
     finally:
-        # Always close the browser
-        TestHelpers.log('Closing browser...')
-        driver.quit()
+        # Make sure queued screenshots are on disk
+        TestHelpers.flush_screenshots()
+
+        # Always hand the browser back to the pool
+        TestHelpers.log('Releasing browser...')
+        DriverPool.default().release(driver)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,232 @@
+"""
+Authenticated-session snapshot and restore
+
+Saves cookies (every domain, through CDP) plus local/session storage of the
+app origin after a successful interactive login, keyed by environment URL and
+account. Later runs inject that state and go straight to the app URL; the
+interactive login only runs again when no snapshot exists, it has expired,
+or the app rejects it.
+
+Usage:
+    auth_cache = AuthStateCache(TEST_CONFIG['base_url'], TEST_CONFIG['credentials']['email'])
+    if not auth_cache.restore(driver, TEST_CONFIG['app_url']):
+        interactive_login(driver)
+        auth_cache.save(driver)
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import AUTH_CACHE
+from utils.helpers import TestHelpers
+from utils.waits import WaitEngine
+
+
+# Runs before any page script; seeds storage for the snapshot origin once per tab
+STORAGE_SEED_JS = """
+(function (origin, local, session) {
+    if (window.location.origin !== origin || window.sessionStorage.getItem('__hopeAuthSeeded')) {
+        return;
+    }
+    Object.keys(local).forEach(function (key) { window.localStorage.setItem(key, local[key]); });
+    Object.keys(session).forEach(function (key) { window.sessionStorage.setItem(key, session[key]); });
+    window.sessionStorage.setItem('__hopeAuthSeeded', '1');
+})(%s, %s, %s);
+"""
+
+READ_STORAGE_JS = """
+var dump = function (storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        if (key !== '__hopeAuthSeeded') {
+            items[key] = storage.getItem(key);
+        }
+    }
+    return items;
+};
+return {
+    origin: window.location.origin,
+    local: dump(window.localStorage),
+    session: dump(window.sessionStorage)
+};
+"""
+
+# Fields accepted by Network.setCookies
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+
+class AuthStateCache:
+    """Snapshot of an authenticated browser session on disk"""
+
+    def __init__(self, env_url, account):
+        """
+        Create a cache entry handle
+
+        Args:
+            env_url: Environment URL the session belongs to
+            account: Account (email) the session belongs to
+        """
+        self.env_url = env_url
+        self.account = account
+        key = hashlib.sha256(f'{env_url}|{account}'.encode('utf-8')).hexdigest()[:32]
+        self.path = os.path.join(self._cache_dir(), f'{key}.json')
+
+    @staticmethod
+    def _cache_dir():
+        return os.environ.get('HOPE_AUTH_CACHE', AUTH_CACHE['path'])
+
+    def save(self, driver):
+        """
+        Snapshot the current session
+
+        Args:
+            driver: Selenium WebDriver instance on the authenticated app page
+        """
+        if not AUTH_CACHE['enabled']:
+            return
+        if not self._not_on_login_host(driver):
+            TestHelpers.log('⚠️  Still on a login page, not saving the session')
+            return
+
+        cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        storage = driver.execute_script(READ_STORAGE_JS)
+        saved_at = time.time()
+
+        snapshot = {
+            'env_url': self.env_url,
+            'account': self.account,
+            'saved_at': saved_at,
+            'expires_at': self._expiry(cookies, saved_at),
+            'cookies': [self._cookie_param(cookie) for cookie in cookies],
+            'storage': storage
+        }
+
+        os.makedirs(self._cache_dir(), exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        # Session cookies are credentials: keep the file private to the user
+        handle = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(handle, 'w', encoding='utf-8') as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+        os.replace(temp_path, self.path)
+
+        TestHelpers.log(f'🔑 Saved session for {self.account} ({len(cookies)} cookies)')
+
+    def restore(self, driver, app_url, is_authenticated=None, timeout=None):
+        """
+        Inject a saved session and open the app URL
+
+        Args:
+            driver: Selenium WebDriver instance
+            app_url: URL to open once the session is injected
+            is_authenticated: Optional callable(driver) -> bool deciding whether
+                              the app accepted the session (defaults to
+                              "not redirected to a login host")
+            timeout: Seconds to let the app settle before checking
+
+        Returns:
+            bool: True if the app accepted the restored session
+        """
+        snapshot = self._load()
+        if snapshot is None:
+            return False
+
+        timeout = AUTH_CACHE['settle_timeout'] if timeout is None else timeout
+        script_id = None
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': snapshot['cookies']})
+
+            storage = snapshot.get('storage') or {}
+            if storage.get('origin'):
+                script_id = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                    'source': STORAGE_SEED_JS % (
+                        json.dumps(storage['origin']),
+                        json.dumps(storage.get('local', {})),
+                        json.dumps(storage.get('session', {}))
+                    )
+                })['identifier']
+
+            driver.get(app_url)
+            WaitEngine.wait_until_settled(driver, timeout, label='restored session')
+
+            check = is_authenticated or self._not_on_login_host
+            if check(driver):
+                TestHelpers.log(f'🔑 Restored saved session for {self.account}, skipping login')
+                return True
+        except WebDriverException as error:
+            TestHelpers.log(f'⚠️  Could not restore saved session: {error}')
+        finally:
+            if script_id is not None:
+                try:
+                    driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                                           {'identifier': script_id})
+                except WebDriverException:
+                    pass
+
+        TestHelpers.log('⚠️  Saved session was rejected, falling back to interactive login')
+        self.invalidate()
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except WebDriverException:
+            driver.delete_all_cookies()
+        return False
+
+    def invalidate(self):
+        """Delete the saved snapshot"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _load(self):
+        if not AUTH_CACHE['enabled']:
+            return None
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (OSError, ValueError):
+            return None
+
+        if snapshot.get('expires_at', 0) <= time.time():
+            TestHelpers.log(f'⌛ Saved session for {self.account} has expired')
+            self.invalidate()
+            return None
+        return snapshot
+
+    @staticmethod
+    def _cookie_param(cookie):
+        param = {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+        # Session cookies report expires == -1; omit it so they stay session cookies
+        if param.get('expires', -1) <= 0:
+            param.pop('expires', None)
+        return param
+
+    @staticmethod
+    def _expiry(cookies, saved_at):
+        """
+        Work out when a snapshot stops being useful
+
+        The earliest expiry of the cookies matching AUTH_CACHE['auth_cookies'],
+        capped at AUTH_CACHE['max_age']. Session cookies (expires == -1) only
+        count towards the cap.
+        """
+        expires_at = saved_at + AUTH_CACHE['max_age']
+        for cookie in cookies:
+            is_auth_cookie = any(
+                fnmatch.fnmatch(cookie['name'], pattern) for pattern in AUTH_CACHE['auth_cookies']
+            )
+            if is_auth_cookie and cookie.get('expires', -1) > 0:
+                expires_at = min(expires_at, cookie['expires'])
+        return expires_at
+
+    @staticmethod
+    def _not_on_login_host(driver):
+        host = urlparse(driver.current_url).hostname or ''
+        return not any(host.endswith(login_host) for login_host in AUTH_CACHE['login_hosts'])
@@ -0,0 +1,306 @@
+"""
+Streaming browser console and network capture over CDP
+
+Replaces turning on `goog:loggingPrefs` and reading one unfiltered
+`driver.get_log('browser')` dump after the fact. A background thread keeps a
+DevTools connection (`driver.bidi_connection()`) open and collects console
+messages, browser log entries, uncaught JS exceptions, failed network
+requests (HTTP 4xx/5xx and requests that never completed) and interstitial
+dismissals (see utils/interstitials.py) as they happen,
+into a bounded in-memory buffer that can be queried mid-test.
+
+Usage:
+    events = BrowserEventStream(driver, url_filter=TEST_CONFIG['base_url']).start()
+    events.mark('submit')
+    ...
+    failed = events.http_errors(since='submit', resource_types=('XHR', 'Fetch'))   # did the submit call fail?
+    events.stop()
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque, namedtuple
+
+import trio
+from selenium.common.exceptions import WebDriverException
+
+from config.config import BROWSER_EVENTS
+from utils.helpers import TestHelpers
+from utils.interstitials import DISMISS_BINDING
+
+
+# Network events also carry the CDP resource type ('XHR', 'Fetch', 'Image', ...)
+# and the browser's wall time (epoch seconds) at which the request was sent
+BrowserEvent = namedtuple(
+    'BrowserEvent', ['kind', 'level', 'text', 'url', 'status', 'timestamp', 'resource', 'started'],
+    defaults=(None, None)
+)
+
+LEVELS = {'debug': 0, 'info': 1, 'warning': 2, 'error': 3}
+
+CONSOLE_LEVELS = {'error': 'error', 'assert': 'error', 'warning': 'warning', 'debug': 'debug'}
+
+
+class BrowserEventStream:
+    """Collects console, exception and network failure events of one driver"""
+
+    def __init__(self, driver, min_level=None, url_filter=None, buffer_size=None):
+        """
+        Create a stream (call `start()` to connect)
+
+        Args:
+            driver: Selenium WebDriver instance (Chrome)
+            min_level: Lowest console/log level kept: 'debug', 'info', 'warning' or 'error'
+            url_filter: URL prefix or regex (matched from the start of the URL);
+                        events with a non-matching URL are ignored
+            buffer_size: Maximum events kept (oldest are dropped)
+        """
+        self.driver = driver
+        self.min_level = LEVELS[min_level or BROWSER_EVENTS['min_level']]
+        if url_filter and '://' in url_filter:
+            url_filter = re.escape(url_filter)  # A plain URL is a prefix
+        self.url_filter = re.compile(url_filter) if url_filter else None
+        self.dropped = 0
+        # Network totals for utils/network_filter.py
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+        self.blocked = Counter()        # URL (without query) -> times blocked by Network.setBlockedURLs
+        self.transfer_sizes = {}        # URL (without query) -> encoded bytes of the last load
+        self._events = deque(maxlen=buffer_size or BROWSER_EVENTS['buffer_size'])
+        self._marks = {}
+        self._browser_marks = {}       # Mark name -> browser epoch seconds, for request start times
+        self._requests = OrderedDict()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._trio_token = None
+        self._cancel_scope = None
+        self.active = False
+
+    def start(self, timeout=None):
+        """
+        Connect to the browser and start collecting in the background
+
+        Never raises: if DevTools is unavailable the stream stays inactive and
+        every query returns an empty list.
+
+        Args:
+            timeout: Seconds to wait for the subscriptions to be live
+
+        Returns:
+            BrowserEventStream: self
+        """
+        self._thread = threading.Thread(target=self._run, name='browser-events', daemon=True)
+        self._thread.start()
+        self._ready.wait(BROWSER_EVENTS['connect_timeout'] if timeout is None else timeout)
+        if not self.active:
+            TestHelpers.log('⚠️  Browser event stream unavailable, console/network capture is off')
+        return self
+
+    def stop(self):
+        """Close the DevTools connection and stop the background thread"""
+        if self._cancel_scope is not None and self._trio_token is not None:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+            except (RuntimeError, trio.RunFinishedError):
+                pass  # Event loop already finished
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.active = False
+
+    def mark(self, name):
+        """
+        Remember the current moment so later queries can ask "since <name>"
+
+        The browser's clock is read as well: request start times come from the
+        browser, and the thread collecting them may lag behind.
+
+        Args:
+            name: Mark name, e.g. 'submit' or 'step 9'
+        """
+        try:
+            self._browser_marks[name] = self.driver.execute_script('return Date.now();') / 1000
+        except WebDriverException:
+            self._browser_marks[name] = time.time()  # Local Chrome shares the machine's clock
+        self._marks[name] = time.monotonic()
+
+    def events(self, kinds=None, since=None, min_level=None):
+        """
+        Query the buffer
+
+        Args:
+            kinds: Iterable of 'console', 'log', 'exception', 'http', 'failed',
+                   'interstitial' (None for all)
+            since: Mark name or time.monotonic() value
+            min_level: Only events at or above this level
+
+        Returns:
+            list: BrowserEvent tuples, oldest first
+        """
+        start = self._start(since)
+        level = LEVELS[min_level] if min_level else 0
+        with self._lock:
+            return [
+                event for event in self._events
+                if event.timestamp >= start
+                and (kinds is None or event.kind in kinds)
+                and LEVELS[event.level] >= level
+            ]
+
+    def http_errors(self, since=None, resource_types=None):
+        """
+        Responses with status 4xx/5xx and requests that failed outright
+
+        Args:
+            since: Mark name or time.monotonic() value; only requests sent
+                   after it count (a slow image requested before the mark
+                   that fails after it does not)
+            resource_types: CDP resource types to keep, e.g. ('XHR', 'Fetch')
+                            (None for all)
+
+        Returns:
+            list: BrowserEvent tuples
+        """
+        sent_after = self._browser_start(since)
+        return [
+            event for event in self.events(kinds=('http', 'failed'), since=since)
+            if (not sent_after or (event.started is not None and event.started >= sent_after))
+            and (resource_types is None or event.resource in resource_types)
+        ]
+
+    def errors(self, since=None):
+        """
+        Every error-level event: console errors, JS exceptions and failed requests
+
+        Args:
+            since: Mark name or time.monotonic() value
+
+        Returns:
+            list: BrowserEvent tuples
+        """
+        return self.events(since=since, min_level='error')
+
+    def log_events(self, since=None, min_level='warning'):
+        """
+        Write the matching events to the test log
+
+        Args:
+            since: Mark name or time.monotonic() value
+            min_level: Only events at or above this level
+        """
+        for event in self.events(since=since, min_level=min_level):
+            status = f' {event.status}' if event.status else ''
+            TestHelpers.log(f'   🌐 {event.kind}{status} {event.level}: {event.text} {event.url or ""}'.rstrip())
+
+    def _start(self, since):
+        return self._marks.get(since, 0.0) if isinstance(since, str) else (since or 0.0)
+
+    def _browser_start(self, since):
+        if isinstance(since, str):
+            return self._browser_marks.get(since, 0.0)
+        return time.time() - (time.monotonic() - since) if since else 0.0
+
+    def _run(self):
+        try:
+            trio.run(self._listen)
+        except Exception as error:
+            if not self.active:
+                TestHelpers.log(f'⚠️  Could not open DevTools connection: {error}')
+        finally:
+            self.active = False
+            self._ready.set()
+
+    async def _listen(self):
+        self._trio_token = trio.lowlevel.current_trio_token()
+        with trio.CancelScope() as cancel_scope:
+            self._cancel_scope = cancel_scope
+            async with self.driver.bidi_connection() as connection:
+                session, devtools = connection.session, connection.devtools
+                await session.execute(devtools.runtime.enable())
+                await session.execute(devtools.log.enable())
+                await session.execute(devtools.network.enable())
+                # Dismissal reports from utils/interstitials.py
+                await session.execute(devtools.runtime.add_binding(name=DISMISS_BINDING))
+
+                event_types = {
+                    devtools.runtime.ConsoleAPICalled: self._on_console,
+                    devtools.runtime.ExceptionThrown: self._on_exception,
+                    devtools.runtime.BindingCalled: self._on_binding,
+                    devtools.log.EntryAdded: self._on_log_entry,
+                    devtools.network.RequestWillBeSent: self._on_request,
+                    devtools.network.ResponseReceived: self._on_response,
+                    devtools.network.LoadingFinished: self._on_finished,
+                    devtools.network.LoadingFailed: self._on_failed
+                }
+                receiver = session.listen(*event_types, buffer_size=BROWSER_EVENTS['channel_size'])
+                self.active = True
+                self._ready.set()
+                async for event in receiver:
+                    event_types[type(event)](event)
+
+    def _add(self, kind, level, text, url=None, status=None, resource=None, started=None):
+        if kind in ('console', 'log') and LEVELS[level] < self.min_level:
+            return
+        if url and self.url_filter and not self.url_filter.match(url):
+            return
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(BrowserEvent(kind, level, text, url, status, time.monotonic(), resource, started))
+
+    def _on_console(self, event):
+        text = ' '.join(
+            str(arg.value if arg.value is not None else arg.description or arg.type_) for arg in event.args
+        )
+        frame = event.stack_trace.call_frames[0] if event.stack_trace and event.stack_trace.call_frames else None
+        self._add('console', CONSOLE_LEVELS.get(event.type_, 'info'), text, frame.url if frame else None)
+
+    def _on_exception(self, event):
+        details = event.exception_details
+        description = details.exception.description if details.exception else None
+        self._add('exception', 'error', description or details.text, details.url)
+
+    def _on_binding(self, event):
+        if event.name != DISMISS_BINDING:
+            return
+        try:
+            dismissal = json.loads(event.payload)
+        except ValueError:
+            return
+        # No URL on purpose: dismissals on login hosts must pass the url_filter
+        self._add('interstitial', 'info', dismissal.get('name', '?'))
+
+    def _on_log_entry(self, event):
+        entry = event.entry
+        level = 'debug' if entry.level == 'verbose' else entry.level
+        self._add('log', level, entry.text, entry.url)
+
+    def _on_request(self, event):
+        self._requests[event.request_id] = (event.request.url, float(event.wall_time))
+        while len(self._requests) > BROWSER_EVENTS['tracked_requests']:
+            self._requests.popitem(last=False)
+
+    def _on_response(self, event):
+        response = event.response
+        if response.status >= 400:
+            _, started = self._requests.get(event.request_id, (None, None))
+            self._add('http', 'error', f'{response.status} {response.status_text}'.strip(),
+                      response.url, response.status, event.type_.value, started)
+
+    def _on_finished(self, event):
+        url, _ = self._requests.pop(event.request_id, (None, None))
+        self.loaded_requests += 1
+        self.loaded_bytes += int(event.encoded_data_length)
+        if url and len(self.transfer_sizes) < BROWSER_EVENTS['tracked_requests']:
+            self.transfer_sizes[url.split('?', 1)[0]] = int(event.encoded_data_length)
+
+    def _on_failed(self, event):
+        url, started = self._requests.pop(event.request_id, (None, None))
+        if event.blocked_reason is not None and event.blocked_reason.value == 'inspector':
+            # Blocked on purpose by the network filter profile, not a failure
+            self.blocked[url.split('?', 1)[0] if url else '<unknown>'] += 1
+            return
+        if not event.canceled:
+            self._add('failed', 'error', event.error_text, url, resource=event.type_.value, started=started)
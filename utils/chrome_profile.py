@@ -0,0 +1,359 @@
+"""
+Managed Chrome profiles with a persistent HTTP and code cache
+
+Without a `--user-data-dir` every `webdriver.Chrome(...)` starts from a
+throwaway profile and downloads the Dynamics UCI bundles and portal assets
+from scratch. With CHROME_PROFILE['enabled'] (or HOPE_CHROME_PROFILE=1) each
+pooled browser gets a profile directory under CHROME_PROFILE['path'] that is
+kept between runs:
+
+- `template/` is filled once by `prewarm` (loads the CHROME_PROFILE['prewarm_apps']
+  URLs of the selected environment)
+- `slot-<n>/` is one browser's copy, seeded from the template; parallel
+  workers and pool drivers each lock their own slot, so no two Chrome
+  processes ever share a directory
+
+Only the caches survive (see KEEP): cookies, storage, IndexedDB, service
+workers, history and saved logins are deleted before every launch, and the
+pool still clears cookies and storage between leases. When a slot grows past
+CHROME_PROFILE['max_mb'] its least recently used cache files are evicted.
+
+Usage:
+    python utils/chrome_profile.py prewarm      # fill the template once
+    python utils/chrome_profile.py status       # size of every profile
+    python utils/chrome_profile.py evict        # apply the size limit now
+    python utils/chrome_profile.py clear        # delete every managed profile
+    HOPE_CHROME_PROFILE=1 python tests/dynamics/workshop_location_test.py
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.config import CHROME_PROFILE
+from utils.helpers import TestHelpers
+
+
+# Profile entries that survive a scrub, relative to the user data dir; the
+# HTTP cache, compiled JS (V8 code cache) and GPU shader caches
+KEEP = (
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'GPUCache'),
+    'GrShaderCache',
+    'ShaderCache'
+)
+
+# Written into a profile when it was last filled from (or as) the template
+STAMP_FILE = '.hope-prewarmed'
+
+
+class ChromeProfile:
+    """Hands out locked, cache-only profile directories to Chrome instances"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, path=None, enabled=None, max_mb=None):
+        """
+        Create the profile manager
+
+        Args:
+            path: Root directory (defaults to $HOPE_CHROME_PROFILE_DIR or CHROME_PROFILE['path'])
+            enabled: Whether drivers get a managed profile (defaults to
+                     $HOPE_CHROME_PROFILE=1 or CHROME_PROFILE['enabled'])
+            max_mb: Size limit of one profile in megabytes
+        """
+        self.path = path or os.environ.get('HOPE_CHROME_PROFILE_DIR') or CHROME_PROFILE['path']
+        if enabled is None:
+            enabled = os.environ.get('HOPE_CHROME_PROFILE') == '1' or CHROME_PROFILE['enabled']
+        self.enabled = enabled
+        self.max_bytes = int((CHROME_PROFILE['max_mb'] if max_mb is None else max_mb) * 1024 * 1024)
+        self.template_dir = os.path.join(self.path, 'template')
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide profile manager, creating it on first use
+
+        Returns:
+            ChromeProfile: Shared instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def checkout(self):
+        """
+        Lock a free slot and prepare it for a new Chrome instance
+
+        The slot is re-seeded from the template when the template was
+        prewarmed after the slot was last seeded; everything but the caches
+        is deleted and the size limit is applied.
+
+        Returns:
+            str: User data directory, or None when managed profiles are off
+        """
+        if not self.enabled:
+            return None
+
+        os.makedirs(self.path, exist_ok=True)
+        slot = 0
+        while True:
+            profile_dir = os.path.join(self.path, f'slot-{slot}')
+            if self._try_lock(profile_dir):
+                break
+            slot += 1
+
+        try:
+            if self._stamp(self.template_dir) > self._stamp(profile_dir):
+                self._seed(profile_dir)
+            self.scrub(profile_dir)
+            self.evict(profile_dir)
+        except OSError as error:
+            TestHelpers.log(f'⚠️  Could not prepare Chrome profile {profile_dir}, starting it empty: {error}')
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        return profile_dir
+
+    def release(self, profile_dir):
+        """
+        Unlock a slot after its Chrome instance has quit
+
+        Args:
+            profile_dir: Directory returned by checkout()
+        """
+        with self._lock:
+            handle = self._locks.pop(profile_dir, None)
+        if handle is not None:
+            handle.close()  # Closing the file drops the lock
+
+    def chrome_args(self, profile_dir):
+        """
+        Chrome switches that make an instance use a profile directory
+
+        Args:
+            profile_dir: Directory returned by checkout() (None for no switches)
+
+        Returns:
+            list: Command line switches
+        """
+        if profile_dir is None:
+            return []
+        # Let Chrome itself keep the HTTP cache within the HTTP share of the limit
+        cache_bytes = int(self.max_bytes * CHROME_PROFILE['http_cache_share'])
+        return [f'--user-data-dir={profile_dir}', f'--disk-cache-size={cache_bytes}']
+
+    @staticmethod
+    def scrub(profile_dir):
+        """
+        Delete everything except the caches (cookies, storage, logins, history, ...)
+
+        Args:
+            profile_dir: User data directory of a Chrome instance that is not running
+        """
+        keep = {os.path.join(profile_dir, entry) for entry in KEEP}
+        keep.add(os.path.join(profile_dir, STAMP_FILE))
+        parents = {os.path.dirname(entry) for entry in keep}
+
+        for root, dirs, files in os.walk(profile_dir, topdown=True):
+            for name in dirs[:]:
+                path = os.path.join(root, name)
+                if path in keep:
+                    dirs.remove(name)       # Keep the whole cache directory
+                elif path not in parents:
+                    shutil.rmtree(path, ignore_errors=True)
+                    dirs.remove(name)
+            for name in files:
+                path = os.path.join(root, name)
+                if path not in keep:
+                    os.remove(path)
+
+    def evict(self, profile_dir):
+        """
+        Delete the least recently used cache files until the profile fits the size limit
+
+        Args:
+            profile_dir: User data directory of a Chrome instance that is not running
+
+        Returns:
+            int: Bytes freed
+        """
+        files = []
+        for entry in KEEP:
+            for root, _, names in os.walk(os.path.join(profile_dir, entry)):
+                for name in names:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        freed = 0
+        for _, size, path in sorted(files):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                freed += size
+            except OSError:
+                pass  # Chrome treats a missing entry as a cache miss
+        if freed:
+            TestHelpers.log(f'🧹 Evicted {freed / 1024 / 1024:.1f} MB from Chrome profile {os.path.basename(profile_dir)}')
+        return freed
+
+    def prewarm(self, urls=None, headless=True):
+        """
+        Fill the template profile by loading the main app URLs once
+
+        Slots are re-seeded from the new template the next time they are
+        checked out.
+
+        Args:
+            urls: URLs to load (defaults to the CHROME_PROFILE['prewarm_apps'] URLs)
+            headless: Run Chrome without a window
+
+        Returns:
+            int: Size of the template profile in bytes
+        """
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+
+        from config.config import CHROME_OPTIONS
+        from utils.driver_pool import build_chrome_options
+        from utils.driver_resolver import create_service
+        from utils.environment import environment_url
+        from utils.waits import WaitEngine
+
+        if not self._try_lock(self.template_dir):
+            raise RuntimeError(f'Template profile {self.template_dir} is in use')
+        try:
+            args = list(CHROME_OPTIONS['args']) + self.chrome_args(self.template_dir)
+            if headless and not any(arg.startswith('--headless') for arg in args):
+                args.append('--headless=new')
+            driver = webdriver.Chrome(service=create_service(), options=build_chrome_options(args))
+            try:
+                for url in urls or [environment_url(app) for app in CHROME_PROFILE['prewarm_apps']]:
+                    TestHelpers.log(f'🔥 Prewarming {url}')
+                    try:
+                        driver.get(url)
+                        WaitEngine.wait_until_settled(driver, CHROME_PROFILE['prewarm_timeout'])
+                    except WebDriverException as error:
+                        TestHelpers.log(f'⚠️  Could not load {url}: {error.msg}')
+            finally:
+                driver.quit()
+
+            self.scrub(self.template_dir)
+            self.evict(self.template_dir)
+            with open(os.path.join(self.template_dir, STAMP_FILE), 'w', encoding='utf-8'):
+                pass  # The stamp's mtime marks when the template was filled
+        finally:
+            self.release(self.template_dir)
+
+        size = self._size(self.template_dir)
+        TestHelpers.log(f'✅ Template profile ready: {size / 1024 / 1024:.1f} MB in {self.template_dir}')
+        return size
+
+    def profiles(self):
+        """
+        List the managed profile directories
+
+        Returns:
+            list: Absolute paths of the template and every slot
+        """
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if os.path.isdir(os.path.join(self.path, name))
+        )
+
+    def _try_lock(self, profile_dir):
+        """Take the slot's lock file; held until release() or process exit"""
+        handle = open(f'{profile_dir}.lock', 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return False
+        with self._lock:
+            self._locks[profile_dir] = handle
+        return True
+
+    def _seed(self, profile_dir):
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        os.makedirs(profile_dir)
+        for entry in KEEP:
+            source = os.path.join(self.template_dir, entry)
+            if os.path.isdir(source):
+                shutil.copytree(source, os.path.join(profile_dir, entry))
+        shutil.copy2(os.path.join(self.template_dir, STAMP_FILE), os.path.join(profile_dir, STAMP_FILE))
+
+    @staticmethod
+    def _stamp(profile_dir):
+        try:
+            return os.path.getmtime(os.path.join(profile_dir, STAMP_FILE))
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _size(profile_dir):
+        total = 0
+        for root, _, names in os.walk(profile_dir):
+            for name in names:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the persistent Chrome profiles')
+    parser.add_argument('command', choices=['prewarm', 'status', 'evict', 'clear'])
+    parser.add_argument('--url', action='append', help='URL to prewarm (repeatable; defaults to the config)')
+    parser.add_argument('--headed', action='store_true', help='show the browser window while prewarming')
+    args = parser.parse_args(argv)
+
+    manager = ChromeProfile(enabled=True)
+    if args.command == 'prewarm':
+        manager.prewarm(args.url, headless=not args.headed)
+        return 0
+
+    for profile_dir in manager.profiles():
+        if not manager._try_lock(profile_dir):
+            print(f'   🔒 {os.path.basename(profile_dir):<12} in use, skipped')
+            continue
+        try:
+            if args.command == 'clear':
+                shutil.rmtree(profile_dir, ignore_errors=True)
+                print(f'   🗑️  {os.path.basename(profile_dir)} deleted')
+            else:
+                if args.command == 'evict':
+                    manager.evict(profile_dir)
+                print(f'   📦 {os.path.basename(profile_dir):<12} {manager._size(profile_dir) / 1024 / 1024:8.1f} MB')
+        finally:
+            manager.release(profile_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
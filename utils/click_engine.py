@@ -0,0 +1,276 @@
+"""
+Adaptive click-strategy engine
+
+Some elements ignore a plain Selenium click (overlays, jQuery-bound handlers,
+elements React re-renders mid-click), so flows used to carry hand-written
+cascades of click methods. The engine tries the strategies in order, records
+which one worked for each page and locator, and persists those statistics so
+later runs try the known winner first instead of paying for the methods that
+are known to fail.
+
+Usage:
+    ClickEngine.default().click(driver, (By.CSS_SELECTOR, '.new-dashboard-submit-btn'),
+                                strategies=['jquery', 'native', 'js'])
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.config import CLICK_ENGINE
+from utils.helpers import TestHelpers
+from utils.waits import WaitEngine
+
+
+JQUERY_CLICK_JS = """
+if (typeof jQuery === 'undefined') {
+    throw new Error('jQuery not available');
+}
+jQuery(arguments[0]).trigger('click');
+"""
+
+# Full pointer sequence for handlers bound to mousedown/mouseup instead of click
+DISPATCH_CLICK_JS = """
+var element = arguments[0];
+['mousedown', 'mouseup', 'click'].forEach(function (type) {
+    element.dispatchEvent(new MouseEvent(type, {bubbles: true, cancelable: true, view: window}));
+});
+"""
+
+
+class ClickNotVerified(WebDriverException):
+    """The click went through but the caller's check saw no effect"""
+
+
+class ClickEngine:
+    """Clicks elements with the strategy that worked last time"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, stats_path=None):
+        """
+        Create an engine
+
+        Args:
+            stats_path: Statistics file (defaults to $HOPE_CLICK_STATS or
+                        CLICK_ENGINE['stats_path'])
+        """
+        self.stats_path = stats_path or os.environ.get('HOPE_CLICK_STATS', CLICK_ENGINE['stats_path'])
+        self.strategies = {
+            'native': self._native_click,
+            'js': self._js_click,
+            'actions': self._actions_click,
+            'jquery': self._jquery_click,
+            'dispatch': self._dispatch_click
+        }
+        self._stats = self._load() if CLICK_ENGINE['persist'] else {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide engine, creating it on first use
+
+        Returns:
+            ClickEngine: Shared engine instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                atexit.register(cls._default.save)
+            return cls._default
+
+    def click(self, driver, locator, strategies=None, timeout=10, verify=None):
+        """
+        Click an element, trying strategies until one works
+
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            strategies: Strategy names in fallback order (defaults to
+                        CLICK_ENGINE['strategies']); the recorded winner for
+                        this page and locator is moved to the front
+            timeout: Seconds to wait for the element to be present
+            verify: Optional callable(driver) -> bool; a strategy only counts
+                    as successful if it returns True afterwards
+
+        Returns:
+            str: Name of the strategy that worked
+
+        Raises:
+            WebDriverException: If every strategy failed
+        """
+        key = self._key(driver, locator)
+        element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located(locator))
+        last_error = None
+
+        for name in self._ordered(key, strategies or CLICK_ENGINE['strategies']):
+            start = time.monotonic()
+            for _ in range(CLICK_ENGINE['stale_retries'] + 1):
+                try:
+                    self.strategies[name](driver, element)
+                    if verify is not None and not verify(driver):
+                        raise ClickNotVerified(f'{name} click had no visible effect')
+                except StaleElementReferenceException as error:
+                    # Re-rendered between lookup and click: the element's fault, not the
+                    # strategy's, so nothing is recorded and the same strategy runs again
+                    last_error = error
+                    TestHelpers.log(f'⚠️  {name} click hit a stale element, locating it again...')
+                    relocated = TestHelpers.find_optional(driver, locator, timeout=CLICK_ENGINE['relocate_timeout'])
+                    if relocated is None:
+                        break  # Still re-rendering: the next strategy hits the stale element and looks again
+                    element = relocated
+                except WebDriverException as error:
+                    self._record(key, name, False)
+                    last_error = error
+                    TestHelpers.log(
+                        f'⚠️  {name} click failed after {time.monotonic() - start:.2f}s, trying next method...'
+                    )
+                    break
+                else:
+                    self._record(key, name, True)
+                    TestHelpers.log(f'🖱️  Clicked {locator[1]} ({name})')
+                    return name
+
+        raise WebDriverException(f'All click strategies failed for {locator}: {last_error}')
+
+    @staticmethod
+    def request_sent(driver, timeout=None):
+        """
+        Build a `verify` callback: the click made the page send an XHR/fetch request
+
+        Call it right before the click. Without a check like this, strategies
+        that never raise (js, jquery) count as successful whenever nothing broke.
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout: Seconds to wait for the request (defaults to CLICK_ENGINE['verify_timeout'])
+
+        Returns:
+            callable: verify(driver) -> bool, True once a request was sent or a new document loaded
+        """
+        timeout = CLICK_ENGINE['verify_timeout'] if timeout is None else timeout
+        before = WaitEngine.page_status(driver)
+
+        def sent(current):
+            status = WaitEngine.page_status(current)
+            if status is None:
+                return False  # Navigating: ask again
+            if before is None:
+                return True  # The page was navigating before the click: the new document is the effect
+            return status['document'] != before['document'] or status['sent'] > before['sent']
+
+        def verify(current):
+            try:
+                return WebDriverWait(current, timeout).until(sent)
+            except TimeoutException:
+                return False
+
+        return verify
+
+    def ranking(self, driver, locator, strategies=None):
+        """
+        Strategy order the next click on this page and locator would use
+
+        Args:
+            driver: Selenium WebDriver instance (for the current page)
+            locator: Tuple of (By, value) for element location
+            strategies: Candidate strategy names
+
+        Returns:
+            list: Strategy names, best first
+        """
+        return self._ordered(self._key(driver, locator), strategies or CLICK_ENGINE['strategies'])
+
+    def save(self):
+        """Merge this process's results into the statistics file"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending or not CLICK_ENGINE['persist']:
+            return
+
+        # Re-read so results from parallel workers are added up, not overwritten
+        stats = self._load()
+        for key, results in pending.items():
+            for name, (successes, failures) in results.items():
+                counts = stats.setdefault(key, {}).setdefault(name, [0, 0])
+                counts[0] += successes
+                counts[1] += failures
+
+        stats_dir = os.path.dirname(self.stats_path) or '.'
+        os.makedirs(stats_dir, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=stats_dir, suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as temp_file:
+            json.dump(stats, temp_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.stats_path)
+
+        with self._lock:
+            self._stats = stats
+
+    def _ordered(self, key, strategies):
+        with self._lock:
+            results = self._combined(key)
+
+        def score(name):
+            successes, failures = results.get(name, (0, 0))
+            # Laplace-smoothed success rate: untried strategies sit at 0.5
+            return (successes + 1) / (successes + failures + 2)
+
+        # sorted() is stable, so ties keep the caller's fallback order
+        return sorted(strategies, key=score, reverse=True)
+
+    def _combined(self, key):
+        combined = {}
+        for source in (self._stats, self._pending):
+            for name, (successes, failures) in source.get(key, {}).items():
+                total = combined.get(name, (0, 0))
+                combined[name] = (total[0] + successes, total[1] + failures)
+        return combined
+
+    def _record(self, key, name, succeeded):
+        with self._lock:
+            counts = self._pending.setdefault(key, {}).setdefault(name, [0, 0])
+            counts[0 if succeeded else 1] += 1
+
+    def _load(self):
+        try:
+            with open(self.stats_path, 'r', encoding='utf-8') as stats_file:
+                return json.load(stats_file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(driver, locator):
+        url = urlparse(driver.current_url)
+        return f'{url.netloc}{url.path}|{locator[0]}={locator[1]}'
+
+    @staticmethod
+    def _native_click(driver, element):
+        element.click()
+
+    @staticmethod
+    def _js_click(driver, element):
+        driver.execute_script('arguments[0].click();', element)
+
+    @staticmethod
+    def _actions_click(driver, element):
+        ActionChains(driver).move_to_element(element).click().perform()
+
+    @staticmethod
+    def _jquery_click(driver, element):
+        driver.execute_script(JQUERY_CLICK_JS, element)
+
+    @staticmethod
+    def _dispatch_click(driver, element):
+        driver.execute_script(DISPATCH_CLICK_JS, element)
@@ -0,0 +1,232 @@
+"""
+WebDriver command tracing
+
+Wraps the driver's command executor so every chromedriver round trip is
+recorded with its command name, locator (for find commands), latency,
+outcome and the call site that issued it (the innermost frame outside
+Selenium and the tracing/profiling wrappers). `finish()` reports per-test command counts, p50/p95 latency per
+command type and the call sites that cost the most time, which is how chatty
+helpers (a WebDriverWait polling `findElement` many times) show up.
+
+Tracing is off unless COMMAND_TRACE['enabled'] is set or
+HOPE_TRACE_COMMANDS=1. Pooled drivers are attached automatically.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import selenium
+
+from config.config import COMMAND_TRACE
+
+
+CommandRecord = namedtuple('CommandRecord', ['command', 'locator', 'latency', 'outcome', 'site'])
+
+SELENIUM_DIR = os.path.dirname(selenium.__file__)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Wrappers between the flow and the executor: with --profile, utils/profiler.py
+# wraps WebDriver.execute and WebDriverWait.until, so its frames never name a call site
+WRAPPER_FILES = (__file__, os.path.join(os.path.dirname(__file__), 'profiler.py'))
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile
+
+    Args:
+        values: Sorted list of numbers
+        fraction: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        float: The percentile value (0.0 for an empty list)
+    """
+    if not values:
+        return 0.0
+    rank = min(len(values), max(1, math.ceil(fraction * len(values)))) - 1
+    return values[rank]
+
+
+class CommandTracer:
+    """Records every WebDriver command of the attached drivers"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, directory=None, enabled=None, top_n=None):
+        """
+        Create a tracer
+
+        Args:
+            directory: Report directory (defaults to $HOPE_TRACE_DIR or COMMAND_TRACE['path'])
+            enabled: Force tracing on or off (defaults to COMMAND_TRACE['enabled'] or
+                     $HOPE_TRACE_COMMANDS)
+            top_n: Number of call sites in the report
+        """
+        if enabled is None:
+            enabled = COMMAND_TRACE['enabled'] or os.environ.get('HOPE_TRACE_COMMANDS') == '1'
+        self.enabled = enabled
+        self.directory = directory or os.environ.get('HOPE_TRACE_DIR', COMMAND_TRACE['path'])
+        self.top_n = COMMAND_TRACE['top_n'] if top_n is None else top_n
+        self.records = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide tracer, creating it on first use
+
+        Returns:
+            CommandTracer: Shared tracer instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def attach(self, driver):
+        """
+        Start recording a driver's commands (no-op when tracing is off)
+
+        Args:
+            driver: Selenium WebDriver instance
+        """
+        executor = driver.command_executor
+        if not self.enabled or getattr(executor, '_hope_traced', False):
+            return
+
+        execute = executor.execute
+
+        def traced_execute(command, params):
+            # The executor removes URL parameters from params, so read the locator first
+            locator = None
+            if isinstance(params, dict) and 'using' in params:
+                locator = f"{params['using']}={params.get('value')}"
+            site = self._call_site()
+
+            start = time.perf_counter()
+            outcome = 'exception'
+            try:
+                response = execute(command, params)
+                outcome = self._outcome(response)
+                return response
+            finally:
+                record = CommandRecord(command, locator, time.perf_counter() - start, outcome, site)
+                with self._lock:
+                    self.records.append(record)
+
+        executor.execute = traced_execute
+        executor._hope_traced = True
+
+    def summary(self):
+        """
+        Aggregate the commands recorded since the last `finish()`
+
+        Returns:
+            dict: total count/time, per-command stats and the costliest call sites
+        """
+        with self._lock:
+            records = list(self.records)
+
+        by_command = {}
+        by_site = {}
+        for record in records:
+            by_command.setdefault(record.command, []).append(record)
+            by_site.setdefault(record.site, []).append(record)
+
+        commands = {}
+        for command, group in by_command.items():
+            latencies = sorted(record.latency for record in group)
+            commands[command] = {
+                'count': len(group),
+                'errors': sum(1 for record in group if record.outcome != 'ok'),
+                'total': sum(latencies),
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95)
+            }
+
+        sites = []
+        for site, group in by_site.items():
+            counts = {}
+            for record in group:
+                counts[record.command] = counts.get(record.command, 0) + 1
+            sites.append({
+                'site': site,
+                'count': len(group),
+                'total': sum(record.latency for record in group),
+                'commands': counts
+            })
+        sites.sort(key=lambda entry: entry['total'], reverse=True)
+
+        return {
+            'count': len(records),
+            'total': sum(record.latency for record in records),
+            'commands': dict(sorted(commands.items(), key=lambda item: item[1]['total'], reverse=True)),
+            'top_sites': sites[:self.top_n]
+        }
+
+    def finish(self, test_name):
+        """
+        Write and print the report for one test and start counting afresh
+
+        Args:
+            test_name: Name used for the report file
+
+        Returns:
+            str: Path of the JSON report (None if tracing is off or nothing ran)
+        """
+        if not self.enabled:
+            return None
+
+        report = self.summary()
+        with self._lock:
+            self.records = []
+        if not report['count']:
+            return None
+
+        report['test'] = test_name
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory, f"{test_name}-commands-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+
+        print(f"\n📡 {report['count']} WebDriver commands in {report['total']:.2f}s ({test_name})")
+        for command, stats in list(report['commands'].items())[:10]:
+            print(f"   {stats['count']:5d}x  p50 {stats['p50'] * 1000:6.1f}ms  "
+                  f"p95 {stats['p95'] * 1000:6.1f}ms  {command}")
+        print('   Costliest call sites:')
+        for entry in report['top_sites']:
+            print(f"   {entry['total']:7.2f}s  {entry['count']:5d}x  {entry['site']}")
+        return path
+
+    @staticmethod
+    def _outcome(response):
+        if not isinstance(response, dict):
+            return 'ok'
+        value = response.get('value')
+        if isinstance(value, dict) and value.get('error'):
+            return value['error']
+        status = response.get('status', 0)
+        if not isinstance(status, int) or status == 0 or 200 <= status < 300:
+            return 'ok'
+        return f'http {status}'
+
+    @staticmethod
+    def _call_site():
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if not filename.startswith(SELENIUM_DIR) and filename not in WRAPPER_FILES:
+                if filename.startswith(ROOT_DIR):
+                    filename = os.path.relpath(filename, ROOT_DIR)
+                return f'{filename}:{frame.f_lineno} {frame.f_code.co_name}'
+            frame = frame.f_back
+        return '<unknown>'
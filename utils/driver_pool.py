@@ -0,0 +1,282 @@
+"""
+WebDriver session pool
+
+Hands out warm Chrome sessions so test flows do not pay the full browser
+cold start every time. Between leases each driver is reset (cookies,
+storage, extra tabs, window state, timeouts) and it is retired after
+DRIVER_POOL['max_uses'] leases. With managed Chrome profiles enabled (see
+utils/chrome_profile.py) every new browser also starts with a warm cache.
+
+Usage:
+    driver = DriverPool.default().acquire()
+    try:
+        driver.get('https://example.com')
+    finally:
+        DriverPool.default().release(driver)
+
+    # or
+    with DriverPool.default().lease() as driver:
+        driver.get('https://example.com')
+"""
+
+import atexit
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+
+from config.config import TIMEOUTS, CHROME_OPTIONS, DRIVER_POOL
+from utils.chrome_profile import ChromeProfile
+from utils.command_trace import CommandTracer
+from utils.driver_resolver import create_service
+from utils.environment import launch_args, launch_profile
+from utils.interstitials import Interstitials
+from utils.network_filter import NetworkFilter
+from utils.readiness import ReadinessProbes
+from utils.helpers import TestHelpers
+
+
+def build_chrome_options(args=None, capabilities=None):
+    """
+    Build Chrome options from config
+
+    Args:
+        args: Command line switches (defaults to CHROME_OPTIONS['args'])
+        capabilities: Extra capabilities (defaults to CHROME_OPTIONS['capabilities'])
+
+    Returns:
+        Options: Chrome options instance
+    """
+    chrome_options = Options()
+    for arg in (CHROME_OPTIONS['args'] if args is None else args):
+        chrome_options.add_argument(arg)
+
+    if capabilities is None:
+        capabilities = CHROME_OPTIONS.get('capabilities', {})
+    for name, value in capabilities.items():
+        chrome_options.set_capability(name, value)
+
+    return chrome_options
+
+
+class PooledDriver:
+    """A pooled WebDriver instance, its lease count and its managed profile directory"""
+
+    def __init__(self, driver, profile_dir=None):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.uses = 0
+
+
+class DriverPool:
+    """Pool of reusable Chrome WebDriver sessions"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, size=None, max_uses=None, args=None, capabilities=None, launch=None):
+        """
+        Create a pool
+
+        Args:
+            size: Maximum number of idle drivers kept warm
+            max_uses: Number of leases after which a driver is retired
+            args: Chrome command line switches (defaults to CHROME_OPTIONS['args']);
+                  the selected launch profile is applied on top
+            capabilities: Extra capabilities (defaults to CHROME_OPTIONS['capabilities'])
+            launch: Launch profile name (defaults to $HOPE_LAUNCH_PROFILE or LAUNCH_PROFILES['profile'])
+        """
+        self.launch_profile, profile = launch_profile(launch)
+        self.size = profile.get('pool_size', DRIVER_POOL['size']) if size is None else size
+        self.max_uses = DRIVER_POOL['max_uses'] if max_uses is None else max_uses
+        self.args = launch_args(CHROME_OPTIONS['args'] if args is None else args, profile)
+        sized = any(arg.startswith('--window-size=') for arg in profile.get('args', []))
+        self.maximize = profile.get('maximize', DRIVER_POOL.get('maximize') and not sized)
+        self.capabilities = capabilities
+        self._idle = []
+        self._leased = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide pool, creating it on first use
+
+        Returns:
+            DriverPool: Shared pool instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                atexit.register(cls._default.shutdown)
+            return cls._default
+
+    def acquire(self):
+        """
+        Lease a warm driver
+
+        Returns:
+            WebDriver: Driver with timeouts and window state applied
+        """
+        with self._lock:
+            pooled = self._idle.pop() if self._idle else None
+
+        if pooled is None:
+            pooled = self._create_pooled()
+            CommandTracer.default().attach(pooled.driver)
+            self._apply_session_state(pooled.driver)
+
+        pooled.uses += 1
+        with self._lock:
+            self._leased[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def release(self, driver):
+        """
+        Return a leased driver to the pool
+
+        Args:
+            driver: WebDriver instance returned by acquire()
+        """
+        with self._lock:
+            pooled = self._leased.pop(id(driver), None)
+        if pooled is None:
+            return
+
+        if pooled.uses >= self.max_uses:
+            TestHelpers.log(f'♻️  Retiring browser after {pooled.uses} uses')
+            self._quit(pooled)
+            return
+
+        if not self._reset(pooled.driver):
+            self._quit(pooled)
+            return
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(pooled)
+                return
+        self._quit(pooled)
+
+    @contextmanager
+    def lease(self):
+        """
+        Lease a warm driver for the duration of a with-block
+
+        Yields:
+            WebDriver: Driver with timeouts and window state applied
+        """
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def shutdown(self):
+        """Quit every idle driver and refuse further returns"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._quit(pooled)
+
+    def _create_pooled(self):
+        # An explicit --user-data-dir in the args wins over the managed profiles
+        profile = ChromeProfile.default()
+        managed = not any(arg.startswith('--user-data-dir') for arg in self.args)
+        profile_dir = profile.checkout() if managed else None
+        try:
+            return PooledDriver(self._create_driver(profile.chrome_args(profile_dir)), profile_dir)
+        except Exception:
+            profile.release(profile_dir)
+            raise
+
+    def _create_driver(self, extra_args=()):
+        chrome_options = build_chrome_options(self.args + list(extra_args), self.capabilities)
+        try:
+            return webdriver.Chrome(service=create_service(), options=chrome_options)
+        except SessionNotCreatedException:
+            # Chrome may have auto-updated past the cached driver; re-detect once
+            TestHelpers.log('⚠️  Session not created, re-resolving chromedriver...')
+            return webdriver.Chrome(service=create_service(refresh=True), options=chrome_options)
+
+    def _apply_session_state(self, driver):
+        driver.implicitly_wait(TIMEOUTS['implicit'])
+        driver.set_page_load_timeout(TIMEOUTS['page_load'])
+        driver.set_script_timeout(TIMEOUTS['script'])
+
+        if self.maximize:
+            driver.maximize_window()
+        else:
+            width, height = self._window_size()
+            driver.set_window_rect(0, 0, width, height)
+
+        NetworkFilter.default().apply(driver)
+        Interstitials.default().install(driver)
+        ReadinessProbes.install(driver)
+
+    def _window_size(self):
+        for arg in self.args:
+            if arg.startswith('--window-size='):
+                width, height = arg.split('=', 1)[1].split(',')
+                return int(width), int(height)
+        return 1920, 1080
+
+    def _reset(self, driver):
+        """
+        Reset a driver to a clean state before it goes back to the pool
+
+        Args:
+            driver: WebDriver instance to reset
+
+        Returns:
+            bool: True if the driver can be reused
+        """
+        try:
+            # Close every tab except the first one
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                self._clear_origin_storage(driver)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            self._clear_origin_storage(driver)
+
+            # Cookies for every domain, not just the current one
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except WebDriverException:
+                driver.delete_all_cookies()
+
+            driver.get('about:blank')
+            self._apply_session_state(driver)
+            return True
+        except WebDriverException as error:
+            TestHelpers.log(f'⚠️  Could not reset pooled browser, discarding it: {error}')
+            return False
+
+    @staticmethod
+    def _clear_origin_storage(driver):
+        origin = driver.execute_script('return window.location.origin')
+        if not origin or origin == 'null':
+            return
+
+        try:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': origin,
+                'storageTypes': 'local_storage,session_storage,indexeddb,service_workers,cache_storage'
+            })
+        except WebDriverException:
+            driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except WebDriverException:
+            pass
+        # Chrome has exited, so the profile can go to the next browser
+        ChromeProfile.default().release(pooled.profile_dir)
@@ -0,0 +1,246 @@
+"""
+Offline, cached chromedriver resolution
+
+Replaces calling `ChromeDriverManager().install()` on every run. The
+installed Chrome version is detected once, the matching chromedriver binary
+is stored in a local content-addressed cache keyed by Chrome major version,
+and later runs resolve it straight from the cache index without touching
+the network.
+
+Usage:
+    service = create_service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+Seeding an air-gapped runner from a copied binary:
+    python utils/driver_resolver.py seed /path/to/chromedriver
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+from config.config import DRIVER_CACHE
+
+
+INDEX_FILE = 'index.json'
+BLOBS_DIR = 'blobs'
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+_lock = threading.Lock()
+_resolved = {}
+
+
+def _cache_dir():
+    return os.environ.get('HOPE_DRIVER_CACHE', DRIVER_CACHE['path'])
+
+
+def _is_offline():
+    return DRIVER_CACHE['offline'] or os.environ.get('HOPE_OFFLINE') == '1'
+
+
+def _binary_name():
+    return 'chromedriver.exe' if sys.platform.startswith('win') else 'chromedriver'
+
+
+def _load_index():
+    index_path = os.path.join(_cache_dir(), INDEX_FILE)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as index_file:
+            return json.load(index_file)
+    except (OSError, ValueError):
+        return {'browser': {}, 'drivers': {}}
+
+
+def _save_index(index):
+    cache_dir = _cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Write to a temp file and rename so parallel workers never see a partial index
+    handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(handle, 'w', encoding='utf-8') as temp_file:
+        json.dump(index, temp_file, indent=2, sort_keys=True)
+    os.replace(temp_path, os.path.join(cache_dir, INDEX_FILE))
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as binary:
+        for chunk in iter(lambda: binary.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_chrome_version(refresh=False):
+    """
+    Detect the installed Chrome version
+
+    The detected version is remembered in the cache index for
+    DRIVER_CACHE['version_ttl'] seconds, so the (slow on Windows) OS probe
+    only runs occasionally.
+
+    Args:
+        refresh: Ignore the remembered version and probe the OS again
+
+    Returns:
+        str: Full Chrome version, e.g. '131.0.6778.85'
+    """
+    index = _load_index()
+    browser = index.get('browser', {})
+    is_fresh = time.time() - browser.get('checked_at', 0) < DRIVER_CACHE['version_ttl']
+    if browser.get('version') and is_fresh and not refresh:
+        return browser['version']
+
+    version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    if not version:
+        version = OperationSystemManager().get_browser_version_from_os(ChromeType.CHROMIUM)
+    if not version:
+        raise RuntimeError('Could not detect the installed Chrome version')
+
+    index['browser'] = {'version': version, 'checked_at': time.time()}
+    _save_index(index)
+    return version
+
+
+def _major(version):
+    match = VERSION_PATTERN.search(version or '')
+    if not match:
+        raise RuntimeError(f'Unrecognised version string: {version!r}')
+    return match.group(1)
+
+
+def store_driver(source_path, version):
+    """
+    Copy a chromedriver binary into the content-addressed cache
+
+    Args:
+        source_path: Path to a chromedriver binary
+        version: Chromedriver version the binary reports
+
+    Returns:
+        str: Path of the cached binary
+    """
+    digest = _sha256(source_path)
+    blob_dir = os.path.join(_cache_dir(), BLOBS_DIR, digest)
+    blob_path = os.path.join(blob_dir, _binary_name())
+
+    if not os.path.exists(blob_path):
+        os.makedirs(blob_dir, exist_ok=True)
+        temp_path = f'{blob_path}.{os.getpid()}.tmp'
+        shutil.copyfile(source_path, temp_path)
+        os.chmod(temp_path, os.stat(temp_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        os.replace(temp_path, blob_path)
+
+    index = _load_index()
+    index.setdefault('drivers', {})[_major(version)] = {
+        'sha256': digest,
+        'version': version,
+        'stored_at': time.time()
+    }
+    _save_index(index)
+    return blob_path
+
+
+def _cached_driver(major):
+    entry = _load_index().get('drivers', {}).get(major)
+    if not entry:
+        return None
+
+    blob_path = os.path.join(_cache_dir(), BLOBS_DIR, entry['sha256'], _binary_name())
+    return blob_path if os.path.exists(blob_path) else None
+
+
+def _download_driver(chrome_version):
+    if _is_offline():
+        raise RuntimeError(
+            f'No cached chromedriver for Chrome {chrome_version} and offline mode is on. '
+            f'Seed the cache with: python utils/driver_resolver.py seed /path/to/chromedriver'
+        )
+
+    downloaded_path = ChromeDriverManager().install()
+    return store_driver(downloaded_path, _driver_version(downloaded_path) or chrome_version)
+
+
+def _driver_version(driver_path):
+    try:
+        output = subprocess.run(
+            [driver_path, '--version'], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def resolve_chromedriver(refresh=False):
+    """
+    Resolve the chromedriver binary for the installed Chrome
+
+    Args:
+        refresh: Re-detect the Chrome version (e.g. after a session failed
+                 because Chrome auto-updated)
+
+    Returns:
+        str: Path to a chromedriver binary matching the installed Chrome
+    """
+    with _lock:
+        chrome_version = detect_chrome_version(refresh=refresh)
+        major = _major(chrome_version)
+
+        if not refresh and major in _resolved:
+            return _resolved[major]
+
+        driver_path = _cached_driver(major) or _download_driver(chrome_version)
+        _resolved[major] = driver_path
+        return driver_path
+
+
+def create_service(refresh=False):
+    """
+    Create a Chrome service backed by the cached chromedriver
+
+    Args:
+        refresh: Re-detect the Chrome version before resolving
+
+    Returns:
+        Service: Chrome service instance
+    """
+    return Service(resolve_chromedriver(refresh=refresh))
+
+
+def seed(driver_path):
+    """
+    Seed the cache from an existing chromedriver binary (air-gapped runners)
+
+    Args:
+        driver_path: Path to a chromedriver binary
+
+    Returns:
+        str: Path of the cached binary
+    """
+    version = _driver_version(driver_path)
+    if not version:
+        raise RuntimeError(f'Could not read the version of {driver_path}')
+    return store_driver(driver_path, version)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == 'seed':
+        print(f'Seeded: {seed(sys.argv[2])}')
+    elif len(sys.argv) == 2 and sys.argv[1] == 'resolve':
+        print(resolve_chromedriver())
+    else:
+        print('Usage: python utils/driver_resolver.py [resolve | seed /path/to/chromedriver]')
+        sys.exit(2)
@@ -0,0 +1,195 @@
+"""
+Dynamics 365 forms through the Xrm client API
+
+Filling a UCI form by XPath and keystrokes, clicking Save & Close and then
+inferring success from the URL costs a round trip per key and fixed waits,
+and says nothing about whether the record really exists. The form's own
+client API does the same work in a few script calls:
+
+- `ready()`      waits until a form for the entity is loaded (the Xrm form data, not just the DOM)
+- `save()`       sets several attributes, saves and resolves on the save promise,
+                 returning the record id
+- `retrieve()`   reads the record back through Xrm.WebApi, so the flow can
+                 verify what was stored
+- `close()` / `open_new()` leave the form like Save & Close / Save & New do
+
+`Xrm.Page` is deprecated in favour of the form context, but it is the only
+handle reachable from outside a form event handler and is still supported by
+Unified Interface.
+
+Usage:
+    form = DynamicsForm(driver)
+    if form.ready('msevtmgt_building'):
+        record_id = form.save({'msevtmgt_name': 'Test Building'})
+        record = form.retrieve('msevtmgt_building', record_id, ['msevtmgt_name'])
+        form.close()
+"""
+
+from selenium.common.exceptions import TimeoutException
+
+from config.config import TIMEOUTS, WAITS
+from utils.waits import WaitEngine
+
+
+# Resolves with 'ready' once a form for the entity is loaded, 'unavailable'
+# when the loaded page has no Xrm, or null after timeoutMs
+FORM_READY_JS = """
+var entity = arguments[0], newRecord = arguments[1], pollMs = arguments[2], timeoutMs = arguments[3],
+    done = arguments[arguments.length - 1];
+var started = Date.now();
+var check = function () {
+    if (typeof window.Xrm === 'undefined') {
+        if (document.readyState === 'complete') { return 'unavailable'; }
+        return null;
+    }
+    var page = Xrm.Page;
+    if (!page || !page.data || !page.data.entity || !page.ui) { return null; }
+    if (page.data.entity.getEntityName() !== entity) { return null; }
+    if (newRecord && page.data.entity.getId()) { return null; }  // Still the record that was just saved
+    return 'ready';
+};
+var poll = function () {
+    var state = check();
+    if (state) { done(state); }
+    else if (Date.now() - started >= timeoutMs) { done(null); }
+    else { window.setTimeout(poll, pollMs); }
+};
+poll();
+"""
+
+# Sets the attributes and saves; resolves with {id} or {error}
+SAVE_FORM_JS = """
+var values = arguments[0], done = arguments[arguments.length - 1];
+var page = Xrm.Page;
+var missing = Object.keys(values).filter(function (name) { return !page.getAttribute(name); });
+if (missing.length) {
+    done({error: 'No attribute(s) ' + missing.join(', ') + ' on the form'});
+    return;
+}
+Object.keys(values).forEach(function (name) {
+    var attribute = page.getAttribute(name);
+    attribute.setValue(values[name]);
+    attribute.fireOnChange();  // Run the form's business logic as a user edit would
+});
+page.data.save().then(function () {
+    done({id: page.data.entity.getId().replace(/[{}]/g, '').toLowerCase()});
+}, function (error) {
+    done({error: (error && error.message) || String(error)});
+});
+"""
+
+# Resolves with the record or {error}
+RETRIEVE_RECORD_JS = """
+var entity = arguments[0], id = arguments[1], options = arguments[2], done = arguments[arguments.length - 1];
+Xrm.WebApi.retrieveRecord(entity, id, options).then(function (record) {
+    done({record: record});
+}, function (error) {
+    done({error: (error && error.message) || String(error)});
+});
+"""
+
+
+class DynamicsForm:
+    """Fills, saves and verifies Unified Interface records through the Xrm client API"""
+
+    def __init__(self, driver):
+        """
+        Create the form driver
+
+        Args:
+            driver: Selenium WebDriver instance on a Dynamics 365 app page
+        """
+        self.driver = driver
+
+    def ready(self, entity, timeout=60, new_record=True):
+        """
+        Wait until a form for the entity is loaded
+
+        Args:
+            entity: Logical name of the entity, e.g. 'msevtmgt_building'
+            timeout: Timeout in seconds
+            new_record: Only accept a form for a record that is not saved yet
+
+        Returns:
+            bool: True when the form is ready, False when the page has no
+                  Xrm client API (use the UI instead)
+
+        Raises:
+            TimeoutException: If the form did not load in time
+        """
+        state = WaitEngine.run_async(
+            self.driver, timeout,
+            lambda remaining: self.driver.execute_async_script(
+                FORM_READY_JS, entity, new_record, int(WAITS['min_poll'] * 1000), int(remaining * 1000)
+            )
+        )
+        if state is None:
+            raise TimeoutException(f"No {entity} form loaded within {timeout}s")
+        return state == 'ready'
+
+    def save(self, values=None, timeout=60):
+        """
+        Set attributes and save the record in one script call
+
+        Resolves on the form's save promise, so it returns as soon as the
+        server has stored the record (or rejected it).
+
+        Args:
+            values: Dict of {attribute logical name: value}
+            timeout: Timeout in seconds
+
+        Returns:
+            str: Id of the saved record (lowercase GUID without braces)
+
+        Raises:
+            ValueError: If the form has no such attribute
+            RuntimeError: If the save failed (validation error, plugin exception, ...)
+        """
+        result = self._execute_async(timeout, SAVE_FORM_JS, values or {})
+        if 'error' in result:
+            if result['error'].startswith('No attribute'):
+                raise ValueError(result['error'])
+            raise RuntimeError(f"Save failed: {result['error']}")
+        return result['id']
+
+    def retrieve(self, entity, record_id, columns=None, timeout=30):
+        """
+        Read a record back through Xrm.WebApi
+
+        Args:
+            entity: Logical name of the entity
+            record_id: Record id as returned by save()
+            columns: Attribute names to select (defaults to all)
+            timeout: Timeout in seconds
+
+        Returns:
+            dict: The record, or None if it does not exist
+        """
+        options = f"?$select={','.join(columns)}" if columns else ''
+        result = self._execute_async(timeout, RETRIEVE_RECORD_JS, entity, record_id, options)
+        if 'error' in result:
+            if 'does not exist' in result['error'].lower():
+                return None
+            raise RuntimeError(f"Could not retrieve {entity} {record_id}: {result['error']}")
+        return result['record']
+
+    def close(self):
+        """Close the form and go back to where it was opened from (the list)"""
+        self.driver.execute_script('Xrm.Page.ui.close();')
+
+    def open_new(self, entity):
+        """
+        Open a blank form for the entity (use ready() to wait for it)
+
+        Args:
+            entity: Logical name of the entity
+        """
+        self.driver.execute_script('Xrm.Navigation.openForm({entityName: arguments[0]});', entity)
+
+    def _execute_async(self, timeout, script, *args):
+        """Run a one-shot async script with the script timeout raised to `timeout`"""
+        self.driver.set_script_timeout(timeout)
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            self.driver.set_script_timeout(TIMEOUTS['script'])
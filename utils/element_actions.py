@@ -0,0 +1,293 @@
+"""
+Single round-trip element actions
+
+`wait_and_click` used to chain two WebDriverWaits (presence, then
+visibility), a scrollIntoView script followed by a fixed half-second sleep,
+and finally the click: at least four round trips and 0.5s of dead time per
+interaction. Here one async script does the waiting inside the page:
+
+1. locate the element (first visible match)
+2. scroll it to the centre of the viewport, only if its centre is off-screen
+3. wait until it is actionable: enabled, not moving (same position on two
+   checks in a row) and, for clicks, hit-testable, i.e. the element at its
+   centre is the element itself and not an overlay or spinner
+4. for values, set it and fire input/change events
+
+Steps 1-3 re-run on every DOM mutation (and every 50ms for CSS-only changes)
+until the element qualifies or the timeout passes. Clicks are then performed
+by Selenium, so the app receives trusted input events (UCI controls ignore
+synthetic ones); `native=False` clicks from the script instead, saving that
+round trip on pages that accept it. Typing goes through Selenium for
+`native=True`, link-text locators, file inputs, contenteditable elements and
+text containing special keys. Selects are always set by option value or
+visible text; checkboxes and radios cannot be typed into (click them).
+
+Usage:
+    ElementActions.click(driver, (By.ID, 'submit'))
+    ElementActions.send_keys(driver, (By.ID, 'email'), 'test@example.com')
+"""
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, InvalidSelectorException, NoSuchElementException, TimeoutException
+)
+
+from utils.waits import SCRIPT_STRATEGIES, WaitEngine
+
+
+# Resolves with {element, native} once the action is done (or, for 'locate',
+# once the element is actionable), {element, rejected} when a value cannot be
+# typed ('no-option', 'checkbox', 'radio'), {blocked} or null after timeoutMs,
+# or {error} for a selector the browser rejects. 'type' is 'value' with the
+# typing left to Selenium
+ACT_JS = """
+var by = arguments[0], selector = arguments[1], action = arguments[2], value = arguments[3],
+    hitTest = arguments[4], timeoutMs = arguments[5], done = arguments[arguments.length - 1];
+
+var locate = function () {
+    switch (by) {
+        case 'id': return [document.getElementById(selector)].filter(Boolean);
+        case 'name': return Array.prototype.slice.call(document.getElementsByName(selector));
+        case 'class name': return Array.prototype.slice.call(document.getElementsByClassName(selector));
+        case 'tag name': return Array.prototype.slice.call(document.getElementsByTagName(selector));
+        case 'xpath':
+            var result = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var elements = [];
+            for (var i = 0; i < result.snapshotLength; i++) { elements.push(result.snapshotItem(i)); }
+            return elements;
+        default: return Array.prototype.slice.call(document.querySelectorAll(selector));
+    }
+};
+var isVisible = function (element) {
+    var style = window.getComputedStyle(element);
+    return style.display !== 'none' && style.visibility !== 'hidden'
+        && parseFloat(style.opacity) > 0 && element.getClientRects().length > 0;
+};
+var describe = function (element) {
+    var classes = typeof element.className === 'string' ? element.className.trim() : '';
+    return element.tagName.toLowerCase() + (element.id ? '#' + element.id : '')
+        + (classes ? '.' + classes.split(/\\s+/).join('.') : '');
+};
+var fire = function (element, type, init) {
+    var Kind = type.indexOf('pointer') === 0 && window.PointerEvent ? PointerEvent : MouseEvent;
+    element.dispatchEvent(type === 'input' || type === 'change'
+        ? new Event(type, {bubbles: true})
+        : new Kind(type, Object.assign({bubbles: true, cancelable: true, view: window}, init)));
+};
+
+// Why the element cannot be acted on yet ('' when it can)
+var lastRect = null;
+var blocker = function (element) {
+    if (element.disabled) { return 'disabled'; }
+    if ((action === 'value' || action === 'type') && element.readOnly) { return 'read-only'; }
+    var rect = element.getBoundingClientRect();
+    var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+    if (x < 0 || y < 0 || x > window.innerWidth || y > window.innerHeight) {
+        element.scrollIntoView({block: 'center', inline: 'center'});
+        rect = element.getBoundingClientRect();
+        x = rect.left + rect.width / 2;
+        y = rect.top + rect.height / 2;
+    }
+    var moved = !lastRect || lastRect.left !== rect.left || lastRect.top !== rect.top;
+    lastRect = rect;
+    if (moved) { return 'moving'; }
+    if (hitTest) {
+        var root = element.getRootNode().elementFromPoint ? element.getRootNode() : document;
+        var hit = root.elementFromPoint(x, y);
+        if (hit !== element && !element.contains(hit)) {
+            return hit ? 'covered by ' + describe(hit) : 'outside the viewport';
+        }
+    }
+    return '';
+};
+
+var act = function (element) {
+    if (action === 'click') {
+        var rect = element.getBoundingClientRect();
+        var point = {clientX: rect.left + rect.width / 2, clientY: rect.top + rect.height / 2};
+        fire(element, 'pointerdown', point);
+        fire(element, 'mousedown', point);
+        element.focus();
+        fire(element, 'pointerup', point);
+        fire(element, 'mouseup', point);
+        element.click();
+        return {element: element, native: false};
+    }
+    if (action !== 'value' && action !== 'type') {
+        return {element: element, native: false};
+    }
+
+    var tag = element.tagName.toLowerCase();
+    var type = (element.type || '').toLowerCase();
+    if (tag === 'input' && (type === 'checkbox' || type === 'radio')) {
+        return {element: element, rejected: type};
+    }
+    if (tag === 'select') {
+        // Selenium cannot clear a select, so it is set here even for 'type'
+        var options = Array.prototype.slice.call(element.options);
+        var option = options.filter(function (o) { return o.value === value; })[0]
+            || options.filter(function (o) { return o.text.trim() === value; })[0];
+        if (!option) { return {element: element, rejected: 'no-option'}; }
+        element.value = option.value;
+    } else if (action === 'type') {
+        return {element: element, native: true};
+    } else if ((tag === 'input' && type !== 'file') || tag === 'textarea') {
+        var prototype = tag === 'textarea' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        element.focus();
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    } else {
+        return {element: element, native: true};  // contenteditable, file inputs, ...: let Selenium type
+    }
+    fire(element, 'input');
+    fire(element, 'change');
+    return {element: element, native: false};
+};
+
+var finished = false, observer = null, poller = null, timer = null, recheck = null, reason = '';
+var finish = function (result) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    window.clearInterval(poller);
+    window.clearTimeout(timer);
+    window.clearTimeout(recheck);
+    done(result);
+};
+var check = function () {
+    if (finished) { return; }
+    var element;
+    try {
+        element = locate().filter(isVisible)[0];
+    } catch (error) {
+        finish({error: String(error)});  // Invalid selector: fail fast instead of waiting out the timeout
+        return;
+    }
+    if (!element) { return; }
+    reason = blocker(element);
+    if (!reason) {
+        finish(action === 'locate' ? {element: element, native: false} : act(element));
+    } else if (reason === 'moving' && !recheck) {
+        // Confirm the position on the next frame instead of the next poll
+        recheck = window.setTimeout(function () { recheck = null; check(); }, 20);
+    }
+};
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    poller = window.setInterval(check, 50);
+    timer = window.setTimeout(function () { finish(reason ? {blocked: reason} : null); }, timeoutMs);
+}
+"""
+
+
+class ElementActions:
+    """Locate, scroll and wait until actionable in one script call, then act"""
+
+    @staticmethod
+    def click(driver, locator, timeout=10, native=True):
+        """
+        Click an element as soon as it can receive the click
+
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            timeout: Timeout in seconds
+            native: Let Selenium perform the click (trusted input events) once
+                    the script has found the element actionable; False
+                    dispatches a synthetic pointer/mouse/click sequence from
+                    the script, for pages that do not check isTrusted
+
+        Returns:
+            WebElement: The clicked element
+
+        Raises:
+            TimeoutException: If the element did not show up or stayed disabled
+            ElementClickInterceptedException: If another element kept covering it
+        """
+        if locator[0] not in SCRIPT_STRATEGIES:
+            native = True
+        result = ElementActions._run(driver, locator, 'locate' if native else 'click', None, timeout, True)
+        if native:
+            result['element'].click()
+        return result['element']
+
+    @staticmethod
+    def send_keys(driver, locator, text, timeout=10, native=False):
+        """
+        Replace an element's value as soon as it is editable
+
+        Inputs, textareas and selects get the value through the native setter
+        followed by input/change events; other elements and text with special
+        keys (Keys.ENTER, ...) are typed by Selenium. Selects take an option
+        value or visible text, also with `native=True`.
+
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            text: Text to enter
+            timeout: Timeout in seconds
+            native: Always type with clear() and send_keys() (real key events)
+
+        Returns:
+            WebElement: The element
+
+        Raises:
+            TimeoutException: If the element did not show up or stayed disabled/read-only
+            NoSuchElementException: If a select has no option matching the text
+            ValueError: If the element is a checkbox or radio button (use click())
+        """
+        text = str(text)
+        # Selenium's special keys live in the Unicode private use area
+        if locator[0] not in SCRIPT_STRATEGIES or any('\ue000' <= char <= '\uf8ff' for char in text):
+            native = True
+        result = ElementActions._run(driver, locator, 'type' if native else 'value', text, timeout, False)
+        element = result['element']
+        if result.get('rejected') == 'no-option':
+            raise NoSuchElementException(f'No option matching the value or text {text!r} in select: {locator}')
+        if result.get('rejected'):
+            raise ValueError(f"Cannot type into a {result['rejected']} input (click it instead): {locator}")
+        if result['native']:
+            element.clear()
+            element.send_keys(text)
+        return element
+
+    @staticmethod
+    def actionable(driver, locator, timeout=10, hit_test=True):
+        """
+        Wait until an element is visible, enabled, on screen and (optionally) not covered
+
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            timeout: Timeout in seconds
+            hit_test: Also require that no other element covers its centre
+
+        Returns:
+            WebElement: The element, scrolled into view if it was off-screen
+        """
+        return ElementActions._run(driver, locator, 'locate', None, timeout, hit_test)['element']
+
+    @staticmethod
+    def _run(driver, locator, action, value, timeout, hit_test):
+        by, selector = locator
+        if by not in SCRIPT_STRATEGIES:
+            # Link text locators: the page cannot evaluate them
+            condition = 'clickable' if action in ('click', 'locate') else 'visible'
+            return {'element': WaitEngine.wait_for(driver, locator, timeout, condition), 'native': True}
+
+        result = WaitEngine.run_async(
+            driver, timeout,
+            lambda remaining: driver.execute_async_script(
+                ACT_JS, by, selector, action, value, hit_test, int(remaining * 1000)
+            )
+        )
+        if result is None:
+            raise TimeoutException(f'Element not found within {timeout}s: {locator}')
+        if 'error' in result:
+            raise InvalidSelectorException(f"{result['error']}: {locator}")
+        if 'blocked' in result:
+            if result['blocked'].startswith('covered by'):
+                raise ElementClickInterceptedException(f"Element {locator} is {result['blocked']}")
+            raise TimeoutException(f"Element {locator} still {result['blocked']} after {timeout}s")
+        return result
@@ -0,0 +1,134 @@
+"""
+Run-time selection of the target environment and the Chrome launch profile
+
+The environment (HOPE_ENV, or ENVIRONMENT in config/config.py) picks the app
+URLs the flows use from URLS, so the same test runs against another
+environment without edits once that environment defines every app in
+FLOW_APPS (currently only dev does; qa and prod only have the public site).
+The launch profile (HOPE_LAUNCH_PROFILE, or LAUNCH_PROFILES['profile'])
+adjusts CHROME_OPTIONS['args'] for the situation:
+
+- `default`        CHROME_OPTIONS as-is (HOPE_HEADLESS=1 adds --headless=new)
+- `debug-headed`   always a visible window, also under run_tests.py
+- `ci-headless`    headless without extensions, audio or scrollbars
+- `low-memory`     headless, one renderer process, smaller window, one idle driver
+
+Usage:
+    TEST_CONFIG = {'base_url': environment_url('client_portal'), ...}
+
+    HOPE_ENV=dev HOPE_LAUNCH_PROFILE=low-memory python tests/client_portal/support_ticket_test.py
+    python run_tests.py --env dev --launch-profile ci-headless
+"""
+
+import os
+
+from config.config import ENVIRONMENT, LAUNCH_PROFILES, URLS
+
+
+# Apps the flows under tests/ resolve with environment_url()
+FLOW_APPS = ('client_portal', 'dynamics', 'dynamics_app')
+
+
+def current_environment():
+    """
+    Name of the selected environment
+
+    Returns:
+        str: $HOPE_ENV or ENVIRONMENT
+
+    Raises:
+        ValueError: If the environment is not defined in URLS
+    """
+    name = os.environ.get('HOPE_ENV') or ENVIRONMENT
+    if name not in URLS:
+        raise ValueError(f"Unknown environment '{name}' (expected one of {', '.join(URLS)})")
+    return name
+
+
+def runnable_environments(apps=FLOW_APPS):
+    """
+    Environments that define a URL for every app the flows need
+
+    Args:
+        apps: App keys that must be present (defaults to FLOW_APPS)
+
+    Returns:
+        list: Environment names, sorted
+    """
+    return sorted(name for name, urls in URLS.items() if all(app in urls for app in apps))
+
+
+def environment_url(app, environment=None):
+    """
+    URL of an app in the selected environment
+
+    Args:
+        app: Key in URLS[<environment>], e.g. 'client_portal' or 'dynamics'
+        environment: Environment name (defaults to current_environment())
+
+    Returns:
+        str: URL
+
+    Raises:
+        ValueError: If the environment has no URL for the app
+    """
+    environment = environment or current_environment()
+    urls = URLS[environment]
+    if app not in urls:
+        raise ValueError(
+            f"No '{app}' URL for environment '{environment}' in URLS "
+            f"(it defines {', '.join(urls) or 'nothing'})"
+        )
+    return urls[app]
+
+
+def launch_profile(name=None):
+    """
+    Look up a launch profile
+
+    Args:
+        name: Profile name (defaults to $HOPE_LAUNCH_PROFILE or LAUNCH_PROFILES['profile'])
+
+    Returns:
+        tuple: (name, profile dict)
+
+    Raises:
+        ValueError: If the profile is not defined
+    """
+    name = name or os.environ.get('HOPE_LAUNCH_PROFILE') or LAUNCH_PROFILES['profile']
+    if name not in LAUNCH_PROFILES['profiles']:
+        raise ValueError(
+            f"Unknown launch profile '{name}' "
+            f"(expected one of {', '.join(LAUNCH_PROFILES['profiles'])})"
+        )
+    return name, LAUNCH_PROFILES['profiles'][name]
+
+
+def launch_args(base_args, profile):
+    """
+    Apply a launch profile to Chrome switches
+
+    A profile switch replaces a base switch of the same name (e.g. its
+    --window-size wins). Headless mode comes from the profile's 'headless'
+    key, or from $HOPE_HEADLESS=1 when the profile leaves it open.
+
+    Args:
+        base_args: Chrome command line switches, e.g. CHROME_OPTIONS['args']
+        profile: Profile dict from launch_profile()
+
+    Returns:
+        list: Chrome command line switches
+    """
+    overrides = {arg.split('=', 1)[0] for arg in profile.get('args', [])}
+    args = [arg for arg in base_args if arg.split('=', 1)[0] not in overrides]
+    args += profile.get('args', [])
+
+    headless = profile.get('headless')
+    if headless is None:
+        headless = os.environ.get('HOPE_HEADLESS') == '1'
+        if not headless:
+            return args  # Keep a --headless switch from the base args as it is
+    args = [arg for arg in args if not arg.startswith('--headless')]
+    if headless:
+        args.append('--headless=new')
+    return args
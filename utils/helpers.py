@@ -2,12 +2,94 @@
 Helper functions for Selenium tests
 """
 
-import os
-import time
-from datetime import datetime
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+
+# Evaluates a list of CSS selectors in the page and reports match, visibility and text
+PROBE_SELECTORS_JS = """
+var isVisible = function (element) {
+    var style = window.getComputedStyle(element);
+    return style.display !== 'none' && style.visibility !== 'hidden'
+        && parseFloat(style.opacity) > 0 && element.getClientRects().length > 0;
+};
+return arguments[0].map(function (selector) {
+    var matches;
+    try {
+        matches = Array.prototype.slice.call(document.querySelectorAll(selector));
+    } catch (error) {
+        return {selector: selector, found: false, visible: false, text: '', count: 0};
+    }
+    var visible = matches.filter(isVisible);
+    var element = visible[0] || matches[0];
+    return {
+        selector: selector,
+        found: matches.length > 0,
+        visible: visible.length > 0,
+        text: element ? (element.innerText || element.textContent || '').trim() : '',
+        count: matches.length
+    };
+});
+"""
+
+# Sets many form fields at once and fires the events a user interaction would;
+# each result's status is 'filled', 'missing' (no such element), 'no-option'
+# (select without a matching option) or 'radio-uncheck' (a checked radio given false)
+FILL_FORM_JS = """
+var locate = function (by, selector) {
+    switch (by) {
+        case 'id': return document.getElementById(selector);
+        case 'name': return document.getElementsByName(selector)[0] || null;
+        case 'class name': return document.getElementsByClassName(selector)[0] || null;
+        case 'tag name': return document.getElementsByTagName(selector)[0] || null;
+        case 'xpath': return document.evaluate(
+            selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        default: return document.querySelector(selector);
+    }
+};
+var fire = function (element, type) {
+    element.dispatchEvent(new Event(type, {bubbles: true}));
+};
+return arguments[0].map(function (field) {
+    var element = locate(field.by, field.selector);
+    if (!element) {
+        return {status: 'missing', kind: null};
+    }
+    var tag = element.tagName.toLowerCase();
+    var type = (element.type || '').toLowerCase();
+
+    if (type === 'checkbox' || type === 'radio') {
+        if (type === 'radio' && element.checked && !field.value) {
+            return {status: 'radio-uncheck', kind: type};  // Clicking a checked radio keeps it checked
+        }
+        if (element.checked !== Boolean(field.value)) {
+            element.click();
+        }
+        return {status: 'filled', kind: type};
+    }
+
+    if (tag === 'select') {
+        var options = Array.prototype.slice.call(element.options);
+        var option = options.filter(function (o) { return o.value === String(field.value); })[0]
+            || options.filter(function (o) { return o.text.trim() === String(field.value); })[0];
+        if (!option) {
+            return {status: 'no-option', kind: 'select'};
+        }
+        element.value = option.value;
+        fire(element, 'input');
+        fire(element, 'change');
+        return {status: 'filled', kind: 'select'};
+    }
+
+    var prototype = tag === 'textarea' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    element.focus();
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, String(field.value));
+    fire(element, 'input');
+    fire(element, 'change');
+    element.blur();
+    return {status: 'filled', kind: tag};
+});
+"""
 
 
 class TestHelpers:
@@ -26,41 +108,160 @@ class TestHelpers:
         Returns:
             WebElement: The found element
         """
+        from utils.waits import WaitEngine
+
         try:
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
-            WebDriverWait(driver, timeout).until(
-                EC.visibility_of(element)
-            )
-            return element
+            # One async script call; the browser resolves presence and visibility together
+            return WaitEngine.wait_for(driver, locator, timeout, condition='visible')
         except TimeoutException:
             print(f"Element not found: {locator}")
             raise
 
+    @staticmethod
+    def find_optional(driver, locator, timeout=0, visible=False, name=None):
+        """
+        Look for an element that may be absent without paying the implicit wait
+        
+        A miss costs one script round trip instead of TIMEOUTS['implicit'];
+        hits and misses are counted per probe (see utils.optional_elements).
+        
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            timeout: Seconds to keep looking (0 checks once)
+            visible: Only accept a displayed element
+            name: Probe name in the statistics (defaults to the locator value)
+            
+        Returns:
+            WebElement: The element, or None if it is absent
+        """
+        from utils.optional_elements import OptionalElements
+        return OptionalElements.default().find(driver, locator, timeout, visible, name)
+
     @staticmethod
     def take_screenshot(driver, filename):
         """
         Take a screenshot
         
+        Only the capture happens here; encoding and the disk write run on the
+        background writer of utils.screenshots.ScreenshotPipeline.
+        
         Args:
             driver: Selenium WebDriver instance
             filename: Name for the screenshot file
             
         Returns:
-            str: Path to the saved screenshot
+            str: Path the screenshot is written to
+        """
+        from utils.screenshots import ScreenshotPipeline
+        return ScreenshotPipeline.default().capture(driver, filename)
+
+    @staticmethod
+    def mark_test_failed():
+        """
+        Mark the running test as failed so buffered screenshots are kept
+        """
+        from utils.screenshots import ScreenshotPipeline
+        ScreenshotPipeline.default().mark_failed()
+
+    @staticmethod
+    def flush_screenshots(timeout=None):
+        """
+        Finish the test's screenshots and wait for them to reach the disk
+        
+        In 'buffered' mode the frames of a passing test are discarded here.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            bool: True if every screenshot was written
+        """
+        from utils.screenshots import ScreenshotPipeline
+        return ScreenshotPipeline.default().end_test(timeout)
+
+    @staticmethod
+    def probe_selectors(driver, selectors):
         """
-        screenshot_dir = os.path.join(os.path.dirname(__file__), '../screenshots')
+        Check several CSS selectors in a single round trip
         
-        # Create screenshots directory if it doesn't exist
-        os.makedirs(screenshot_dir, exist_ok=True)
+        Unlike find_element this never waits (no implicit wait on misses).
+        For each selector the first visible match is reported, falling back
+        to the first match.
+        
+        Args:
+            driver: Selenium WebDriver instance
+            selectors: List of CSS selectors
+            
+        Returns:
+            list: One dict per selector, in order, with keys
+                  'selector', 'found', 'visible', 'text' and 'count'
+        """
+        return driver.execute_script(PROBE_SELECTORS_JS, list(selectors))
 
-        timestamp = int(time.time() * 1000)
-        filepath = os.path.join(screenshot_dir, f"{filename}_{timestamp}.png")
+    @staticmethod
+    def fill_form(driver, fields, realistic_typing=None):
+        """
+        Fill a whole form in a single script execution
         
-        driver.save_screenshot(filepath)
-        print(f"Screenshot saved: {filepath}")
-        return filepath
+        Text inputs and textareas get their value through the native setter
+        followed by input/change events (so framework listeners notice);
+        checkboxes and radios are clicked when their state must change;
+        selects pick the option by value, then by visible text.
+        
+        Args:
+            driver: Selenium WebDriver instance
+            fields: Dict of {(By, value): value}; use True/False for checkboxes and radios
+            realistic_typing: Optional list of locators that need real key events;
+                              they are filled with clear() + send_keys() instead
+            
+        Returns:
+            dict: {(By, value): element tag/type} for every filled field
+            
+        Raises:
+            NoSuchElementException: If any locator did not match, or a select
+                                    has no option with the given value or text
+            ValueError: If a radio button is given False (a radio can only be
+                        unchecked by checking another one in its group), or a
+                        realistic_typing locator is not a key of fields
+        """
+        typed = set(realistic_typing or [])
+        unknown = [locator for locator in typed if locator not in fields]
+        if unknown:
+            raise ValueError(f'realistic_typing locators without a value in fields: {unknown}')
+        scripted = [(locator, value) for locator, value in fields.items() if locator not in typed]
+
+        results = driver.execute_script(FILL_FORM_JS, [
+            {'by': by, 'selector': selector, 'value': value}
+            for (by, selector), value in scripted
+        ]) if scripted else []
+
+        def with_status(status):
+            return [(locator, value) for (locator, value), result in zip(scripted, results)
+                    if result['status'] == status]
+
+        missing = with_status('missing')
+        if missing:
+            raise NoSuchElementException(f'Form fields not found: {[locator for locator, _ in missing]}')
+        no_option = with_status('no-option')
+        if no_option:
+            raise NoSuchElementException(f'No option matching the value or text in selects: {no_option}')
+        radio_uncheck = with_status('radio-uncheck')
+        if radio_uncheck:
+            raise ValueError(
+                f'Cannot uncheck radio buttons (check another one in the group): '
+                f'{[locator for locator, _ in radio_uncheck]}'
+            )
+
+        filled = {locator: result['kind'] for (locator, _), result in zip(scripted, results)}
+        for locator in typed:
+            element = driver.find_element(*locator)
+            element.clear()
+            element.send_keys(fields[locator])
+            filled[locator] = 'typed'
+
+        TestHelpers.log(f'📝 Filled {len(filled)} form field(s) ({len(typed)} typed)')
+        return filled
 
     @staticmethod
     def wait_for_page_load(driver, timeout=30):
@@ -71,70 +272,135 @@ class TestHelpers:
             driver: Selenium WebDriver instance
             timeout: Timeout in seconds
         """
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script('return document.readyState') == 'complete'
-        )
+        from utils.waits import WaitEngine
+
+        WaitEngine.wait_for_ready_state(driver, timeout)
 
     @staticmethod
     def scroll_to_element(driver, element):
         """
-        Scroll to element
+        Scroll to element, only if its centre is off-screen
+        
+        Scrolling is instant, so there is nothing to wait for afterwards. To
+        wait for an element and scroll to it in one call, use
+        utils.element_actions.ElementActions.actionable.
         
         Args:
             driver: Selenium WebDriver instance
             element: WebElement to scroll to
         """
-        driver.execute_script('arguments[0].scrollIntoView(true);', element)
-        time.sleep(0.5)  # Small delay after scroll
+        driver.execute_script("""
+            var element = arguments[0], rect = element.getBoundingClientRect();
+            var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+            if (x < 0 || y < 0 || x > window.innerWidth || y > window.innerHeight) {
+                element.scrollIntoView({block: 'center', inline: 'center'});
+            }
+        """, element)
 
     @staticmethod
-    def wait_and_click(driver, locator):
+    def wait_and_click(driver, locator, timeout=10, native=True):
         """
-        Wait and click element
+        Wait until an element can receive a click, then click it
+        
+        Locating, scrolling (only when off-screen) and the actionability and
+        overlay checks happen in one script call; Selenium then clicks (see
+        utils.element_actions).
         
         Args:
             driver: Selenium WebDriver instance
             locator: Tuple of (By, value) for element location
+            timeout: Timeout in seconds
+            native: Click through Selenium (trusted events); False clicks from
+                    the script, for pages that accept synthetic events
+            
+        Returns:
+            WebElement: The clicked element
         """
-        element = TestHelpers.wait_for_element(driver, locator)
-        TestHelpers.scroll_to_element(driver, element)
-        element.click()
+        from utils.element_actions import ElementActions
+
+        return ElementActions.click(driver, locator, timeout, native)
 
     @staticmethod
-    def wait_and_send_keys(driver, locator, text):
+    def wait_and_send_keys(driver, locator, text, timeout=10, native=False):
         """
-        Wait and send keys to element
+        Wait until an element is editable, then replace its value
         
         Args:
             driver: Selenium WebDriver instance
             locator: Tuple of (By, value) for element location
             text: Text to send
+            timeout: Timeout in seconds
+            native: Type with clear() and send_keys() (real key events) once the element is editable
+            
+        Returns:
+            WebElement: The element
+
+        Raises:
+            NoSuchElementException: If a select has no option matching the text
+            ValueError: If the element is a checkbox or radio button (click it instead)
         """
-        element = TestHelpers.wait_for_element(driver, locator)
-        TestHelpers.scroll_to_element(driver, element)
-        element.clear()
-        element.send_keys(text)
+        from utils.element_actions import ElementActions
+
+        return ElementActions.send_keys(driver, locator, text, timeout, native)
 
     @staticmethod
     def log(message):
         """
         Log test step
         
+        The record is queued for the background writer of
+        utils.test_logger.TestLogger (console and JSON Lines sinks).
+        
         Args:
             message: Log message
         """
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] {message}")
+        from utils.test_logger import TestLogger
+        TestLogger.default().info(message)
+
+    @staticmethod
+    def log_step(message):
+        """
+        Log the start of a flow step and open a new profiler step
+
+        Args:
+            message: Step banner, e.g. '🏢 Step 7: Clicking Workshop Location sidebar...'
+        """
+        from utils.profiler import StepProfiler
+        from utils.test_logger import TestLogger
+        step = message.strip(' .')
+        TestLogger.default().set_step(step)
+        TestHelpers.log(message)
+        StepProfiler.default().mark(step)
+
+    @staticmethod
+    def write_profile(flow_name):
+        """
+        Close the last step and write the step profile and the WebDriver
+        command trace (each only if enabled); also logs the optional element
+        probe statistics
+
+        Args:
+            flow_name: Name for the report files
+
+        Returns:
+            str: Path of the step profile JSON report, or None
+        """
+        from utils.command_trace import CommandTracer
+        from utils.optional_elements import OptionalElements
+        from utils.profiler import StepProfiler
+        OptionalElements.default().report()
+        CommandTracer.default().finish(flow_name)
+        return StepProfiler.default().finish(flow_name)
 
     @staticmethod
     def log_error(error):
         """
         Format error for logging
         
+        The traceback goes to the JSON Lines log when a log file is set.
+        
         Args:
             error: Exception object
         """
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] ERROR: {str(error)}")
-        import traceback
-        traceback.print_exc()
+        from utils.test_logger import TestLogger
+        TestLogger.default().error(error)
@@ -0,0 +1,235 @@
+"""
+Background dismissal of known interstitials
+
+Popups that may or may not show up (the B2C "continue" popup, the debugger
+Skip/Play buttons, the AAD "Stay signed in?" prompt) used to be handled by
+serial wait-and-maybe-click stages in every flow, each costing seconds when
+the popup was absent. The rules in INTERSTITIALS['rules'] are now enforced
+continuously instead: a MutationObserver injected into every document
+(`Page.addScriptToEvaluateOnNewDocument`) rescans the page after DOM changes
+and dismisses whatever matches, while the flow simply carries on.
+
+Each dismissal is reported through a CDP binding to BrowserEventStream (kind
+'interstitial'), so dismissals on pages the flow has already navigated away
+from are not lost. The pool installs the rules on every driver.
+
+Usage:
+    browser_events = BrowserEventStream(driver).start()
+    ...
+    Interstitials.default().report(browser_events)
+"""
+
+import json
+import threading
+from collections import Counter
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import INTERSTITIALS
+from utils.helpers import TestHelpers
+
+
+# Name of the CDP binding the page calls after each dismissal
+DISMISS_BINDING = '__hopeInterstitialDismissed'
+
+# Installs the observer once per document; %s are the rules, the binding name and the scan delay
+DISMISSER_JS = """
+(function (rules, bindingName, scanDelay) {
+    if (window.__hopeInterstitials) {
+        return;
+    }
+    var state = window.__hopeInterstitials = {dismissed: [], counts: {}};
+    var host = window.location.hostname, path = window.location.pathname.toLowerCase();
+    var active = rules.filter(function (rule) {
+        var onHost = !rule.hosts.length || rule.hosts.some(function (ruleHost) {
+            return host === ruleHost || host.slice(-ruleHost.length - 1) === '.' + ruleHost;
+        });
+        var onPath = !rule.paths.length || rule.paths.some(function (rulePath) {
+            return path.indexOf(rulePath.toLowerCase()) === 0;
+        });
+        return onHost && onPath;
+    });
+    if (!active.length) {
+        return;
+    }
+
+    var isVisible = function (element) {
+        var style = window.getComputedStyle(element);
+        return style.display !== 'none' && style.visibility !== 'hidden'
+            && parseFloat(style.opacity) > 0 && element.getClientRects().length > 0;
+    };
+    var matches = function (rule) {
+        try {
+            if (!rule.xpath) {
+                return Array.prototype.slice.call(document.querySelectorAll(rule.selector));
+            }
+            var result = document.evaluate(rule.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var elements = [];
+            for (var i = 0; i < result.snapshotLength; i++) {
+                elements.push(result.snapshotItem(i));
+            }
+            return elements;
+        } catch (error) {
+            return [];  // Invalid selector: the rule never fires
+        }
+    };
+
+    var scan = function () {
+        scheduled = false;
+        active.forEach(function (rule) {
+            if ((state.counts[rule.name] || 0) >= rule.limit) {
+                return;
+            }
+            var trigger = matches(rule).filter(function (element) {
+                return !element.hasAttribute('data-hope-dismissed') && (!rule.visible || isVisible(element));
+            })[0];
+            if (!trigger) {
+                return;
+            }
+            var target = rule.target ? document.querySelector(rule.target) : trigger;
+            if (!target && rule.action !== 'remove') {
+                return;  // Not rendered yet; the next DOM change triggers another scan
+            }
+            trigger.setAttribute('data-hope-dismissed', rule.name);
+            if (rule.check) {
+                var checkbox = document.querySelector(rule.check);
+                if (checkbox && !checkbox.checked) {
+                    checkbox.click();
+                }
+            }
+            if (rule.action === 'remove') {
+                trigger.remove();
+            } else {
+                target.click();
+            }
+            state.counts[rule.name] = (state.counts[rule.name] || 0) + 1;
+            state.dismissed.push({name: rule.name, url: window.location.href, time: Date.now()});
+            if (typeof window[bindingName] === 'function') {
+                window[bindingName](JSON.stringify({name: rule.name, url: window.location.href}));
+            }
+        });
+    };
+
+    var scheduled = false;
+    var schedule = function () {
+        if (!scheduled) {
+            scheduled = true;
+            window.setTimeout(scan, scanDelay);
+        }
+    };
+    new MutationObserver(schedule).observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style', 'hidden']
+    });
+    schedule();
+})(%s, %s, %d);
+"""
+
+
+class Interstitials:
+    """Registry of popups that are dismissed automatically in every page"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, rules=None, enabled=None):
+        """
+        Create the registry
+
+        Args:
+            rules: Dict of {name: rule} (defaults to INTERSTITIALS['rules'])
+            enabled: Whether install() does anything (defaults to INTERSTITIALS['enabled'])
+        """
+        self.enabled = INTERSTITIALS['enabled'] if enabled is None else enabled
+        self.rules = dict(INTERSTITIALS['rules'] if rules is None else rules)
+        for name, rule in self.rules.items():
+            if bool(rule.get('selector')) == bool(rule.get('xpath')):
+                raise ValueError(f"Interstitial rule '{name}' needs exactly one of 'selector' or 'xpath'")
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide registry, creating it on first use
+
+        Returns:
+            Interstitials: Shared registry
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def script(self):
+        """
+        The dismisser for the registered rules
+
+        Returns:
+            str: JavaScript source
+        """
+        rules = [{
+            'name': name,
+            'selector': rule.get('selector'),
+            'xpath': rule.get('xpath'),
+            'action': rule.get('action', 'click'),
+            'check': rule.get('check'),
+            'target': rule.get('target'),
+            'visible': rule.get('visible', True),
+            'limit': rule.get('limit', 3),
+            'hosts': rule.get('hosts', []),
+            'paths': rule.get('paths', [])
+        } for name, rule in self.rules.items()]
+        return DISMISSER_JS % (json.dumps(rules), json.dumps(DISMISS_BINDING), INTERSTITIALS['scan_delay_ms'])
+
+    def install(self, driver):
+        """
+        Enforce the rules in every document the driver loads from now on
+
+        Installing twice on the same driver is a no-op.
+
+        Args:
+            driver: Selenium WebDriver instance (Chrome)
+        """
+        if not self.enabled or not self.rules or getattr(driver, '_hope_interstitials', False):
+            return
+        source = self.script()
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+            driver.execute_script(source)  # The document that is already open
+            driver._hope_interstitials = True
+        except WebDriverException as error:
+            TestHelpers.log(f'⚠️  Could not install the interstitial dismisser: {error.msg}')
+
+    @staticmethod
+    def dismissed(driver):
+        """
+        Dismissals in the current document
+
+        Args:
+            driver: Selenium WebDriver instance
+
+        Returns:
+            list: Dicts with 'name', 'url' and 'time' (epoch milliseconds)
+        """
+        try:
+            return driver.execute_script(
+                'return window.__hopeInterstitials ? window.__hopeInterstitials.dismissed : [];'
+            ) or []
+        except WebDriverException:
+            return []
+
+    @staticmethod
+    def report(browser_events, since=None):
+        """
+        Log every dismissal the event stream saw
+
+        Args:
+            browser_events: BrowserEventStream that watched the flow
+            since: Mark name or time.monotonic() value
+
+        Returns:
+            Counter: Dismissals per rule name
+        """
+        counts = Counter(event.text for event in browser_events.events(kinds=('interstitial',), since=since))
+        if counts:
+            summary = ', '.join(f'{name} ×{count}' for name, count in counts.most_common())
+            TestHelpers.log(f'🧹 Dismissed interstitials: {summary}')
+        return counts
@@ -0,0 +1,166 @@
+"""
+Request blocking profiles
+
+Telemetry, analytics, fonts and images that no flow asserts on make up a large
+part of the Dynamics and portal load waits. A named profile from
+NETWORK_FILTERS['profiles'] is turned into CDP `Network.setBlockedURLs`
+patterns and applied to every pooled driver, so Chrome never issues those
+requests.
+
+Savings are reported from a BrowserEventStream: the number of blocked
+requests is exact; saved bytes are estimated from the sizes the same URLs had
+when they last loaded (learned from runs with the `full` profile and kept in
+NETWORK_FILTERS['size_cache']).
+
+Usage:
+    HOPE_NETWORK_PROFILE=no-media python tests/dynamics/workshop_location_test.py
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import NETWORK_FILTERS
+from utils.helpers import TestHelpers
+
+
+# Remembered resource sizes; the oldest entries are dropped beyond this
+MAX_SIZE_ENTRIES = 20000
+
+
+class NetworkFilter:
+    """Applies a blocking profile and reports what it saved"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, profile=None):
+        """
+        Create a filter for a profile
+
+        Args:
+            profile: Profile name (defaults to $HOPE_NETWORK_PROFILE or NETWORK_FILTERS['profile'])
+
+        Raises:
+            ValueError: If the profile is not defined
+        """
+        self.profile = profile or os.environ.get('HOPE_NETWORK_PROFILE', NETWORK_FILTERS['profile'])
+        if self.profile not in NETWORK_FILTERS['profiles']:
+            raise ValueError(
+                f"Unknown network profile '{self.profile}' "
+                f"(expected one of {', '.join(NETWORK_FILTERS['profiles'])})"
+            )
+        self.patterns = self.build_patterns(NETWORK_FILTERS['profiles'][self.profile])
+        self.cache_path = NETWORK_FILTERS['size_cache']
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide filter, creating it on first use
+
+        Returns:
+            NetworkFilter: Shared filter instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def build_patterns(profile):
+        """
+        Turn a profile definition into Network.setBlockedURLs patterns
+
+        Args:
+            profile: Dict with optional 'extensions', 'hosts' and 'patterns' lists
+
+        Returns:
+            list: URL patterns ('*' is the only wildcard)
+        """
+        patterns = []
+        for extension in profile.get('extensions', []):
+            patterns += [f'*.{extension}', f'*.{extension}?*']
+        for host in profile.get('hosts', []):
+            patterns += [f'*://{host}/*', f'*://*.{host}/*']
+        return patterns + list(profile.get('patterns', []))
+
+    def apply(self, driver):
+        """
+        Block the profile's URLs in a driver (a no-op for an empty profile)
+
+        Args:
+            driver: Selenium WebDriver instance (Chrome)
+        """
+        if not self.patterns:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+            TestHelpers.log(f"🚫 Network profile '{self.profile}': blocking {len(self.patterns)} URL patterns")
+        except WebDriverException as error:
+            TestHelpers.log(f"⚠️  Could not apply network profile '{self.profile}': {error.msg}")
+
+    def report(self, browser_events):
+        """
+        Log and return the requests and bytes this run saved
+
+        Also remembers the sizes of everything that loaded, so later runs with
+        a blocking profile can estimate their savings.
+
+        Args:
+            browser_events: BrowserEventStream that watched the run
+
+        Returns:
+            dict: profile, blocked request count, estimated saved bytes,
+                  blocked URLs without a known size, loaded requests and bytes
+        """
+        sizes = self._load_sizes()
+        for url, size in browser_events.transfer_sizes.items():
+            sizes.pop(url, None)  # Re-insert so recently seen URLs are kept longest
+            sizes[url] = size
+        if browser_events.transfer_sizes:
+            self._save_sizes(dict(list(sizes.items())[-MAX_SIZE_ENTRIES:]))
+
+        blocked = sum(browser_events.blocked.values())
+        saved = 0
+        unknown = 0
+        for url, count in browser_events.blocked.items():
+            if url in sizes:
+                saved += sizes[url] * count
+            else:
+                unknown += count
+
+        summary = {
+            'profile': self.profile,
+            'blocked_requests': blocked,
+            'saved_bytes': saved,
+            'unsized_requests': unknown,
+            'loaded_requests': browser_events.loaded_requests,
+            'loaded_bytes': browser_events.loaded_bytes
+        }
+        if self.patterns:
+            unsized = f', {unknown} without size history' if unknown else ''
+            TestHelpers.log(
+                f"🚫 Network profile '{self.profile}': blocked {blocked} requests "
+                f"(~{saved / 1024 / 1024:.1f} MB saved{unsized}); "
+                f"loaded {browser_events.loaded_requests} requests ({browser_events.loaded_bytes / 1024 / 1024:.1f} MB)"
+            )
+        return summary
+
+    def _load_sizes(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_sizes(self, sizes):
+        cache_dir = os.path.dirname(self.cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as cache_file:
+            json.dump(sizes, cache_file)
+        os.replace(temp_path, self.cache_path)
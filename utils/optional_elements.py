@@ -0,0 +1,162 @@
+"""
+Fast probes for optional UI
+
+Flows detect optional elements (Skip buttons, the Dynamics app tile,
+interstitial popups) with `find_element` inside `try/except
+NoSuchElementException`. With the pool's 10s implicit wait every absent
+element, which is the common case, costs 10 seconds. A probe checks for the
+element in one script execution instead, so a miss returns in milliseconds;
+with a timeout it polls that script and never touches the implicit wait.
+
+Hits and misses are counted per probe, and `report()` logs them at the end
+of a flow (TestHelpers.write_profile does this), so probes that never hit
+can be removed and probes that always hit can become required steps.
+
+Usage:
+    skip_button = TestHelpers.find_optional(driver, (By.XPATH, "//button[contains(text(), 'Skip')]"))
+    if skip_button:
+        skip_button.click()
+"""
+
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.config import TIMEOUTS, WAITS
+from utils.helpers import TestHelpers
+
+
+# Returns the first (visible) match of a locator, or null; never waits
+FIND_OPTIONAL_JS = """
+var by = arguments[0], selector = arguments[1], visibleOnly = arguments[2];
+var matches;
+try {
+    switch (by) {
+        case 'id': matches = [document.getElementById(selector)].filter(Boolean); break;
+        case 'name': matches = document.getElementsByName(selector); break;
+        case 'class name': matches = document.getElementsByClassName(selector); break;
+        case 'tag name': matches = document.getElementsByTagName(selector); break;
+        case 'xpath':
+            var result = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            matches = [];
+            for (var i = 0; i < result.snapshotLength; i++) { matches.push(result.snapshotItem(i)); }
+            break;
+        default: matches = document.querySelectorAll(selector);
+    }
+} catch (error) {
+    return null;
+}
+for (var j = 0; j < matches.length; j++) {
+    var element = matches[j];
+    if (!visibleOnly) { return element; }
+    var style = window.getComputedStyle(element);
+    if (style.display !== 'none' && style.visibility !== 'hidden'
+            && parseFloat(style.opacity) > 0 && element.getClientRects().length > 0) {
+        return element;
+    }
+}
+return null;
+"""
+
+# Locator strategies the script understands; the others fall back to find_elements
+SCRIPT_STRATEGIES = {By.ID, By.NAME, By.CLASS_NAME, By.TAG_NAME, By.XPATH, By.CSS_SELECTOR}
+
+
+class OptionalElements:
+    """Probes for elements that may legitimately be absent, with hit/miss statistics"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide prober, creating it on first use
+
+        Returns:
+            OptionalElements: Shared instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def find(self, driver, locator, timeout=0, visible=False, name=None):
+        """
+        Look for an element that may be absent, without the implicit wait
+
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            timeout: Seconds to keep looking (0 checks once)
+            visible: Only accept a displayed element
+            name: Probe name in the statistics (defaults to the locator value)
+
+        Returns:
+            WebElement: The element, or None if it did not show up in time
+        """
+        start = time.perf_counter()
+        element = self._locate(driver, locator, visible)
+        if element is None and timeout > 0:
+            try:
+                element = WebDriverWait(driver, timeout, poll_frequency=WAITS['min_poll']).until(
+                    lambda d: self._locate(d, locator, visible)
+                )
+            except TimeoutException:
+                element = None
+        self._count(name or locator[1], element is not None, time.perf_counter() - start)
+        return element
+
+    def stats(self):
+        """
+        Statistics per probe since the last report
+
+        Returns:
+            dict: {name: {'hits': int, 'misses': int, 'seconds': float}}
+        """
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._stats.items()}
+
+    def report(self):
+        """
+        Log the hit/miss statistics and start counting afresh
+
+        Returns:
+            dict: Statistics as returned by stats()
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        if stats:
+            TestHelpers.log('🔎 Optional elements (hits/misses, time spent):')
+            for name, entry in sorted(stats.items()):
+                TestHelpers.log(f"   {entry['hits']:3d}/{entry['misses']:<3d} {entry['seconds']:6.2f}s  {name}")
+        return stats
+
+    @staticmethod
+    def _locate(driver, locator, visible):
+        by, value = locator
+        if by in SCRIPT_STRATEGIES:
+            return driver.execute_script(FIND_OPTIONAL_JS, by, value, visible)
+
+        # Link text strategies: find_elements with the implicit wait briefly off
+        driver.implicitly_wait(0)
+        try:
+            matches = driver.find_elements(by, value)
+        finally:
+            driver.implicitly_wait(TIMEOUTS['implicit'])
+        if visible:
+            matches = [element for element in matches if element.is_displayed()]
+        return matches[0] if matches else None
+
+    def _count(self, name, hit, seconds):
+        with self._lock:
+            entry = self._stats.setdefault(name, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+            entry['hits' if hit else 'misses'] += 1
+            entry['seconds'] += seconds
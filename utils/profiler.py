@@ -0,0 +1,232 @@
+"""
+Per-step timing profiler
+
+Splits the wall time of every flow step into explicit sleeps, explicit waits,
+WebDriver commands and screenshot capture, plus whatever is left ("other":
+Python work, element lookups the driver answers locally, ...). Time is
+charged to the outermost category, so the polls inside a settle wait count
+as waiting and the screenshot round trip counts as screenshot, not command.
+
+Steps are opened with `TestHelpers.log_step(...)` (each call closes the
+previous step) or the `step()` context manager. `finish()` writes a JSON
+report and a collapsed-stack file for flamegraph.pl / speedscope:
+
+    profiles/workshop_location_test-20250101-120000.json
+    profiles/workshop_location_test-20250101-120000.folded
+
+Profiling is off unless PROFILER['enabled'] is set or HOPE_PROFILE=1; when
+off, steps are only logged and nothing is patched.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from config.config import PROFILER
+
+
+CATEGORIES = ('sleep', 'wait', 'command', 'screenshot')
+
+_real_sleep = time.sleep
+
+
+class StepProfiler:
+    """Records where the time of each flow step goes"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, directory=None, enabled=None):
+        """
+        Create a profiler
+
+        Args:
+            directory: Report directory (defaults to $HOPE_PROFILE_DIR or PROFILER['path'])
+            enabled: Force profiling on or off (defaults to PROFILER['enabled'] or $HOPE_PROFILE)
+        """
+        if enabled is None:
+            enabled = PROFILER['enabled'] or os.environ.get('HOPE_PROFILE') == '1'
+        self.enabled = enabled
+        self.directory = directory or os.environ.get('HOPE_PROFILE_DIR', PROFILER['path'])
+        self.steps = []
+        self._current = None
+        self._owner = None
+        self._depth = 0
+        self._started = None
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide profiler, creating it (and its hooks) on first use
+
+        Returns:
+            StepProfiler: Shared profiler instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                if cls._default.enabled:
+                    _install_hooks()
+            return cls._default
+
+    def mark(self, name):
+        """
+        Close the running step (if any) and start a new one
+
+        Args:
+            name: Step name, e.g. 'Step 7: Clicking Workshop Location sidebar'
+        """
+        if not self.enabled:
+            return
+        self._close_step()
+        if self._started is None:
+            self._started = time.perf_counter()
+        self._owner = threading.get_ident()
+        self._current = {
+            'name': name,
+            'start': time.perf_counter(),
+            'commands': 0,
+            **{category: 0.0 for category in CATEGORIES}
+        }
+
+    @contextmanager
+    def step(self, name):
+        """
+        Profile a block as one step
+
+        Args:
+            name: Step name
+        """
+        self.mark(name)
+        try:
+            yield
+        finally:
+            self._close_step()
+
+    @contextmanager
+    def track(self, category):
+        """
+        Charge the time spent in a block to a category of the running step
+
+        Nested blocks are not counted separately: the outermost category wins.
+
+        Args:
+            category: One of CATEGORIES
+        """
+        if self._current is None or self._owner != threading.get_ident() or self._depth:
+            yield
+            return
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            current = self._current
+            if current is not None:
+                current[category] += time.perf_counter() - start
+                if category == 'command':
+                    current['commands'] += 1
+
+    def finish(self, flow_name):
+        """
+        Close the running step and write the report files
+
+        Args:
+            flow_name: Name used for the report files and the flame graph root
+
+        Returns:
+            str: Path of the JSON report (None if profiling is off or no step ran)
+        """
+        self._close_step()
+        steps, self.steps = self.steps, []
+        started, self._started = self._started, None
+        if not self.enabled or not steps:
+            return None
+
+        totals = {category: sum(step[category] for step in steps) for category in CATEGORIES}
+        totals['other'] = sum(step['other'] for step in steps)
+        totals['commands'] = sum(step['commands'] for step in steps)
+        report = {
+            'flow': flow_name,
+            'finished_at': datetime.now().isoformat(),
+            'wall': time.perf_counter() - started,
+            'totals': totals,
+            'steps': steps
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{flow_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        with open(f'{base}.json', 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        with open(f'{base}.folded', 'w', encoding='utf-8') as folded_file:
+            folded_file.write(self._collapsed_stacks(flow_name, steps))
+
+        self._print_summary(report)
+        return f'{base}.json'
+
+    def _close_step(self):
+        current, self._current = self._current, None
+        if current is None:
+            return
+        wall = time.perf_counter() - current.pop('start')
+        current['wall'] = wall
+        current['other'] = max(0.0, wall - sum(current[category] for category in CATEGORIES))
+        self.steps.append(current)
+
+    @staticmethod
+    def _collapsed_stacks(flow_name, steps):
+        """One `flow;step;category microseconds` line per non-zero bucket"""
+        lines = []
+        for step in steps:
+            # ';' separates frames in the folded format
+            step_name = step['name'].replace(';', ',')
+            for category in CATEGORIES + ('other',):
+                microseconds = int(step[category] * 1_000_000)
+                if microseconds:
+                    lines.append(f'{flow_name};{step_name};{category} {microseconds}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _print_summary(report):
+        print(f"\n⏱️  Step profile for {report['flow']} ({report['wall']:.1f}s)")
+        for step in report['steps']:
+            buckets = CATEGORIES + ('other',)
+            top = max(buckets, key=lambda category: step[category])
+            share = step[top] / step['wall'] * 100 if step['wall'] else 0
+            print(f"   {step['wall']:7.2f}s  {share:3.0f}% {top:<10} {step['name']}")
+
+
+def profiled(category):
+    """
+    Decorator charging a function's time to a profiler category
+
+    Args:
+        category: One of CATEGORIES
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = StepProfiler._default
+            if profiler is None or not profiler.enabled:
+                return function(*args, **kwargs)
+            with profiler.track(category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _install_hooks():
+    """Route time.sleep, WebDriverWait and WebDriver commands through the profiler"""
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    time.sleep = profiled('sleep')(_real_sleep)
+    WebDriver.execute = profiled('command')(WebDriver.execute)
+    WebDriverWait.until = profiled('wait')(WebDriverWait.until)
+    WebDriverWait.until_not = profiled('wait')(WebDriverWait.until_not)
@@ -0,0 +1,254 @@
+"""
+App-aware readiness probes
+
+`wait_until_settled` infers readiness from the outside (DOM quiet, no
+requests in flight), which either waits out the quiet period or, on apps that
+keep polling in the background, the whole timeout. The apps themselves know
+when they are idle. A probe asks them:
+
+- `dynamics`   Unified Interface: `UCWorkBlockTracker.isAppIdle()` and, on a
+               form, the Xrm form data loaded
+- `jquery`     jQuery portals: DOM-ready handlers run and `jQuery.active === 0`
+
+On top of the probes every wait checks that the document is loaded and that no
+XHR/fetch request is in flight. The request monitor is installed at document
+start by the pool, so requests the page fires while loading are counted too.
+
+The whole wait is one async script call: the probes run inside the page every
+READINESS['poll_ms'] and the wait returns once they have all reported idle for
+READINESS['stable_ms'] (UCI goes briefly idle between chained loads).
+
+Usage:
+    save_close_button.click()
+    WaitEngine.wait_for_app_idle(driver, 15, apps=['dynamics'])
+
+    ReadinessProbes.default().register(
+        'angular', detect='return !!window.getAllAngularTestabilities;',
+        busy="return getAllAngularTestabilities().every(function (t) { return t.isStable(); }) ? '' : 'zone busy';"
+    )
+"""
+
+import json
+import threading
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import READINESS
+from utils.helpers import TestHelpers
+from utils.waits import SETTLE_STATUS_JS, WaitEngine
+
+
+IdleResult = namedtuple('IdleResult', ['idle', 'waited', 'apps', 'reasons'])
+
+# Built-in probes: `detect` returns whether the app is on the page, `busy`
+# returns why it is not idle ('' when it is); both are JavaScript function bodies
+BUILTIN_PROBES = {
+    'dynamics': {
+        'detect': "return typeof window.Xrm !== 'undefined' || typeof window.UCWorkBlockTracker !== 'undefined';",
+        'busy': """
+            if (typeof window.UCWorkBlockTracker !== 'undefined'
+                    && typeof UCWorkBlockTracker.isAppIdle === 'function' && !UCWorkBlockTracker.isAppIdle()) {
+                return 'UCI work pending';
+            }
+            var page = window.Xrm && Xrm.Page;
+            if (page && page.ui && typeof page.ui.getFormType === 'function'
+                    && !(page.data && page.data.entity)) {
+                return 'form data loading';
+            }
+            return '';
+        """
+    },
+    'jquery': {
+        'detect': "return typeof window.jQuery === 'function';",
+        'busy': """
+            if (!jQuery.isReady) {
+                return 'DOM ready handlers pending';
+            }
+            return jQuery.active > 0 ? jQuery.active + ' jQuery requests pending' : '';
+        """
+    }
+}
+
+# Resolves with {idle, apps, reasons}; %s is the probe list
+WAIT_FOR_IDLE_JS = """
+var required = arguments[0], pollMs = arguments[1], stableMs = arguments[2], timeoutMs = arguments[3],
+    done = arguments[arguments.length - 1];
+var probes = %s;
+
+var finished = false, idleSince = null, apps = [], reasons = ['not checked yet'];
+var poller = null, timer = null;
+var finish = function (idle) {
+    if (finished) { return; }
+    finished = true;
+    window.clearInterval(poller);
+    window.clearTimeout(timer);
+    done({idle: idle, apps: apps, reasons: idle ? [] : reasons});
+};
+var check = function () {
+    var busy = [], found = [];
+    if (document.readyState !== 'complete') {
+        busy.push('document ' + document.readyState);
+    }
+    if (window.__hopeSettle && window.__hopeSettle.pending > 0) {
+        busy.push(window.__hopeSettle.pending + ' requests in flight');
+    }
+    probes.forEach(function (probe) {
+        var detected = false;
+        try { detected = probe.detect(); } catch (error) { detected = false; }
+        if (!detected) {
+            if (required.indexOf(probe.name) !== -1) { busy.push(probe.name + ' not loaded'); }
+            return;
+        }
+        found.push(probe.name);
+        var reason;
+        try { reason = probe.busy(); } catch (error) { reason = String(error); }
+        if (reason) { busy.push(probe.name + ': ' + reason); }
+    });
+    apps = found;
+    reasons = busy;
+
+    var now = performance.now();
+    if (busy.length) {
+        idleSince = null;
+    } else if (idleSince === null) {
+        idleSince = now;
+    }
+    if (idleSince !== null && now - idleSince >= stableMs) {
+        finish(true);
+    }
+};
+
+check();
+if (!finished) {
+    poller = window.setInterval(check, pollMs);
+    timer = window.setTimeout(function () { finish(false); }, timeoutMs);
+}
+"""
+
+
+class ReadinessProbes:
+    """Registry of in-page probes that tell when an app is idle"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, probes=None):
+        """
+        Create the registry
+
+        Args:
+            probes: Dict of {name: {'detect': js, 'busy': js}} (defaults to BUILTIN_PROBES)
+        """
+        self.probes = dict(BUILTIN_PROBES if probes is None else probes)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide registry, creating it on first use
+
+        Returns:
+            ReadinessProbes: Shared registry
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def register(self, name, detect, busy):
+        """
+        Add or replace a probe
+
+        Args:
+            name: Probe name, used by wait_for_idle(apps=[...])
+            detect: JavaScript function body returning whether the app is on the page
+            busy: JavaScript function body returning why the app is busy ('' when idle)
+        """
+        with self._lock:
+            self.probes[name] = {'detect': detect, 'busy': busy}
+
+    def script(self, names=None):
+        """
+        The idle wait for some or all of the registered probes
+
+        Args:
+            names: Probe names (defaults to every probe)
+
+        Returns:
+            str: JavaScript source for execute_async_script
+        """
+        with self._lock:
+            probes = dict(self.probes)
+        names = list(probes) if names is None else names
+        unknown = [name for name in names if name not in probes]
+        if unknown:
+            raise ValueError(f"Unknown readiness probe(s): {', '.join(unknown)} (expected one of {', '.join(probes)})")
+        entries = ',\n'.join(
+            f"{{name: {json.dumps(name)}, detect: function () {{ {probes[name]['detect']} }}, "
+            f"busy: function () {{ {probes[name]['busy']} }}}}"
+            for name in names
+        )
+        return WAIT_FOR_IDLE_JS % f'[{entries}]'
+
+    @staticmethod
+    def install(driver):
+        """
+        Count XHR/fetch requests from the start of every document the driver loads
+
+        Installing twice on the same driver is a no-op.
+
+        Args:
+            driver: Selenium WebDriver instance (Chrome)
+        """
+        if getattr(driver, '_hope_request_monitor', False):
+            return
+        try:
+            driver.execute_cdp_cmd(
+                'Page.addScriptToEvaluateOnNewDocument', {'source': f'(function () {{ {SETTLE_STATUS_JS} }})();'}
+            )
+            driver._hope_request_monitor = True
+        except WebDriverException as error:
+            TestHelpers.log(f'⚠️  Could not install the request monitor: {error.msg}')
+
+    def wait_for_idle(self, driver, timeout=30, apps=None, label=None):
+        """
+        Wait until the page and the apps on it report idle, up to `timeout` seconds
+
+        Never raises on timeout, like wait_until_settled: the flow carries on
+        and the next explicit wait decides. The log line says what was still busy.
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout: Maximum seconds to wait
+            apps: Probe names that must be present and idle; when None every
+                  registered probe whose app is detected on the page is used
+            label: Optional text for the log line
+
+        Returns:
+            IdleResult: idle flag, seconds waited, detected apps and what was still busy
+        """
+        script = self.script(apps)
+        required = list(apps or [])
+        start = time.monotonic()
+        last = {'idle': False, 'apps': [], 'reasons': ['page navigating']}
+
+        def call(remaining):
+            result = driver.execute_async_script(
+                script, required, READINESS['poll_ms'], READINESS['stable_ms'], int(remaining * 1000)
+            )
+            last.update(result)
+            return result if result['idle'] else None
+
+        result = WaitEngine.run_async(driver, timeout, call) or last
+        waited = time.monotonic() - start
+        apps_found = ', '.join(result['apps']) or 'no app probes'
+        description = f', {label}' if label else ''
+        if result['idle']:
+            TestHelpers.log(f'⏱️  App idle after {waited:.2f}s of max {timeout}s ({apps_found}{description})')
+        else:
+            TestHelpers.log(
+                f"⏱️  App still busy after {waited:.2f}s, continuing ({'; '.join(result['reasons'])}{description})"
+            )
+        return IdleResult(bool(result['idle']), waited, result['apps'], result['reasons'])
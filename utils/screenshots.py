@@ -0,0 +1,269 @@
+"""
+Asynchronous screenshot pipeline
+
+`capture` only grabs the base64 screenshot from the browser; decoding,
+optional downscaling / JPEG or WebP re-encoding and the disk write happen on
+a background writer thread fed by a bounded queue. The flow step therefore
+only pays for the WebDriver round trip. Call `mark_failed()` when a test
+fails and `end_test()` when it finishes to wait for pending writes.
+
+With SCREENSHOTS['mode'] = 'buffered' step screenshots stay in a bounded
+in-memory ring buffer (last SCREENSHOTS['buffer_frames'] frames or
+SCREENSHOTS['buffer_mb'] megabytes) and only reach the disk when the test
+fails (and SCREENSHOTS['on_failure'] is set) or the run is marked for
+retention, so green runs do almost no artifact I/O.
+
+Re-encoding and downscaling need Pillow; without it screenshots are written
+as the PNG the browser returned.
+"""
+
+import atexit
+import base64
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+from config.config import SCREENSHOTS
+from utils.helpers import TestHelpers
+from utils.profiler import profiled
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional
+    Image = None
+
+
+ScreenshotTiming = namedtuple('ScreenshotTiming', ['name', 'path', 'capture', 'write'])
+
+EXTENSIONS = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp'}
+
+
+class ScreenshotPipeline:
+    """Captures screenshots synchronously and writes them on a background thread"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, directory=None, image_format=None, quality=None, max_width=None, queue_size=None):
+        """
+        Create a pipeline
+
+        Args:
+            directory: Output directory (defaults to $HOPE_SCREENSHOT_DIR or SCREENSHOTS['path'],
+                       relative to the repository root)
+            image_format: 'png', 'jpeg' or 'webp'
+            quality: JPEG/WebP quality (1-100)
+            max_width: Downscale wider screenshots to this width (None keeps the size)
+            queue_size: Maximum pending writes before capture blocks
+        """
+        self.directory = directory or os.environ.get(
+            'HOPE_SCREENSHOT_DIR', os.path.normpath(os.path.join(os.path.dirname(__file__), '..', SCREENSHOTS['path']))
+        )
+        self.image_format = (image_format or SCREENSHOTS['format']).lower()
+        self.quality = SCREENSHOTS['quality'] if quality is None else quality
+        self.max_width = SCREENSHOTS['max_width'] if max_width is None else max_width
+
+        if self.image_format not in EXTENSIONS:
+            raise ValueError(f'Unsupported screenshot format: {self.image_format}')
+        if Image is None and (self.image_format != 'png' or self.max_width):
+            TestHelpers.log('⚠️  Pillow not installed, writing screenshots as plain PNG')
+            self.image_format, self.max_width = 'png', None
+
+        self.mode = os.environ.get('HOPE_SCREENSHOT_MODE', SCREENSHOTS['mode'])
+        self.buffer_frames = SCREENSHOTS['buffer_frames']
+        self.buffer_bytes = int(SCREENSHOTS['buffer_mb'] * 1024 * 1024)
+        self._buffer = deque()
+        self._buffered_bytes = 0
+        self._failed = False
+        self._retained = os.environ.get('HOPE_RETAIN_SCREENSHOTS') == '1'
+
+        self.timings = []               # Capture/write times of the current test (reset by end_test)
+        self._timing_index = {}
+        self._queue = queue.Queue(maxsize=queue_size or SCREENSHOTS['queue_size'])
+        self._lock = threading.Lock()
+        self._writer = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide pipeline, creating it on first use
+
+        Returns:
+            ScreenshotPipeline: Shared pipeline instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                atexit.register(cls._default.flush)
+            return cls._default
+
+    @profiled('screenshot')
+    def capture(self, driver, name):
+        """
+        Grab a screenshot and queue it for writing
+
+        Args:
+            driver: Selenium WebDriver instance
+            name: Name for the screenshot file
+
+        Returns:
+            str: Path the screenshot will be written to (None if screenshots are disabled)
+        """
+        if not SCREENSHOTS['enabled']:
+            return None
+
+        start = time.perf_counter()
+        payload = driver.get_screenshot_as_base64()
+        capture_time = time.perf_counter() - start
+
+        timestamp = int(time.time() * 1000)
+        path = os.path.join(self.directory, f'{name}_{timestamp}.{EXTENSIONS[self.image_format]}')
+        self._record(name, path, capture_time)
+
+        if self._is_buffering():
+            self._buffer_frame(path, payload)
+        else:
+            self._enqueue(path, payload)
+        return path
+
+    def mark_failed(self):
+        """Mark the current test as failed: write the buffered lead-up to disk"""
+        self._failed = True
+        if SCREENSHOTS['on_failure']:
+            self._drain_buffer()
+
+    def retain(self):
+        """Keep every screenshot of the current test, even if it passes"""
+        self._retained = True
+        self._drain_buffer()
+
+    def end_test(self, timeout=None):
+        """
+        Finish the current test: drop buffered frames of a green run, wait
+        for pending writes and start the next test's timings afresh
+
+        Args:
+            timeout: Maximum seconds to wait for writes (None waits indefinitely)
+
+        Returns:
+            bool: True if every queued screenshot was written
+        """
+        with self._lock:
+            dropped = len(self._buffer)
+            for path, _ in self._buffer:
+                self._timing_index.pop(path, None)
+            self._buffer.clear()
+            self._buffered_bytes = 0
+        if dropped:
+            TestHelpers.log(f'🗑️  Discarded {dropped} buffered screenshot(s) of a passing test')
+
+        self._failed = False
+        self._retained = os.environ.get('HOPE_RETAIN_SCREENSHOTS') == '1'
+        written = self.flush(timeout)
+        with self._lock:
+            # Workers run many flows: keep only the current test's timings.
+            # A write still pending after a timeout finds no index and is skipped
+            self.timings = []
+            self._timing_index = {}
+        return written
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued screenshot is on disk
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if the queue drained in time
+        """
+        if self._writer is None:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _is_buffering(self):
+        if self.mode != 'buffered' or self._retained:
+            return False
+        # After a failure the remaining (error) screenshots go straight to disk
+        return not (self._failed and SCREENSHOTS['on_failure'])
+
+    def _buffer_frame(self, path, payload):
+        with self._lock:
+            self._buffer.append((path, payload))
+            self._buffered_bytes += len(payload)
+            while self._buffer and (
+                len(self._buffer) > self.buffer_frames or self._buffered_bytes > self.buffer_bytes
+            ):
+                evicted_path, evicted = self._buffer.popleft()
+                self._buffered_bytes -= len(evicted)
+                self._timing_index.pop(evicted_path, None)
+
+    def _drain_buffer(self):
+        with self._lock:
+            frames = list(self._buffer)
+            self._buffer.clear()
+            self._buffered_bytes = 0
+        for path, payload in frames:
+            self._enqueue(path, payload)
+
+    def _record(self, name, path, capture_time):
+        with self._lock:
+            self._timing_index[path] = len(self.timings)
+            self.timings.append(ScreenshotTiming(name, path, capture_time, None))
+
+    def _enqueue(self, path, payload):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name='screenshot-writer', daemon=True
+                )
+                self._writer.start()
+        # Blocks when the queue is full, so a slow disk cannot eat unbounded memory
+        self._queue.put((path, payload))
+
+    def _write_loop(self):
+        while True:
+            path, payload = self._queue.get()
+            start = time.perf_counter()
+            try:
+                self._write(path, base64.b64decode(payload))
+                TestHelpers.log(f'Screenshot saved: {path}')
+            except Exception as error:
+                TestHelpers.log(f'Failed to write screenshot {path}: {error}')
+            finally:
+                write_time = time.perf_counter() - start
+                with self._lock:
+                    index = self._timing_index.pop(path, None)
+                    if index is not None:
+                        self.timings[index] = self.timings[index]._replace(write=write_time)
+                self._queue.task_done()
+
+    def _write(self, path, png_bytes):
+        if self.image_format == 'png' and not self.max_width:
+            with open(path, 'wb') as image_file:
+                image_file.write(png_bytes)
+            return
+
+        image = Image.open(io.BytesIO(png_bytes))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+
+        if self.image_format == 'jpeg':
+            image.convert('RGB').save(path, 'JPEG', quality=self.quality)
+        elif self.image_format == 'webp':
+            image.save(path, 'WEBP', quality=self.quality)
+        else:
+            image.save(path, 'PNG', optimize=False)
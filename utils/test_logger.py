@@ -0,0 +1,210 @@
+"""
+Structured, queue-backed test logging
+
+`TestHelpers.log` used to `print` (and flush) every line from the calling
+thread, so parallel workers interleaved and the flow paid for console I/O.
+Records now go through a `logging.handlers.QueueHandler`; a background
+`QueueListener` formats and writes them to:
+
+- the console, in the familiar "[timestamp] message" form
+- a JSON Lines file (when LOGGING['path'] or $HOPE_LOG_FILE is set; the
+  parallel runner gives every worker its own)
+
+Every record carries the test id, the current step, seconds elapsed since
+the test started, a monotonic timestamp and the worker id:
+
+    {"time": "2025-01-01T12:00:00.123456", "monotonic": 8123.52, "level": "INFO",
+     "worker": 2, "test": "tests/dynamics/workshop_location_test.py",
+     "step": "Step 7: Clicking Workshop Location sidebar", "elapsed": 41.87,
+     "message": "✅ Found Workshop Location in sidebar"}
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from config.config import LOGGING
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Console sink that follows sys.stdout (the runner redirects it per worker)"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Human-readable "[ISO timestamp] message" lines"""
+
+    def format(self, record):
+        timestamp = datetime.fromtimestamp(record.created).isoformat()
+        prefix = 'ERROR: ' if record.levelno >= logging.ERROR else ''
+        return f'[{timestamp}] {prefix}{record.getMessage()}'
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(),
+            'monotonic': record.monotonic,
+            'level': record.levelname,
+            'worker': record.worker,
+            'test': record.test,
+            'step': record.step,
+            'elapsed': record.elapsed,
+            'message': record.getMessage()
+        }
+        if record.error_traceback:
+            entry['traceback'] = record.error_traceback
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TestLogger:
+    """Process-wide structured logger with a background writer"""
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, log_path=None, console=None):
+        """
+        Create the logger and start its background listener
+
+        Args:
+            log_path: JSON Lines file (defaults to $HOPE_LOG_FILE or LOGGING['path'];
+                      None disables the file sink)
+            console: Whether to keep the console sink (defaults to LOGGING['console'])
+        """
+        self.log_path = log_path or os.environ.get('HOPE_LOG_FILE') or LOGGING['path']
+        self.console = LOGGING['console'] if console is None else console
+        self.worker = int(os.environ.get('HOPE_WORKER_ID', '0'))
+        self.test = os.path.basename(sys.argv[0]) or None
+        self.step = None
+        self._test_started = time.monotonic()
+
+        sinks = []
+        if self.console:
+            console_sink = _StdoutHandler()
+            console_sink.setFormatter(ConsoleFormatter())
+            sinks.append(console_sink)
+        if self.log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            file_sink = logging.FileHandler(self.log_path, encoding='utf-8')
+            file_sink.setFormatter(JsonLinesFormatter())
+            sinks.append(file_sink)
+
+        # Unbounded: logging must never block or drop a flow's records
+        self._queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._queue, *sinks, respect_handler_level=False)
+        self._listener.start()
+        self._running = True
+
+        self._logger = logging.getLogger(f'hope.{id(self)}')
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+
+    @classmethod
+    def default(cls):
+        """
+        Get the process-wide logger, creating it on first use
+
+        Returns:
+            TestLogger: Shared logger instance
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+                atexit.register(cls._default.shutdown)
+            return cls._default
+
+    def start_test(self, test_id):
+        """
+        Tag the following records with a new test and restart the elapsed clock
+
+        Args:
+            test_id: Test identifier, e.g. the flow path
+        """
+        self.test = test_id
+        self.step = None
+        self._test_started = time.monotonic()
+
+    def set_step(self, step):
+        """
+        Tag the following records with a step
+
+        Args:
+            step: Step name
+        """
+        self.step = step
+
+    def info(self, message):
+        """
+        Log a message
+
+        Args:
+            message: Log message
+        """
+        self._emit(logging.INFO, message, None)
+
+    def error(self, error):
+        """
+        Log an error; the traceback goes to the JSON Lines sink (or the
+        console when there is no file sink)
+
+        Args:
+            error: Exception object (or message)
+        """
+        error_traceback = None
+        if isinstance(error, BaseException) and error.__traceback__ is not None:
+            error_traceback = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+        message = str(error)
+        if error_traceback and not self.log_path:
+            # No JSON Lines sink to hold the traceback: keep it on the console
+            message = f'{message}\n{error_traceback.rstrip()}'
+        self._emit(logging.ERROR, message, error_traceback)
+
+    def flush(self):
+        """Wait until every queued record has been written"""
+        if self._running:
+            # stop() drains the queue before returning
+            self._listener.stop()
+            self._listener.start()
+
+    def shutdown(self):
+        """Write the remaining records and stop the background listener"""
+        if self._running:
+            self._running = False
+            self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+
+    def _emit(self, level, message, error_traceback):
+        if not self._running:
+            # Late records (other atexit handlers) after shutdown go straight to stdout
+            prefix = 'ERROR: ' if level >= logging.ERROR else ''
+            print(f'[{datetime.now().isoformat()}] {prefix}{message}')
+            return
+        now = time.monotonic()
+        self._logger.log(level, message, extra={
+            'monotonic': round(now, 6),
+            'worker': self.worker,
+            'test': self.test,
+            'step': self.step,
+            'elapsed': round(now - self._test_started, 3),
+            'error_traceback': error_traceback
+        })
@@ -0,0 +1,399 @@
+"""
+Condition-based waiting engine
+
+Replaces fixed `time.sleep` calls with "wait until settled, up to N seconds".
+A small monitor is injected into the page that records the last DOM mutation
+and counts in-flight XHR/fetch requests. The page is considered settled when
+the document is loaded, no requests are pending and the DOM has been quiet
+for a short period. Polling is adaptive: it sleeps exactly as long as the
+remaining quiet period needs and backs off while the page is busy.
+
+Element and ready-state waits are push-based: instead of a WebDriverWait
+polling over HTTP every 500ms, one `execute_async_script` call blocks while a
+MutationObserver in the page resolves the condition the moment the DOM
+changes. One round trip per wait (per navigation, if the page navigates).
+`wait_for_app_idle` asks the app itself (see utils/readiness.py).
+"""
+
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import (
+    InvalidSelectorException, JavascriptException, NoSuchWindowException, StaleElementReferenceException,
+    TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.config import TIMEOUTS, WAITS
+from utils.helpers import TestHelpers
+from utils.profiler import profiled
+
+
+WaitResult = namedtuple('WaitResult', ['settled', 'waited', 'polls'])
+
+
+# Installs the monitor once per document and returns the current page state
+SETTLE_STATUS_JS = """
+if (!window.__hopeSettle) {
+    var monitor = {pending: 0, sent: 0, lastActivity: performance.now()};
+    var touch = function () { monitor.lastActivity = performance.now(); };
+
+    new MutationObserver(touch).observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        monitor.pending++;
+        monitor.sent++;
+        touch();
+        this.addEventListener('loadend', function () { monitor.pending--; touch(); });
+        return originalSend.apply(this, arguments);
+    };
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            monitor.pending++;
+            monitor.sent++;
+            touch();
+            return originalFetch.apply(this, arguments).finally(function () {
+                monitor.pending--;
+                touch();
+            });
+        };
+    }
+
+    window.__hopeSettle = monitor;
+}
+return {
+    readyState: document.readyState,
+    pending: window.__hopeSettle.pending,
+    sent: window.__hopeSettle.sent,
+    document: performance.timeOrigin,
+    quietFor: (performance.now() - window.__hopeSettle.lastActivity) / 1000
+};
+"""
+
+# Resolves with the first element matching the condition, null after timeoutMs,
+# or {error} for a selector the browser rejects
+WAIT_FOR_ELEMENT_JS = """
+var by = arguments[0], selector = arguments[1], condition = arguments[2],
+    expected = arguments[3], attribute = arguments[4], timeoutMs = arguments[5],
+    done = arguments[arguments.length - 1];
+
+var locate = function () {
+    switch (by) {
+        case 'id': return [document.getElementById(selector)].filter(Boolean);
+        case 'name': return Array.prototype.slice.call(document.getElementsByName(selector));
+        case 'class name': return Array.prototype.slice.call(document.getElementsByClassName(selector));
+        case 'tag name': return Array.prototype.slice.call(document.getElementsByTagName(selector));
+        case 'xpath':
+            var result = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var elements = [];
+            for (var i = 0; i < result.snapshotLength; i++) { elements.push(result.snapshotItem(i)); }
+            return elements;
+        default: return Array.prototype.slice.call(document.querySelectorAll(selector));
+    }
+};
+var isVisible = function (element) {
+    var style = window.getComputedStyle(element);
+    return style.display !== 'none' && style.visibility !== 'hidden'
+        && parseFloat(style.opacity) > 0 && element.getClientRects().length > 0;
+};
+var matches = function (element) {
+    switch (condition) {
+        case 'present': return true;
+        case 'clickable': return isVisible(element) && !element.disabled;
+        case 'text': return isVisible(element)
+            && (element.innerText || element.textContent || '').indexOf(expected) !== -1;
+        case 'attribute': return expected === null
+            ? element.hasAttribute(attribute) : element.getAttribute(attribute) === expected;
+        default: return isVisible(element);
+    }
+};
+
+var finished = false, observer = null, poller = null, timer = null;
+var finish = function (element) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    window.clearInterval(poller);
+    window.clearTimeout(timer);
+    done(element);
+};
+var check = function () {
+    try {
+        var found = locate().filter(matches)[0];
+        if (found) { finish(found); }
+    } catch (error) {
+        finish({error: String(error)});  // Invalid selector: fail fast instead of waiting out the timeout
+    }
+};
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    // Visibility can also change without a mutation (stylesheets, layout)
+    poller = window.setInterval(check, 100);
+    timer = window.setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+# Resolves with the ready state once it reaches 'complete', or after timeoutMs
+WAIT_FOR_READY_JS = """
+var timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+if (document.readyState === 'complete') {
+    done('complete');
+} else {
+    var timer = window.setTimeout(function () { done(document.readyState); }, timeoutMs);
+    window.addEventListener('load', function () {
+        window.clearTimeout(timer);
+        done('complete');
+    });
+}
+"""
+
+# Locator strategies the in-page scripts understand
+SCRIPT_STRATEGIES = {By.ID, By.NAME, By.CLASS_NAME, By.TAG_NAME, By.XPATH, By.CSS_SELECTOR}
+
+# JavascriptException messages that mean the document was replaced mid-script
+NAVIGATION_ERRORS = (
+    'document unloaded',
+    'execution context was destroyed',
+    'cannot find context with specified id'
+)
+
+# WebDriverWait fallbacks for locators the scripts cannot evaluate
+FALLBACK_CONDITIONS = {
+    'present': EC.presence_of_element_located,
+    'visible': EC.visibility_of_element_located,
+    'clickable': EC.element_to_be_clickable
+}
+
+
+class WaitEngine:
+    """Waits that return as soon as the page is ready"""
+
+    @staticmethod
+    def page_status(driver):
+        """
+        Read the settle monitor state, installing it if needed
+
+        Args:
+            driver: Selenium WebDriver instance
+
+        Returns:
+            dict: readyState, pending and sent request counts, the document's
+                  time origin and seconds since last activity, or None while
+                  the page is navigating
+        """
+        try:
+            return driver.execute_script(SETTLE_STATUS_JS)
+        except WebDriverException:
+            # Document is being replaced (navigation in progress)
+            return None
+
+    @staticmethod
+    @profiled('wait')
+    def wait_until_settled(driver, timeout, quiet_period=None, label=None):
+        """
+        Wait until the page is settled, up to `timeout` seconds
+
+        Never raises on timeout: this is a drop-in replacement for a fixed
+        sleep, so the flow carries on and the next explicit wait decides.
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout: Maximum seconds to wait (the old sleep duration)
+            quiet_period: Seconds without DOM mutations or requests that
+                          count as settled (defaults to WAITS['quiet_period'])
+            label: Optional text for the log line
+
+        Returns:
+            WaitResult: settled flag, seconds actually waited and poll count
+        """
+        quiet_period = WAITS['quiet_period'] if quiet_period is None else quiet_period
+        min_poll, max_poll = WAITS['min_poll'], WAITS['max_poll']
+
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = min_poll
+        polls = 0
+        settled = False
+
+        while True:
+            status = WaitEngine.page_status(driver)
+            polls += 1
+
+            if status and status['readyState'] == 'complete' and status['pending'] == 0:
+                remaining_quiet = quiet_period - status['quietFor']
+                if remaining_quiet <= 0:
+                    settled = True
+                    break
+                # Sleep exactly as long as the quiet period still needs
+                interval = max(min_poll, remaining_quiet)
+            else:
+                # Busy page: back off so polling does not add load
+                interval = min(max_poll, interval * 1.5)
+
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+
+        waited = time.monotonic() - start
+        description = f' ({label})' if label else ''
+        if settled:
+            TestHelpers.log(f'⏱️  Page settled after {waited:.2f}s of max {timeout}s{description}')
+        else:
+            TestHelpers.log(f'⏱️  Page still busy after {waited:.2f}s, continuing{description}')
+        return WaitResult(settled, waited, polls)
+
+    @staticmethod
+    @profiled('wait')
+    def wait_for(driver, locator, timeout=10, condition='visible', expected=None, attribute=None):
+        """
+        Wait until an element meets a condition, resolved inside the browser
+
+        One async script call per wait: a MutationObserver in the page checks
+        the condition on every DOM change, so the wait returns as soon as the
+        element qualifies. A navigation in the middle of the wait starts a new
+        call on the new document.
+
+        Args:
+            driver: Selenium WebDriver instance
+            locator: Tuple of (By, value) for element location
+            timeout: Timeout in seconds
+            condition: 'present', 'visible', 'clickable' (visible and enabled),
+                       'text' (visible and its text contains `expected`) or
+                       'attribute' (`attribute` equals `expected`; present if `expected` is None)
+            expected: Text or attribute value for 'text' and 'attribute'
+            attribute: Attribute name for 'attribute'
+
+        Returns:
+            WebElement: The first element meeting the condition
+
+        Raises:
+            TimeoutException: If no element met the condition in time
+            InvalidSelectorException: If the browser rejects the locator
+        """
+        by, value = locator
+        if by not in SCRIPT_STRATEGIES:
+            if condition not in FALLBACK_CONDITIONS:
+                raise ValueError(f"Condition '{condition}' needs a script locator, not '{by}'")
+            return WebDriverWait(driver, timeout).until(FALLBACK_CONDITIONS[condition](locator))
+
+        element = WaitEngine.run_async(
+            driver, timeout,
+            lambda remaining: driver.execute_async_script(
+                WAIT_FOR_ELEMENT_JS, by, value, condition, expected, attribute, int(remaining * 1000)
+            )
+        )
+        if isinstance(element, dict):
+            raise InvalidSelectorException(f"{element['error']}: {locator}")
+        if element is None:
+            raise TimeoutException(f'{condition} element not found within {timeout}s: {locator}')
+        return element
+
+    @staticmethod
+    @profiled('wait')
+    def wait_for_ready_state(driver, timeout=30):
+        """
+        Wait until document.readyState is 'complete', resolved inside the browser
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout: Timeout in seconds
+
+        Raises:
+            TimeoutException: If the page did not finish loading in time
+        """
+        state = WaitEngine.run_async(
+            driver, timeout,
+            lambda remaining: driver.execute_async_script(WAIT_FOR_READY_JS, int(remaining * 1000)) == 'complete'
+        )
+        if not state:
+            raise TimeoutException(f'Page did not finish loading within {timeout}s')
+
+    @staticmethod
+    @profiled('wait')
+    def wait_for_app_idle(driver, timeout=30, apps=None, label=None):
+        """
+        Wait until the apps on the page report idle (see utils.readiness)
+
+        Use after navigation, Save & Close or Submit. Never raises on timeout.
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout: Maximum seconds to wait
+            apps: Readiness probes that must be present and idle, e.g. ['dynamics'];
+                  None uses every probe whose app is detected
+            label: Optional text for the log line
+
+        Returns:
+            IdleResult: idle flag, seconds waited, detected apps and what was still busy
+        """
+        from utils.readiness import ReadinessProbes
+
+        return ReadinessProbes.default().wait_for_idle(driver, timeout, apps, label)
+
+    @staticmethod
+    def run_async(driver, timeout, call):
+        """
+        Repeat an in-page async wait until it returns a result or the deadline passes
+
+        The building block of the push-based waits: `call(remaining)` runs one
+        `execute_async_script` whose script resolves with a truthy result when
+        its condition holds and a falsy one when its own `remaining` seconds
+        run out. Each call is capped below the session script timeout, so
+        longer waits are split into several calls. A call that dies because a
+        navigation replaced the document is made again on the new document;
+        any other WebDriver error is raised.
+
+        Args:
+            driver: Selenium WebDriver instance
+            timeout: Timeout in seconds
+            call: Callable(remaining seconds) returning the script result
+
+        Returns:
+            The first truthy result, or None if the deadline passed
+        """
+        deadline = time.monotonic() + timeout
+        # Leave the driver a second of slack below its script timeout
+        max_call = max(1, TIMEOUTS['script'] - 1)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                result = call(min(remaining, max_call))
+            except WebDriverException as error:
+                if not WaitEngine.is_navigation_error(error):
+                    raise
+                # Navigation replaced the document mid-wait; try again on the new one
+                time.sleep(min(WAITS['min_poll'], max(0, deadline - time.monotonic())))
+                continue
+            if result:
+                return result
+
+    @staticmethod
+    def is_navigation_error(error):
+        """
+        Whether a script failed because the page or window it ran in went away
+
+        Args:
+            error: WebDriverException raised by execute_script/execute_async_script
+
+        Returns:
+            bool: True for errors a retry on the new document can fix
+        """
+        if isinstance(error, (StaleElementReferenceException, NoSuchWindowException)):
+            return True
+        if isinstance(error, JavascriptException):
+            message = (error.msg or '').lower()
+            return any(marker in message for marker in NAVIGATION_ERRORS)
+        return False